@@ -1,19 +1,19 @@
 from tabulate import tabulate
 from flask import Flask, request, jsonify, session
-from flask_session import Session
 import os, requests, re, json, random, traceback
 from dotenv import load_dotenv
-from langchain_community.document_loaders import TextLoader, PyPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
-embeddings = HuggingFaceEmbeddings(model_name="all-MiniLM-L6-v2")
-import chromadb
-from chromadb.config import Settings
 from supabase import create_client, Client
 from ast import literal_eval
 from flask_cors import CORS
 import traceback
 from datetime import datetime
+from history import ChatArchive, ChatHistoryCache, Message, OrderedWriter, archive_rows, push_turn, recent_turns, to_wire
+from memory import SummaryQueue, open_memory_store, open_summary_store, extract_memory_facts, extract_user_facts
+from prompting import GREETING_RE, answer_small_talk, assemble_context, classify_small_talk, route_intent, short_circuits, small_talk_reply
+from rendering import format_text, render_bullets
+from verification import AlignmentQueue, AlignmentResultStore, CachedProjects, is_technical_prompt
+from retrieval import HybridRetriever, RemoteRetriever, get_collection, chunk_metadata, project_document_map
+from sessions.interface import configure_session_backend
 
 # ---------------- Load Environment Variables ----------------
 load_dotenv()
@@ -59,7 +59,8 @@ app.config.update(
 CORS(app, 
     supports_credentials=True,
     origins=[ "https://debugmate.we3vision.com/"])
-Session(app)
+# SESSION_BACKEND=filesystem (default) | sqlite | memory | redis
+configure_session_backend(app)
 
 def verify_api_key():
     token = request.headers.get("Authorization")
@@ -81,28 +82,24 @@ OUTRO_LINES = [
 ]
 
 
-# -------------------- TECHNICAL PROMPT DETECTOR --------------------
-def is_technical_prompt(query, project_data):
-    q = query.lower()
-    project_keywords = set()
-    for proj in project_data:
-        for field in proj.values():
-            if isinstance(field, str):
-                project_keywords.update(field.lower().split())
-
-    # Keywords for identifying technical/project-based questions
-    tech_terms = [
-        "api", "flask", "backend", "frontend", "database", "sql", "supabase",
-        "postgres", "integration", "deploy", "debug", "project", "bug",
-        "function", "variable", "class", "model", "server", "test", "code",
-        "error", "chatbot", "ai", "nlp", "authentication", "authorization"
-    ]
-
-    return any(word in q for word in project_keywords.union(tech_terms))
 
 
-def summarize_history(history):
-    history_summary = summarize_history(history)
+def summarize_history(history, previous: str = ""):
+    """
+    Fold a batch of chat messages into the rolling conversation summary.
+    Falls back to short labels when the LLM is unavailable.
+    """
+    transcript = "\n".join(f"{h['role']}: {h['content'][:500]}" for h in history)
+    summary = call_openrouter([
+        {"role": "system", "content": "Maintain a running summary of a conversation. "
+                                      "Keep names, projects, decisions and open questions. "
+                                      "Reply with at most 8 short bullet points."},
+        {"role": "user", "content": f"Summary so far:\n{previous or 'N/A'}\n\nNew messages:\n{transcript}"}
+    ], temperature=0.2, max_tokens=300)
+    if summary:
+        return summary.strip()
+
+    history_summary = [previous] if previous else []
     for h in history:
         if h["role"] == "assistant":
             # Do not give full answers, just label them
@@ -125,6 +122,13 @@ def summarize_history(history):
 #         print("⚠ Accuracy check failed:", e)
 #         return ""
 # ---------------- Persistent Chat Memory ----------------
+# per-worker ring of recent messages per (user, project, chat_id); Supabase is read on miss only
+chat_cache = ChatHistoryCache()
+# cold tier: messages trimmed from user_memory go to compressed local segments
+chat_archive = ChatArchive()
+# history rows the small-talk fast path stores after replying, in order
+chat_writer = OrderedWriter()
+
 def get_user_id(email: str) -> str | None:
     """Fetch user id from Supabase using email."""
     try:
@@ -139,19 +143,23 @@ from datetime import datetime, timezone
 def save_chat_message(user_email: str, role: str, content: str,
                       project_id: str = None, chat_id: str = None, keep_limit: int = 200):
     """Save chat message with full privacy isolation (user + project + chat)."""
-    user_id = get_user_id(user_email)
-    if not user_id:
-        print("⚠ Cannot save chat — user not found:", user_email)
-        return
-
     project_id = project_id or session.get("project_id", "default")
     chat_id = chat_id or session.get("chat_id", "default")
-    session.setdefault("chat_history", [])
-    session["chat_history"].append({"role": role, "content": content})
-    # do NOT trim session history (we use Supabase history instead)
-    session["chat_history"] = session["chat_history"]
+    # session keeps only a small ring of recent turns; full history is in Supabase
+    push_turn(session, role, content)
 
+    # rows queued by the small-talk fast path go first
+    chat_writer.flush()
+    store_chat_row(user_email, role, content, project_id, chat_id,
+                   datetime.now(timezone.utc).isoformat(), keep_limit)
 
+def store_chat_row(user_email: str, role: str, content: str, project_id: str, chat_id: str,
+                   timestamp: str, keep_limit: int = 200):
+    """Insert one history row and archive what falls past keep_limit; no request context needed."""
+    user_id = get_user_id(user_email)
+    if not user_id:
+        print("⚠ Cannot save chat — user not found:", user_email)
+        return
 
     try:
         # Insert new message with all isolation keys
@@ -161,24 +169,23 @@ def save_chat_message(user_email: str, role: str, content: str,
             "chat_id": chat_id,
             "role": role,
             "content": content,
-            "timestamp": datetime.now(timezone.utc).isoformat()
+            "timestamp": timestamp
         }).execute()
+        chat_cache.append((user_email, project_id, chat_id), role, content)
 
-        # Auto-trim oldest messages per chat
+        # Move messages beyond keep_limit per chat to the archive instead of dropping them
         res = (
             supabase.table("user_memory")
-            .select("id")
+            .select("id, user_id, project_id, chat_id, role, content, timestamp")
             .eq("user_id", user_id)
             .eq("project_id", project_id)
             .eq("chat_id", chat_id)
             .order("timestamp", desc=True)
+            .range(keep_limit, keep_limit + 499)
             .execute()
         )
-        ids = [r["id"] for r in res.data] if res.data else []
-        if len(ids) > keep_limit:
-            old_ids = ids[keep_limit:]
-            for oid in old_ids:
-                supabase.table("user_memory").delete().eq("id", oid).execute()
+        if res.data:
+            archive_rows(supabase, chat_archive, res.data)
 
     except Exception as e:
         print("⚠ save_chat_message error:", e)
@@ -191,7 +198,14 @@ def load_chat_history(user_email: str, project_id: str = None,
     try:
         if not user_email:
             print("⚠ No email found — skipping history load.")
-            return session.get("chat_history", [])
+            return recent_turns(session)
+
+        project_id = project_id or "default"
+        chat_id = chat_id or "default"
+        cache_key = (user_email, project_id, chat_id)
+        cached = chat_cache.get(cache_key, limit)
+        if cached is not None:
+            return cached
 
         # Get user_id
         user_info = supabase.table("user_perms").select("id").eq("email", user_email).execute()
@@ -200,8 +214,6 @@ def load_chat_history(user_email: str, project_id: str = None,
             return []
 
         user_id = user_info.data[0]["id"]
-        project_id = project_id or "default"
-        chat_id = chat_id or "default"
 
         # Query isolated chat messages
         res = (
@@ -210,7 +222,7 @@ def load_chat_history(user_email: str, project_id: str = None,
             .eq("user_id", user_id)
             .eq("project_id", project_id)
             .eq("chat_id", chat_id)
-            .order("timestamp", desc=False)
+            .order("timestamp", desc=True)
             .limit(limit)
             .execute()
         )
@@ -218,12 +230,15 @@ def load_chat_history(user_email: str, project_id: str = None,
         if not res.data:
             # print(f"📭 No previous messages for {user_email} | {project_id} | {chat_id}")
             print(f"📭 may be some data is not there!{chat_id}")
-            
+            chat_cache.fill(cache_key, [], limit)
             return []
         print(f"[DEBUG] Loading chat history for {user_email} | project_id={project_id} | chat_id={chat_id}")
 
         print(f"📜 Loaded {len(res.data)} messages for {user_email} | {project_id} | {chat_id}")
-        return [{"role": m["role"], "content": m["content"]} for m in res.data]
+        # newest `limit` messages, returned oldest-first
+        history = [Message(m["role"], m["content"]) for m in reversed(res.data)]
+        chat_cache.fill(cache_key, history, limit)
+        return history
 
     except Exception as e:
         print("⚠ load_chat_history error:", e)
@@ -457,18 +472,8 @@ def format_response(
 
     # --- LLM Fallback ---
     if llm_response and not response_parts:
-        # Format LLM response with better structure
-        formatted_response = []
-        for line in llm_response.split('\n'):
-            line = line.strip()
-            if line.endswith(':'):
-                formatted_response.append(f"\n{line.upper()}")
-            elif line.startswith(('- ', '* ', '• ')):
-                formatted_response.append(f"  • {line[2:].strip()}")
-            elif line and not line.startswith('**'):  # Skip markdown bold markers
-                formatted_response.append(line)
-        
-        response_parts.append("\n".join(formatted_response))
+        # headings, bullets and skipped "**" lines; same rules as streamed replies
+        response_parts.append(format_text(llm_response, structured=True))
 
     # --- Generic Fallback ---
     if not response_parts and fallback:
@@ -476,18 +481,8 @@ def format_response(
     elif not response_parts:
         response_parts.append("I couldn't find the information you're looking for. Could you please provide more details?")
 
-    # Combine all parts with proper spacing
-    final_response = f"{preface}"
-    
-    # Add response parts with proper spacing
-    for part in response_parts:
-        if part.strip():
-            final_response += f"\n\n{part.strip()}"
-    
-    # Ensure consistent line endings and spacing
-    final_response = '\n'.join(line.strip() for line in final_response.split('\n'))
-    final_response = '\n\n'.join(para for para in final_response.split('\n\n') if para.strip())
-    return final_response
+    # Combine all parts; the formatter strips lines and collapses blank runs
+    return format_text("\n\n".join([preface, *response_parts]))
 
 
 def print_last_conversations(user_email: str, count: int = 5):
@@ -509,447 +504,14 @@ def print_last_conversations(user_email: str, count: int = 5):
 # ============================================================accuracy check functions===================================================================================
 # ==============================================================================================================================================================
 
-def is_technical_prompt(user_input: str, project_data: list) -> bool:
-    """
-    Returns True ONLY when the user's query is technical or project-related.
-    Filters out greetings, company name, personal or general knowledge queries.
-    """
-    if not user_input:
-        return False
-
-    text = user_input.lower().strip()
-
-    # --- Non-technical patterns (skip completely) ---
-    non_tech_patterns = [
-        r"\bwho is narendra\b", r"\bprime minister\b", r"\bweather\b", r"\btime\b",
-        r"\bcompany name\b", r"\bwe3vision\b", r"\babout company\b",
-        r"\bhello\b", r"\bhi\b", r"\bhey\b", r"\bthanks\b", r"\bbye\b",
-        r"\bgood (morning|afternoon|evening)\b", r"\bhow are you\b",
-        r"\bwhat('?s| is) your name\b"
-    ]
-    for pat in non_tech_patterns:
-        if re.search(pat, text):
-            return False
-
-    # --- Quick tokenization ---
-    tokens = re.findall(r"[a-z0-9_@]+", text)
-    if len(tokens) < 2:
-        return False
-
-    # --- Technical/project keywords ---
-    tech_keywords = {
-        "api", "flask", "backend", "frontend", "database", "sql", "supabase", "bug",
-        "error", "debug", "react", "node", "python", "javascript", "deployment",
-        "auth", "token", "jwt", "docker", "kubernetes", "langchain", "chroma",
-        "project", "timeline", "leader", "team", "client", "scope", "stack",
-        "tech", "framework", "field", "deadline", "responsibility"
-    }
-    if any(k in text for k in tech_keywords):
-        return True
-
-    # --- Project-specific token match ---
-    project_keywords = set()
-    for proj in project_data or []:
-        if not isinstance(proj, dict):
-            continue
-        for key in (
-            "project_name", "project_description", "project_scope",
-            "tech_stack", "tech_stack_custom", "project_field", "leader_of_project"
-        ):
-            val = proj.get(key)
-            if val:
-                project_keywords.update(re.findall(r"[a-z0-9_@]+", str(val).lower()))
-    if not project_keywords:
-        return False
-
-    overlap = len([t for t in tokens if t in project_keywords])
-    if overlap >= 1:
-        return True
-import re
-from difflib import SequenceMatcher
-
-# regexes
-EMAIL_RE = re.compile(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", re.I)
-WORD_TOKEN_RE = re.compile(r"[a-z0-9@._-]+", re.I)
-
-def _token_set(s: str):
-    return set([t.lower() for t in WORD_TOKEN_RE.findall(s or "")])
-
-def _normalize_for_compare(s: str) -> str:
-    """Lowercase and remove punctuation except alphanumerics and spaces."""
-    if not s:
-        return ""
-    s = s.lower()
-    # remove punctuation but keep @ . - _ for emails/tokens
-    s = re.sub(r"[^\w\s@._-]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
-def _extract_project_agg(project_data: list):
-    """
-    Return aggregated field strings and email sets:
-    {name, status, timeline, leader, leader_emails(set), team_text, team_emails(set), tech_text}
-    """
-    agg = {
-        "name": "",
-        "status": "",
-        "timeline": "",
-        "leader": "",
-        "leader_emails": set(),
-        "team": "",
-        "team_emails": set(),
-        "tech": "",
-        "client": "",
-        "description": "",
-    }
-    for p in project_data or []:
-        if not isinstance(p, dict):
-            continue
-        # name
-        for k in ("project_name","project_title","name"):
-            if p.get(k):
-                agg["name"] += " " + str(p.get(k))
-        # status
-        if p.get("status"):
-            agg["status"] += " " + str(p.get("status"))
-        # timeline
-        for k in ("start_date","end_date"):
-            if p.get(k):
-                agg["timeline"] += " " + str(p.get(k))
-        # leader fields
-        for k in ("leader_of_project","leader","project_lead","leader_name"):
-            if p.get(k):
-                agg["leader"] += " " + str(p.get(k))
-        # leader emails (common custom names)
-        for ek in ("leader_email","leader_of_project_email","lead_email"):
-            if p.get(ek):
-                agg["leader_emails"].add(str(p.get(ek)).lower())
-        # team members and assigned emails
-        members = p.get("team_members") or []
-        if isinstance(members, list):
-            for m in members:
-                if isinstance(m, dict):
-                    # try email then name/role
-                    email = m.get("email") or m.get("mail")
-                    if email:
-                        agg["team_emails"].add(str(email).lower())
-                    # join human tokens
-                    agg["team"] += " " + " ".join([str(v) for v in m.values() if v])
-                else:
-                    agg["team"] += " " + str(m)
-        # assigned_to_emails
-        for k in ("assigned_to_emails","assigned_to","assigned"):
-            val = p.get(k)
-            if isinstance(val, (list,tuple)):
-                for e in val:
-                    if e:
-                        agg["team_emails"].add(str(e).lower())
-            elif val:
-                agg["team_emails"].add(str(val).lower())
-        # tech
-        for tk in ("tech_stack","tech_stack_custom","technology"):
-            tval = p.get(tk)
-            if tval:
-                if isinstance(tval, list):
-                    agg["tech"] += " " + " ".join([str(x) for x in tval])
-                else:
-                    agg["tech"] += " " + str(tval)
-        # client and description
-        if p.get("client_name"):
-            agg["client"] += " " + str(p.get("client_name"))
-        if p.get("project_description"):
-            agg["description"] += " " + str(p.get("project_description"))
-        if p.get("project_scope"):
-            agg["description"] += " " + str(p.get("project_scope"))
-    # normalize strings
-    for k in ("name","status","timeline","leader","team","tech","client","description"):
-        agg[k] = _normalize_for_compare(agg[k])
-    agg["leader_emails"] = set(e for e in agg["leader_emails"] if e)
-    agg["team_emails"] = set(e for e in agg["team_emails"] if e)
-    return agg
-
-# synonyms for status canonicalization
-_STATUS_CANONICAL = {
-    "in progress": ["in progress","in-progress","ongoing","started","active"],
-    "not started": ["not started","pending","planned","yet to start"],
-    "completed": ["completed","done","finished","delivered"],
-    "on hold": ["on hold","paused","blocked"]
-}
-
-def _match_status(reply_clean: str, proj_status_clean: str) -> float:
-    """
-    Return score 0..100 for status matching.
-    Exact canonical match -> 100, synonym -> 95, token overlap -> ratio*100 fallback.
-    """
-    if not reply_clean or not proj_status_clean:
-        return 0.0
-    # canonicalize both into tokens
-    r = reply_clean.lower()
-    p = proj_status_clean.lower()
-    # direct substring
-    if r in p or p in r:
-        return 100.0
-    # check synonyms
-    for can, syns in _STATUS_CANONICAL.items():
-        if any(s in p for s in syns) and any(s in r for s in syns):
-            return 95.0
-    # token overlap fallback
-    rtoks = _token_set(r)
-    ptoks = _token_set(p)
-    if not ptoks:
-        return 0.0
-    overlap = len(rtoks & ptoks) / max(1, len(ptoks))
-    return round(overlap * 100, 2)
-
-def _clean_reply_text(text: str) -> str:
-    """
-    Remove headings, markdown bullets, repeated whitespace, punctuation noise.
-    Returns a lowercase cleaned string suitable for substring/token matching.
-    """
-    if not text:
-        return ""
-    s = text
-    # remove common section headings words on their own lines
-    s = re.sub(r"(?mi)^(summary|details|information|info|result|solution|overview|response)\s*$", "", s, flags=re.MULTILINE)
-    # remove lines that are short all-caps headings
-    s = re.sub(r"(?m)^[A-Z\s]{2,60}\n", "", s)
-    # remove bullets and markdown characters
-    s = re.sub(r"[-•*]{1,2}\s+", " ", s)
-    # remove parentheses content (often email after name)
-    s = re.sub(r"\([^)]*\)", " ", s)
-    # replace newlines with spaces and collapse whitespace
-    s = re.sub(r"\s+", " ", s).strip()
-    return s.lower()
-
-def _extract_project_fields(project_data: list):
-    """
-    Return a dict of aggregated strings for the key fields we check:
-    name, leader (name/email), timeline (start/end), team (names/emails), tech, client, status, description
-    """
-    agg = {
-        "name": [],
-        "leader": [],
-        "leader_emails": set(),
-        "timeline": [],
-        "team": [],
-        "team_emails": set(),
-        "tech": [],
-        "client": [],
-        "status": [],
-        "description": []
-    }
-    for proj in project_data or []:
-        if not isinstance(proj, dict):
-            continue
-        # name
-        for k in ("project_name", "project_title", "name", "custom_uuid"):
-            if proj.get(k):
-                agg["name"].append(str(proj.get(k)))
-        # leader
-        for k in ("leader_of_project", "leader", "project_lead"):
-            if proj.get(k):
-                agg["leader"].append(str(proj.get(k)))
-        # leader emails
-        for k in ("leader_email", "leader_of_project_email",):
-            if proj.get(k):
-                agg["leader_emails"].add(str(proj.get(k)).lower())
-        # timeline
-        for k in ("start_date", "end_date"):
-            if proj.get(k):
-                agg["timeline"].append(str(proj.get(k)))
-        # team members
-        members = proj.get("team_members") or []
-        if isinstance(members, list):
-            for m in members:
-                if isinstance(m, dict):
-                    # common keys: name,email
-                    if m.get("email"):
-                        agg["team_emails"].add(str(m.get("email")).lower())
-                    # add name-like tokens of member dict
-                    agg["team"].append(" ".join([str(v) for v in m.values() if v]))
-                else:
-                    agg["team"].append(str(m))
-        # assigned emails
-        for k in ("assigned_to_emails", "assigned_to", "assigned"):
-            val = proj.get(k)
-            if isinstance(val, (list, tuple)):
-                for e in val:
-                    agg["team_emails"].add(str(e).lower())
-            elif val:
-                agg["team_emails"].add(str(val).lower())
-        # tech
-        for k in ("tech_stack", "tech_stack_custom", "technology"):
-            val = proj.get(k)
-            if val:
-                if isinstance(val, list):
-                    agg["tech"].extend([str(x) for x in val])
-                else:
-                    agg["tech"].append(str(val))
-        # client & status & description
-        if proj.get("client_name"):
-            agg["client"].append(str(proj.get("client_name")))
-        if proj.get("status"):
-            agg["status"].append(str(proj.get("status")))
-        for k in ("project_description","project_scope"):
-            if proj.get(k):
-                agg["description"].append(str(proj.get(k)))
-    # join lists to single strings
-    for k in ("name","leader","timeline","team","tech","client","status","description"):
-        agg[k] = " ".join(agg[k]).strip().lower()
-    agg["leader_emails"] = set(e for e in agg["leader_emails"] if e)
-    agg["team_emails"] = set(e for e in agg["team_emails"] if e)
-    return agg
-
-def verify_response_final(query: str, reply: str, project_data: list, debug: bool=False) -> dict:
-    """
-    Field-prioritised strict verifier that returns realistic scores for short correct replies.
-    Returns {"alignment_score": float or None, "trust_level": str, "recommendation": str}
-    """
-    try:
-        if not project_data or not isinstance(project_data, list) or len(project_data) == 0:
-            return {"alignment_score": None, "trust_level": "No Data", "recommendation": "No project data available."}
-
-        q = (query or "").strip().lower()
-        # Use cleaned reply for comparisons
-        reply_clean = _clean_reply_text(reply)
-        reply_norm = _normalize_for_compare(reply_clean)
-
-        agg = _extract_project_agg(project_data)
-        if debug:
-            print("verify debug agg:", {k:(v[:120]+"..." if isinstance(v,str) and len(v)>120 else v) for k,v in agg.items()})
-
-        # Determine field intent (priority)
-        detected = []
-        if any(kw in q for kw in ["project name","project title","name of the project","what is the project name","project name"]):
-            detected.append("name")
-        if any(kw in q for kw in ["status","what is the status","project status","is the project completed","progress","phase"]):
-            detected.append("status")
-        if any(kw in q for kw in ["start date","end date","timeline","when does","when will","start","end","deadline"]):
-            detected.append("timeline")
-        if any(kw in q for kw in ["who is the leader","project leader","who is the lead","project lead","leader"]):
-            detected.append("leader")
-        if any(kw in q for kw in ["team members","team","members","who are the team","give my team"]):
-            detected.append("team")
-        if any(kw in q for kw in ["tech stack","tech","technology","framework","tools","languages"]):
-            detected.append("tech")
-        # fallback: if query contains 'project' treat as description/name check
-        if not detected:
-            if "project" in q:
-                detected.append("description")
-            else:
-                detected.append("description")
-
-        scores = []
-        for fld in detected:
-            proj_field_text = agg.get(fld, "")
-            if fld == "name":
-                # exact or substring
-                if reply_norm and proj_field_text and (reply_norm == proj_field_text or reply_norm in proj_field_text or proj_field_text in reply_norm):
-                    scores.append(99.0)
-                    continue
-                # token overlap strong boost for short replies
-                rts = _token_set(reply_norm)
-                pts = _token_set(proj_field_text)
-                if rts and pts:
-                    overlap = len(rts & pts)
-                    if len(rts) <= 6 and overlap >= 1:
-                        scores.append(min(99.0, 85.0 + overlap*5.0))
-                        continue
-                # fallback similarity
-                sim = SequenceMatcher(None, reply_norm, proj_field_text).ratio()
-                scores.append(round(sim * 70, 2))
-
-            elif fld == "status":
-                # compare cleaned reply to proj status
-                score = _match_status(reply_norm, agg.get("status",""))
-                scores.append(score)
-
-            elif fld == "leader":
-                # email exact or name overlap
-                reply_emails = set(e.lower() for e in EMAIL_RE.findall(reply))
-                if reply_emails and agg.get("leader_emails"):
-                    if reply_emails & agg["leader_emails"]:
-                        scores.append(99.0); continue
-                # token overlap with leader name
-                rts = _token_set(reply_norm)
-                pts = _token_set(agg.get("leader",""))
-                if rts and pts and len(rts & pts) >= 1:
-                    # short reply strong
-                    scores.append(min(98.0, 85.0 + len(rts & pts)*5.0)); continue
-                # fallback similarity
-                sim = SequenceMatcher(None, reply_norm, agg.get("leader","")).ratio()
-                scores.append(round(sim * 70, 2))
-
-            elif fld == "team":
-                # check for team_emails present
-                reply_emails = set(e.lower() for e in EMAIL_RE.findall(reply))
-                if reply_emails and agg.get("team_emails"):
-                    if reply_emails & agg["team_emails"]:
-                        scores.append(98.0); continue
-                # token coverage of team members names
-                pts = _token_set(agg.get("team",""))
-                rts = _token_set(reply_norm)
-                if pts:
-                    coverage = len(rts & pts) / max(1, len(pts))
-                    scores.append(round(min(1.0, coverage) * 100, 2)); continue
-                scores.append(0.0)
-
-            elif fld == "tech":
-                pts = _token_set(agg.get("tech",""))
-                rts = _token_set(reply_norm)
-                if pts:
-                    coverage = len(rts & pts) / max(1, len(pts))
-                    scores.append(round(min(1.0, coverage) * 100, 2)); continue
-                scores.append(0.0)
-
-            elif fld == "timeline":
-                # check year or date tokens
-                def find_year(s):
-                    m = re.search(r"\b(20\d{2}|\d{4})\b", s)
-                    return m.group(0) if m else None
-                proj_year = find_year(agg.get("timeline",""))
-                rep_year = find_year(reply)
-                if proj_year and rep_year and proj_year == rep_year:
-                    scores.append(95.0); continue
-                # if reply contains the proj start date substring
-                if agg.get("timeline","") and reply_norm and reply_norm in agg.get("timeline",""):
-                    scores.append(98.0); continue
-                # fallback token ratio
-                pts = _token_set(agg.get("timeline",""))
-                rts = _token_set(reply_norm)
-                if pts:
-                    coverage = len(rts & pts) / max(1, len(pts))
-                    scores.append(round(coverage * 100, 2)); continue
-                scores.append(0.0)
-
-            else:  # description fallback
-                sim = SequenceMatcher(None, reply_norm, agg.get("description","")).ratio()
-                pts = _token_set(agg.get("description",""))
-                rts = _token_set(reply_norm)
-                token_ratio = len(rts & pts) / max(1, len(pts)) if pts else 0.0
-                scores.append(round(min(1.0, (0.65*sim + 0.35*token_ratio))*100, 2))
-
-        # aggregate: prefer highest (field-priority)
-        valid = [s for s in scores if s is not None]
-        if not valid:
-            return {"alignment_score": None, "trust_level": "No Data", "recommendation": "No relevant project fields."}
-        final_score = round(max(valid), 2)
-
-        if final_score >= 90:
-            trust = "Trusted ✅"
-            rec = "Accurate and consistent with project data."
-        elif final_score >= 70:
-            trust = "Moderate ⚠️"
-            rec = "Partially aligned; verify minor details."
-        else:
-            trust = "Low ❌"
-            rec = "May not align — please verify."
-
-        return {"alignment_score": final_score, "trust_level": trust, "recommendation": rec}
-
-    except Exception as e:
-        print("⚠ verify_response_strict error:", e)
-        return {"alignment_score": None, "trust_level": "Error", "recommendation": "Verification error."}
+# Alignment scoring runs on background workers and is recorded in ALIGNMENT_DB;
+# the projects list is refetched at most every ALIGNMENT_PROJECTS_TTL seconds.
+alignment_queue = AlignmentQueue(
+    AlignmentResultStore(),
+    CachedProjects(lambda: supabase.table("projects").select("*").execute().data,
+                   ttl=float(os.getenv("ALIGNMENT_PROJECTS_TTL", "60"))),
+    classify=is_technical_prompt,
+)
 # =============================================================================================================================================================
 # ============================================================announcements functions===================================================================================
 # ==============================================================================================================================================================
@@ -1096,16 +658,7 @@ def verify_response_final(query: str, reply: str, project_data: list, debug: boo
 # ============================================================dual chatbot functions===================================================================================
 # ==============================================================================================================================================================
 # ---------------- INTENT DETECTION ----------------
-GENERAL_QUERIES = ["project info", "project details", "overview", "all info", "summary"]
-
-SPECIFIC_FIELDS = {
-    "timeline": ["timeline", "deadline", "end date", "start date", "duration", "finish", "schedule"],
-    "status": ["status", "progress", "phase", "current state"],
-    "client": ["client", "customer"],
-    "leader": ["leader", "manager", "owner", "head"],
-    "members": ["members", "team", "assigned", "who is working", "employees"],
-    "tech_stack": ["tech stack", "technology", "framework", "tools", "languages"],
-}
+# keyword groups (incl. SPECIFIC_FIELDS) live in prompting/intent.py
 def detect_intent(user_query: str) -> str:
     """
     Unified intent detector for chatbot.
@@ -1119,40 +672,10 @@ def detect_intent(user_query: str) -> str:
     if not user_query:
         return "general"
 
-    q = user_query.lower().strip()
-
-    # ---------- QUICK PROJECT-RELATED INTENTS ----------
-    if any(word in q for word in [
-        "all project", "all projects", "list projects", "every project", "badha project", "badha"
-    ]):
-        return "all_projects"
-
-    if any(word in q for word in [
-        "project details", "project info", "give me project", "all details", "project", "details of project"
-    ]):
-        return "project_details"
-
-    # ---------- CODING / DEBUGGING / MATH ----------
-    if any(word in q for word in ["code", "function", "script", "program", "sql", "api", "class", "loop", "```"]):
-        if any(word in q for word in ["error", "traceback", "exception", "bug", "fix", "issue"]):
-            return "debugging"
-        return "coding"
-
-    if any(word in q for word in ["solve", "integral", "derivative", "equation", "calculate", "sum", "matrix", "theorem"]):
-        return "math"
-
-    for field, keywords in SPECIFIC_FIELDS.items():
-        for k in keywords:
-            if k in q:
-                return field
-
-    # ---------- GENERAL QUERY DETECTION ----------
-    GENERAL_QUERIES = [
-        "overview", "summary", "introduction", "info", "information", "details", "describe", "about"
-    ]
-    for g in GENERAL_QUERIES:
-        if g in q:
-            return "general"
+    # ---------- KEYWORD ROUTER (project, coding, math, fields, general) ----------
+    match = route_intent(user_query.strip())
+    if match.intent:
+        return match.intent
 
     # ---------- FALLBACK TO LLM CLASSIFICATION ----------
     try:
@@ -1194,9 +717,10 @@ def detect_intent(user_query: str) -> str:
 # # ---------------- Supabase Client ----------------
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 
-# Persistent ChromaDB
-chroma_client = chromadb.PersistentClient(path="./chroma_db")
-collection = chroma_client.get_or_create_collection("company_docs")
+# Persistent ChromaDB (opened lazily on first retrieval, see retrieval/store.py).
+# With RETRIEVAL_SOCKET set, a shared sidecar process owns the model and Chroma instead.
+RETRIEVAL_SOCKET = os.getenv("RETRIEVAL_SOCKET")
+retriever = RemoteRetriever(RETRIEVAL_SOCKET) if RETRIEVAL_SOCKET else HybridRetriever(get_collection)
 
 
 MEMORY_FILE = "memory.json"
@@ -1312,37 +836,66 @@ def update_user_memory(user_input, memory):
 
 # ---------------- Document Processing ----------------
 def load_documents():
+    from langchain_community.document_loaders import TextLoader, PyPDFLoader
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
     documents = []
     if not os.path.exists("company_docs"):
         return
-    for file in os.listdir("company_docs"):
-        path = os.path.join("company_docs", file)
-        if file.endswith(".pdf"):
-            loader = PyPDFLoader(path)
-        elif file.endswith(".txt"):
-            loader = TextLoader(path, encoding="utf-8")
-        else:
-            continue
-        documents.extend(loader.load())
+    # company_docs/<department>/file → department-scoped; top-level files apply to all
+    for root, _, files in os.walk("company_docs"):
+        for file in files:
+            path = os.path.join(root, file)
+            if file.endswith(".pdf"):
+                loader = PyPDFLoader(path)
+            elif file.endswith(".txt"):
+                loader = TextLoader(path, encoding="utf-8")
+            else:
+                continue
+            documents.extend(loader.load())
     if documents:
+        doc_map = load_project_document_map()
         splitter = RecursiveCharacterTextSplitter(chunk_size=300, chunk_overlap=100)
         texts = splitter.split_documents(documents)
         for i, text in enumerate(texts):
-            collection.add(
+            retriever.add(
                 documents=[text.page_content],
-                metadatas=[{"source": text.metadata.get("source", "company_docs")}],
+                metadatas=[chunk_metadata(text.metadata.get("source", "company_docs"), doc_map)],
                 ids=[f"doc_{i}"]
             )
 
-def get_context(query, k=3):
-    if len(query.split()) <= 2:
-        return ""
+def load_project_document_map():
+    """{file name: {project uuid, ...}} from projects.upload_documents."""
     try:
-        results = collection.query(query_texts=[query], n_results=k)
-        if results and results.get('documents'):
-            return "\n".join(results['documents'][0])
-    except:
-        return ""
+        res = supabase.table("projects").select("uuid, upload_documents").execute()
+        return project_document_map(res.data or [])
+    except Exception as e:
+        print("⚠ load_project_document_map error:", e)
+        return {}
+
+def get_context_chunks(query, k=3, scope=None):
+    """
+    Hybrid BM25 + vector lookup; short queries are served by BM25 alone.
+    scope={"project_id": ..., "department": ...} limits retrieval to chunks
+    tagged for that project/department plus company-wide documents.
+    """
+    try:
+        return retriever.query(query or "", k=k, scope=scope)
+    except Exception as e:
+        print("⚠ get_context error:", e)
+        return []
+
+def get_context(query, k=3, scope=None):
+    return "\n".join(get_context_chunks(query, k=k, scope=scope))
+
+def get_first_context(queries, k=3, scope=None):
+    """Context of the first query that finds anything; all queries go out in one retriever call."""
+    try:
+        for chunks in retriever.query_many([q for q in queries if q and q.strip()], k=k, scope=scope):
+            if chunks:
+                return "\n".join(chunks)
+    except Exception as e:
+        print("⚠ get_context error:", e)
     return ""
 def get_user_id(email: str) -> int | None:
     """Fetch user id (integer) from Supabase using email."""
@@ -1421,11 +974,9 @@ def build_messages(user_input, context, memory):
         )
         user_message = user_input
 
-    session.setdefault("chat_history", [])
-    session["chat_history"].append({"role": "user", "content": user_input})
-    session["chat_history"] = session["chat_history"][-5:]
+    push_turn(session, "user", user_input)
     messages = [{"role": "system", "content": prompt}]
-    messages.extend(session["chat_history"])
+    messages.extend(recent_turns(session, 5))
     return messages
 
 # ---------------- OpenRouter ----------------
@@ -1576,9 +1127,7 @@ def llm_response(user_input):
 
     reply = query_supabase(parsed)
     # append assistant reply to session chat_history
-    session.setdefault("chat_history", [])
-    session["chat_history"].append({"role": "assistant", "content": reply})
-    session["chat_history"] = session["chat_history"][-20:]
+    push_turn(session, "assistant", reply)
     return {"reply": reply}
 
 
@@ -1587,54 +1136,11 @@ def handle_greetings(user_message: str, user_name: str = None):
     """
     Return a greeting reply ONLY when the user's message is a short/pure greeting.
     If user_message contains question words or longer content, return None so the main flow proceeds.
+    Matchers and templates live in prompting/smalltalk.py.
     """
-    text = (user_message or "").strip()
-    if not text:
+    if classify_small_talk(user_message) != "greeting":
         return None
-
-    # quick normalization
-    normalized = text.lower()
-
-    # Patterns that indicate greeting words
-    greeting_words = ["hi", "hello", "hey", "gm", "ga", "ge", "good morning", "good afternoon", "good evening"]
-
-    # Words that indicate a question/intent — if present, we should NOT treat it as pure greeting
-    intent_indicators = ["?", "can", "could", "would", "please", "project", "details", "all", "give", "show", "help", "how", "what", "who", "where", "when", "why"]
-
-    # If message contains any intent indicator, do not return greeting
-    if any(ind in normalized for ind in intent_indicators):
-        return None
-
-    # If the message is longer than 4 words, assume it's not a pure greeting
-    if len(normalized.split()) > 4:
-        return None
-
-    # If message contains a greeting word, return a friendly greeting
-    if any(g in normalized for g in greeting_words):
-        current_hour = datetime.now().hour
-        tod = "day"
-        if current_hour < 12:
-            tod = "morning"
-        elif current_hour < 18:
-            tod = "afternoon"
-        else:
-            tod = "evening"
-
-        if user_name:
-            templates = [
-                f"Good {tod}, {user_name}! How can I help you?",
-                f"Hey {user_name}! What would you like help with today?",
-                f"Hi {user_name}! How's your {tod} going?"
-            ]
-        else:
-            templates = [
-                f"Good {tod}! How can I help you?",
-                "Hey there! What can I do for you?",
-                "Hi! How can I assist?"
-            ]
-        return random.choice(templates)
-
-    return None
+    return small_talk_reply("greeting", user_name)
 
 
 # ====================== STRONG ROLE-BASED QUERY FILTERING ======================
@@ -1779,25 +1285,8 @@ def query_supabase(parsed):
 
         
 
-        if not data:
-            return "⚠ No matching records found."
-
         # --- Format results ---
-        formatted = []
-        for row in data:
-            details = []
-            for k, v in row.items():
-                if v in [None, "", [], {}]:
-                    continue
-                if isinstance(v, (list, dict)):
-                    try:
-                        v = json.dumps(v, ensure_ascii=False)
-                    except:
-                        v = str(v)
-                details.append(f"{k.replace('_', ' ').title()}: {v}")
-            formatted.append("• " + "\n  ".join(details))
-
-        return "\n\n---\n\n".join(formatted)
+        return render_bullets(data)
 
     except Exception as e:
         print("❌ Supabase error:", e)
@@ -1811,48 +1300,43 @@ def query_supabase(parsed):
 # ---------------- Memory Store ----------------
 MEMORY_FILE = "memory.json"
 
-def load_mem():
-    if os.path.exists(MEMORY_FILE):
-        try:
-            with open(MEMORY_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
+# memory schema: { "<user_email>": { "facts": [...], "last_seen": "ISO" } }
+# Shared across workers via SQLite (memory.db, migrated from memory.json);
+# MEMORY_BACKEND=journal keeps the single-process append-only log instead.
+user_memory = open_memory_store(MEMORY_FILE)
 
-def save_mem(mem):
-    with open(MEMORY_FILE, "w", encoding="utf-8") as f:
-        json.dump(mem, f, indent=2, ensure_ascii=False)
+# Rolling per-(user, project, chat_id) summary stored next to user_memory;
+# prompts carry the summary plus only the last PROMPT_RECENT_TURNS turns.
+RECENT_TURNS = int(os.getenv("PROMPT_RECENT_TURNS", "4"))
+chat_summaries = open_summary_store(MEMORY_FILE, every_n_turns=int(os.getenv("SUMMARY_EVERY_N_TURNS", "4")))
 
-# memory schema: { "<user_email>": { "facts": [...], "last_seen": "ISO" } }
-user_memory = load_mem()
+summary_queue = SummaryQueue(chat_summaries, lambda previous, pending: summarize_history(pending, previous))
+
+def update_chat_summary(user_email: str, project_id: str, chat_id: str, user_msg: str, reply: str):
+    """Queue this turn; the summary worker records it and refreshes the rolling summary."""
+    if not user_email:
+        return
+    summary_queue.submit(user_email, project_id, chat_id, user_msg, reply)
+
+def record_small_talk(user_email: str, user_input: str, reply: str, project_id: str, chat_id: str):
+    """Session ring now; the history row and any stated facts go through the ordered chat writer."""
+    push_turn(session, "assistant", reply)
+    # timestamped now, so the row sorts where the reply was given
+    chat_writer.submit(store_chat_row, user_email, "assistant", reply, project_id, chat_id,
+                       datetime.now(timezone.utc).isoformat())
+    if extract_user_facts(user_input):
+        chat_writer.submit(extract_and_store_user_facts, user_email, user_input)
 
 def remember(user_email: str, text: str):
     """
     Extract simple user facts like name, preferences.
+    Only writes when a fact is new for this user.
     """
     if not user_email:
         return
-    entry = user_memory.get(user_email, {"facts": [], "last_seen": None})
-
-    patterns = [
-        r"\bmy name is\s+([A-Za-z][A-Za-z\s\-]{1,40})",
-        r"\bi am\s+([A-Za-z][A-Za-z\s\-]{1,40})",
-        r"\bi'm\s+([A-Za-z][A-Za-z\s\-]{1,40})",
-        r"\bi like\s+([A-Za-z0-9 ,.&\-]{1,60})",
-        r"\bmy role is\s+([A-Za-z][A-Za-z\s\-]{1,40})",
-        r"\bcall me\s+([A-Za-z][A-Za-z\s\-]{1,40})",
-    ]
-    for p in patterns:
-        m = re.search(p, text, flags=re.IGNORECASE)
-        if m:
-            fact = m.group(0).strip()
-            if fact not in entry["facts"]:
-                entry["facts"].append(fact)
-
-    entry["last_seen"] = datetime.now(timezone.utc).isoformat()
-    user_memory[user_email] = entry
-    save_mem(user_memory)
+    facts = extract_memory_facts(text)
+    user_memory.add_facts(user_email, facts)
+    user_memory.touch(user_email)
 
 def get_user_role(email: str) -> str:
     """
@@ -1909,7 +1393,8 @@ def call_openrouter(messages, model=None, temperature=0.5, max_tokens=300):
     }
     payload = {
         "model": mdl,
-        "messages": messages,
+        # history records become wire dicts only here
+        "messages": to_wire(messages),
         "temperature": float(temperature),
         "max_tokens": int(max_tokens)
     }
@@ -1942,10 +1427,7 @@ def greet_reply(name=None):
     return f"{base}, {name}!" if name else f"{base}! How can I help you?"
 
 def maybe_greeting(text):
-    t = text.lower().strip()
-    if re.search(r"\b(hi|hello|hey|good\s*(morning|afternoon|evening)|gm|ga|ge)\b", t):
-        return True
-    return False
+    return bool(GREETING_RE.search(text.lower().strip()))
 
 
 
@@ -2050,6 +1532,11 @@ def debug_session():
          "user_name": session.get("user_name")
     })
 
+@app.route("/debug_fast_path", methods=["GET"])
+def debug_fast_path():
+    """Requests answered by the small talk fast path in this worker process."""
+    return jsonify(short_circuits.stats())
+
 @app.route("/get_user_project", methods=["POST"])
 def get_user_project():
     if not verify_api_key():
@@ -2139,6 +1626,27 @@ def get_chat_id():
         print("❌ Error fetching chat_id:", e)
         return jsonify({"chat_id": "default"})
 
+@app.route("/chat/archive", methods=["GET"])
+def chat_archive_page():
+    """Page backwards through archived (cold) messages of one chat."""
+    user_email = session.get("user_email")
+    if not user_email:
+        return jsonify({"reply": "❌ Please login first."}), 401
+    user_id = get_user_id(user_email)
+    if not user_id:
+        return jsonify({"messages": [], "next_cursor": None})
+    try:
+        cursor = int(request.args.get("cursor", 0))
+        limit = min(int(request.args.get("limit", 50)), 200)
+    except ValueError:
+        return jsonify({"error": "cursor and limit must be integers"}), 400
+    messages, next_cursor = chat_archive.page(
+        user_id,
+        request.args.get("project_id") or session.get("project_id", "default"),
+        request.args.get("chat_id") or session.get("chat_id", "default"),
+        cursor, limit)
+    return jsonify({"messages": messages, "next_cursor": next_cursor})
+
 @app.route("/debug_projects", methods=["GET"])
 def debug_projects():
     if not verify_api_key():
@@ -2212,7 +1720,7 @@ def common_chat():
         # -------------------------------
         # 2. Document context (RAG chunks)
         # -------------------------------
-        doc_context = get_context(user_query)
+        doc_context = get_context(user_query, scope={"project_id": project_id})
 
         # -------------------------------
         # 3. System message
@@ -2345,116 +1853,8 @@ def extract_and_store_user_facts(user_email: str, text: str):
     if not user_email or not text:
         return
     try:
-        candidates = []
-        # Helper: sanitize and limit
-        def clean(val: str, limit: int = 120) -> str:
-            v = (val or "").strip()
-            v = re.sub(r"\s+", " ", v)
-            return v[:limit]
-        # Name
-        m = re.search(r"\b(?:my name is|i am|i'm|this is|call me)\s+([A-Za-z][A-Za-z\s\-]{1,40})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("name", clean(m.group(1).rstrip(".,"))))
-
-        # Role / Title
-        m = re.search(r"\b(?:i work as|my role is|i am a|i'm a)\s+([A-Za-z][A-Za-z\s\-/]{1,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("role", clean(m.group(1).rstrip(".,"))))
-
-        # Age
-        m = re.search(r"\b(?:i am|i'm)\s+(\d{1,2})\s*(?:years old|yrs old|yo|years)?\b", text, re.IGNORECASE)
-        if m:
-            candidates.append(("age", clean(m.group(1))))
-
-        # Experience in years
-        m = re.search(r"\b(?:i have|i've)\s+(\d{1,2})\s+(?:years|yrs)\s+of\s+(?:experience|exp)\b", text, re.IGNORECASE)
-        if m:
-            candidates.append(("experience_years", clean(m.group(1))))
-
-        # Location / City
-        m = re.search(r"\b(?:i live in|i am from|i'm from|based in)\s+([A-Za-z][A-Za-z\s\-]{1,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("location", clean(m.group(1).rstrip(".,"))))
-
-        # Company / Employer
-        m = re.search(r"\b(?:i work at|i work for|my company is)\s+([A-Za-z0-9][A-Za-z0-9\s&\-]{1,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("company", clean(m.group(1).rstrip(".,"))))
-
-        # Phone number
-        m = re.search(r"\b(?:my phone|my number|phone number)\s*[:is]*\s*(\+?\d[\d\-\s]{7,15}\d)\b", text, re.IGNORECASE)
-        if m:
-            candidates.append(("phone", re.sub(r"\s+", "", m.group(1)).strip()))
-
-        # Email address
-        m = re.search(r"\b([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})\b", text)
-        if m:
-            candidates.append(("email", clean(m.group(1))))
-
-        # Likes / preferences
-        m = re.search(r"\bi like\s+([A-Za-z0-9 ,.&\-]{1,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("likes", clean(m.group(1).rstrip(".,"))))
-
-        # Current task / work focus
-        m = re.search(r"\b(?:i am working on|i'm working on|currently working on|my work is|i'm doing|i work on)\s+(.{5,120})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("current_task", clean(m.group(1))))
-
-        # Responsibilities / areas
-        m = re.search(r"\b(?:i am responsible for|my responsibilities (?:are|include)|i handle)\s+(.{5,120})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("responsibilities", clean(m.group(1))))
-
-        # Skills
-        m = re.search(r"\b(?:my skills (?:are|include)|skills:?)\s+([A-Za-z0-9 ,.&\-]{3,160})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("skills", clean(m.group(1), limit=160)))
-
-        # Tools / stack
-        m = re.search(r"\b(?:i use|tools:|tech stack:|stack:|we use|i work with)\s+([A-Za-z0-9 ,.&\-/]{3,160})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("tools", clean(m.group(1), limit=160)))
-
-        # Work in domain/department
-        m = re.search(r"\b(?:i work in)\s+([A-Za-z][A-Za-z\s\-/]{2,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("department", clean(m.group(1))))
-
-        # Department / team
-        m = re.search(r"\b(?:my department is|department:|i'm in the)\s+([A-Za-z][A-Za-z\s\-/]{2,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("department", clean(m.group(1))))
-
-        # Manager / reports to
-        m = re.search(r"\b(?:my manager is|i report to)\s+([A-Za-z][A-Za-z\s\-]{2,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("manager", clean(m.group(1))))
-
-        # Team name
-        m = re.search(r"\b(?:my team is|team:|i'm on the)\s+([A-Za-z][A-Za-z\s\-]{2,60})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("team", clean(m.group(1))))
-
-        # Availability hours
-        m = re.search(r"\b(?:i am available|availability is|available from)\s+([0-9:APMapm\-\s]{5,40})", text)
-        if m:
-            candidates.append(("availability_hours", clean(m.group(1))))
-
-        # Timezone
-        m = re.search(r"\b(?:timezone|time zone)\s*[:is]*\s*([A-Za-z/_+\-0-9]{3,32})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("timezone", clean(m.group(1))))
-
-        # Languages
-        m = re.search(r"\b(?:i speak|languages?:)\s+([A-Za-z ,\-]{3,80})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("languages", clean(m.group(1))))
-
-        # Goals / objectives
-        m = re.search(r"\b(?:my goal is|my goals are|i want to)\s+(.{5,120})", text, re.IGNORECASE)
-        if m:
-            candidates.append(("goals", clean(m.group(1))))
+        # single trigger scan + only the matching field extractors (memory/facts.py)
+        candidates = extract_user_facts(text)
 
         # Persist
         for key, value in candidates:
@@ -2483,7 +1883,6 @@ def work_chat():
         session["project_uuid"] = project_id
         user_email = session.get("user_email")
         user_name = session.get("user_name", "")
-        user_role = get_user_role(user_email)
 
         if not project_id:
             return jsonify({"reply": "⚠ No project selected."})
@@ -2492,7 +1891,14 @@ def work_chat():
         if not user_input:
             return jsonify({"reply": random.choice(CONFUSION_RESPONSES)})
 
-    
+        # -------------------- 🔹 Small talk fast path (before any I/O) --------------------
+        small_talk = answer_small_talk(user_input, user_name, route="work")
+        if small_talk:
+            record_small_talk(user_email, user_input, small_talk[1], project_id, session.get("chat_id", "default"))
+            return jsonify({"reply": small_talk[1]})
+
+        user_role = get_user_role(user_email)
+
         # -------------------- 🔹 Fetch user facts from Supabase --------------------
         user_facts = get_user_facts(user_email)
         if "name" in user_facts:
@@ -2501,12 +1907,6 @@ def work_chat():
         # -------------------- 🔹 Detect and store new user facts --------------------
         extract_and_store_user_facts(user_email, user_input)
 
-        # -------------------- 🔹 Handle greetings first --------------------
-        greeting_response = handle_greetings(user_input, user_name)
-        if greeting_response:
-            save_chat_message(user_email, "assistant", greeting_response, project_id, session.get("chat_id", "default"))
-            return jsonify({"reply": greeting_response})
-
         # -------------------- Normalize Query (LLM cleanup) --------------------
         normalized_query = call_openrouter([
             {"role": "system", "content": "You are a query refiner. Rewrite the user's query into a clear natural-language question."},
@@ -2524,7 +1924,7 @@ def work_chat():
             return jsonify({"reply": resp})
 
         if any(p in ql for p in ["facts about company", "company facts", "about the company", "company info", "company information"]):
-            company_ctx = get_context("company information") or get_context("about the company") or "No company information found."
+            company_ctx = get_first_context(["company information", "about the company"]) or "No company information found."
             save_chat_message(user_email, "assistant", company_ctx, project_id, session.get("chat_id", "default"))
             return jsonify({"reply": company_ctx})
 
@@ -2533,10 +1933,10 @@ def work_chat():
         print(f"🧭 Detected intent: {query_type}")
 
         db_answer, doc_context, web_context = None, None, None
+        doc_chunks = []
 
         # -------------------- debug prints --------------------
         print(f"[DEBUG] incoming: '{user_input}'")
-        print(f"[DEBUG] greeting_response: {bool(greeting_response)}")
         print(f"[DEBUG] detected intent: {query_type}")
 
 
@@ -2554,7 +1954,7 @@ def work_chat():
 
         # -------------------- Document Lookup (RAG) --------------------
         try:
-            doc_context = get_context(normalized_query)
+            doc_chunks = get_context_chunks(normalized_query, scope={"project_id": project_id})
         except Exception as e:
             print("❌ Document lookup error:", e)
                     
@@ -2569,7 +1969,20 @@ def work_chat():
         session["project_id"] = project_id
 
              # Build conversation history
-        conv_hist = load_chat_history(user_email, project_id, chat_id, limit=15)
+        conv_hist = load_chat_history(user_email, project_id, chat_id, limit=2 * RECENT_TURNS)
+        chat_summary = chat_summaries.get(user_email, project_id, chat_id)
+
+        # -------------------- Token-budgeted context --------------------
+        system_content = f"You are a helpful AI assistant for We3Vision. User: {user_name} ({user_email}), Role: {user_role}."
+        if chat_summary:
+            system_content += f"\nConversation so far:\n{chat_summary}"
+        packed = assemble_context(normalized_query, instructions=system_content, history=conv_hist,
+                                  db_answer=db_answer, doc_chunks=doc_chunks)
+        conv_hist = packed["history"]
+        db_answer = packed["db_facts"] or None
+        doc_context = packed["doc_context"] or None
+        print(f"🧮 Prompt budget: {packed['stats']['used']}/{packed['stats']['budget']} tokens, saved {packed['stats']['saved']}")
+
         # -------------------- LLM Synthesis --------------------
         synth_prompt = f"""
         User asked: {normalized_query}
@@ -2585,7 +1998,7 @@ def work_chat():
         """
 
         messages = [
-            {"role": "system", "content": f"You are a helpful AI assistant for We3Vision. User: {user_name} ({user_email}), Role: {user_role}."},
+            {"role": "system", "content": system_content},
             *conv_hist,
             {"role": "user", "content": synth_prompt}
         ]
@@ -2596,22 +2009,13 @@ def work_chat():
         remember(user_email, user_input)
         save_chat_message(user_email, "user", user_input, project_id, chat_id)
         save_chat_message(user_email, "assistant", reply, project_id, chat_id)
+        update_chat_summary(user_email, project_id, chat_id, user_input, reply)
 
         final_reply = format_response(user_input, fallback=reply)
-                    # -------------------- ✅ Run Alignment System Only for Technical Queries --------------------
-        try:
-            project_data = supabase.table("projects").select("*").execute().data
-            if is_technical_prompt(user_input, project_data):
-                check = verify_response_final(user_input, final_reply, project_data, debug=False)
-      
-            #     if check.get("alignment_score") is not None:
-            #          final_reply += f"\n\n🔹 Accuracy: {check['alignment_score']} ({check['trust_level']})"
-            #     else:
-            #         print("ℹ️ Skipped accuracy display — no valid score.")
-            # else:
-            #     print("ℹ️ Skipped alignment — Non-technical/general query.")
-        except Exception as e:
-            print(f"⚠️ Alignment system failed: {e}")
+                    # -------------------- ✅ Alignment check (technical queries only, off the response path) --------------------
+        # scored in the background; adds no latency to the reply
+        alignment_queue.submit(user_input, final_reply, user_email=user_email,
+                               project_id=project_id, chat_id=chat_id)
         return jsonify({"reply": final_reply})
 
     except Exception as e:
@@ -2634,20 +2038,13 @@ def dual_chat():
         # -------------------- Extract session/user data --------------------
         user_input = (data.get("query") or data.get("message") or "").strip()
         project_id = data.get("project_id") or "default"
+        user_email = session.get("user_email")
+        user_name = session.get("user_name", "")
         chat_id = data.get("chat_id") or session.get("chat_id")
         if not chat_id:
             chat_id = f"{user_email}_{project_id or 'default'}"
         session["project_uuid"] = project_id
         session["chat_id"] = chat_id
-        user_email = session.get("user_email")
-        user_name = session.get("user_name", "")
-        user_role = get_user_role(user_email)
-        
-        
-        
-        history = load_chat_history(user_email, project_id, chat_id, limit=15)
-        print(f"[DEBUG] Final chat_id resolved: {chat_id}")
-
 
         if not project_id:
             return jsonify({"reply": "⚠️ No project selected."})
@@ -2656,15 +2053,16 @@ def dual_chat():
         if not user_input:
             return jsonify({"reply": random.choice(CONFUSION_RESPONSES)})
 
+        # -------------------- Small talk fast path (before any I/O) --------------------
+        small_talk = answer_small_talk(user_input, route="dual")
+        if small_talk:
+            return jsonify({"reply": small_talk[1]})
 
-        # print_last_conversations(user_email, count=5)
-        
-
+        user_role = get_user_role(user_email)
+        history = load_chat_history(user_email, project_id, chat_id, limit=15)
+        print(f"[DEBUG] Final chat_id resolved: {chat_id}")
 
-        # -------------------- Handle greetings first --------------------
-        greeting_response = handle_greetings(user_input)
-        if greeting_response:
-            return jsonify({"reply": greeting_response})
+        # print_last_conversations(user_email, count=5)
 
         # -------------------- Normalize Query (LLM cleanup) --------------------
         normalized_query = call_openrouter([
@@ -2686,6 +2084,7 @@ def dual_chat():
 
 
         db_answer, doc_context, web_context = None, None, None
+        doc_chunks = []
 
         # -------------------- Database Lookup --------------------
         if "project" in normalized_query.lower():
@@ -2701,12 +2100,24 @@ def dual_chat():
 
         # -------------------- Document Lookup (RAG) --------------------
         try:
-            doc_context = get_context(normalized_query)
+            doc_chunks = get_context_chunks(normalized_query, scope={"project_id": project_id})
         except Exception as e:
             print("❌ Document lookup error:", e)
 
              # Build conversation history
-        conv_hist = load_chat_history(user_email, limit=5)
+        conv_hist = load_chat_history(user_email, limit=2 * RECENT_TURNS)
+        chat_summary = chat_summaries.get(user_email)
+
+        # -------------------- Token-budgeted context --------------------
+        system_content = f"You are a helpful AI assistant for We3Vision. User: {user_name} ({user_email}), Role: {user_role}."
+        if chat_summary:
+            system_content += f"\nConversation so far:\n{chat_summary}"
+        packed = assemble_context(normalized_query, instructions=system_content, history=conv_hist,
+                                  db_answer=db_answer, doc_chunks=doc_chunks)
+        conv_hist = packed["history"]
+        db_answer = packed["db_facts"] or None
+        doc_context = packed["doc_context"] or None
+        print(f"🧮 Prompt budget: {packed['stats']['used']}/{packed['stats']['budget']} tokens, saved {packed['stats']['saved']}")
 
         # -------------------- LLM Synthesis --------------------
         synth_prompt = f"""
@@ -2728,7 +2139,7 @@ def dual_chat():
         """
 
         messages = [
-            {"role": "system", "content": f"You are a helpful AI assistant for We3Vision. User: {user_name} ({user_email}), Role: {user_role}."},
+            {"role": "system", "content": system_content},
             *conv_hist,
             {"role": "user", "content": synth_prompt}
         ]
@@ -2745,24 +2156,15 @@ def dual_chat():
             reply_text = reply  # LLM fallback
 
         save_chat_message(user_email, "assistant", reply_text)
+        update_chat_summary(user_email, None, None, user_input, reply_text)
 
 
         final_reply = format_response(user_input, fallback=reply_text)
 
-            # -------------------- ✅ Run Alignment System Only for Technical Queries --------------------
-        try:
-            project_data = supabase.table("projects").select("*").execute().data
-            if is_technical_prompt(user_input, project_data):
-                check = verify_response_final(user_input, final_reply, project_data, debug=False)
-      
-            #     if check.get("alignment_score") is not None:
-            #          final_reply += f"\n\n🔹 Accuracy: {check['alignment_score']} ({check['trust_level']})"
-            #     else:
-            #         print("ℹ️ Skipped accuracy display — no valid score.")
-            # else:
-            #     print("ℹ️ Skipped alignment — Non-technical/general query.")
-        except Exception as e:
-            print(f"⚠️ Alignment system failed: {e}")
+            # -------------------- ✅ Alignment check (technical queries only, off the response path) --------------------
+        # scored in the background; adds no latency to the reply
+        alignment_queue.submit(user_input, final_reply, user_email=user_email,
+                               project_id=project_id, chat_id=chat_id)
 
         # -------------------- Return Response --------------------
         return jsonify({"reply": final_reply})
@@ -2777,8 +2179,11 @@ def dual_chat():
 
 
 if __name__ == "__main__":  
-    if collection.count() == 0:
+    if not RETRIEVAL_SOCKET and get_collection().count() == 0:
         load_documents()
+    else:
+        # backfill project/department scope on chunks ingested before scoping existed
+        retriever.rescope(load_project_document_map())
     app.run(debug=True, port=8000) 
     
    
@@ -0,0 +1,148 @@
+"""
+Fact extraction: the original per-pattern re.search chain vs the compiled
+trigger-scan engine in memory/facts.py on the corpus below (plus any facts
+in memory.json). Parity is checked in tests/test_fact_extraction.py.
+
+Run from backend/:  python -m benchmarks.bench_fact_extraction
+"""
+import json
+import re
+import time
+
+from memory.facts import scan
+
+CORPUS = [
+    "hi",
+    "hello, good morning",
+    "give me project details",
+    "what is the status of bolt project?",
+    "who is the leader of this project",
+    "show me all projects",
+    "my name is zeel",
+    "I AM LOOKING FOR PROJECT INFO",
+    "i am looking for bolt project",
+    "i am working on chatbot history",
+    "call me everytime by my name not user",
+    "my role is AI develpoper",
+    "i am zeel and today i am wokring on chatbot hi",
+    "i am gujarati",
+    "my name is zeel and i speak gujarati",
+    "I'm a backend developer, I work at We3Vision and I live in Surat.",
+    "i'm 24 years old and i have 3 years of experience",
+    "my phone number is +91 98765 43210, email me at zeel@we3vision.com",
+    "I like python, react and long walks.",
+    "tech stack: flask, supabase, chroma",
+    "my manager is Krishna and i report to him daily",
+    "my team is AI Platform; my department is Engineering",
+    "I am available 10:00 AM - 6:00 PM, timezone: Asia/Kolkata",
+    "my goal is to ship the dual chatbot this sprint",
+    "i am responsible for the retrieval pipeline and evaluation",
+    "my skills are python, nlp, sql",
+    "we use docker and kubernetes for deployment",
+    "what is the deadline for the integration milestone",
+    "can you explain the authentication flow with jwt tokens",
+    "why does the api return 500 when the token expires?",
+    "list the team members assigned to the crm project",
+    "summarize the company leave policy",
+    "thanks, bye",
+]
+
+
+# ---- original implementations (app.py before the compiled engine) ----
+def legacy_user_facts(text):
+    candidates = []
+
+    def clean(val, limit=120):
+        v = (val or "").strip()
+        v = re.sub(r"\s+", " ", v)
+        return v[:limit]
+    m = re.search(r"\b(?:my name is|i am|i'm|this is|call me)\s+([A-Za-z][A-Za-z\s\-]{1,40})", text, re.IGNORECASE)
+    if m: candidates.append(("name", clean(m.group(1).rstrip(".,"))))
+    m = re.search(r"\b(?:i work as|my role is|i am a|i'm a)\s+([A-Za-z][A-Za-z\s\-/]{1,60})", text, re.IGNORECASE)
+    if m: candidates.append(("role", clean(m.group(1).rstrip(".,"))))
+    m = re.search(r"\b(?:i am|i'm)\s+(\d{1,2})\s*(?:years old|yrs old|yo|years)?\b", text, re.IGNORECASE)
+    if m: candidates.append(("age", clean(m.group(1))))
+    m = re.search(r"\b(?:i have|i've)\s+(\d{1,2})\s+(?:years|yrs)\s+of\s+(?:experience|exp)\b", text, re.IGNORECASE)
+    if m: candidates.append(("experience_years", clean(m.group(1))))
+    m = re.search(r"\b(?:i live in|i am from|i'm from|based in)\s+([A-Za-z][A-Za-z\s\-]{1,60})", text, re.IGNORECASE)
+    if m: candidates.append(("location", clean(m.group(1).rstrip(".,"))))
+    m = re.search(r"\b(?:i work at|i work for|my company is)\s+([A-Za-z0-9][A-Za-z0-9\s&\-]{1,60})", text, re.IGNORECASE)
+    if m: candidates.append(("company", clean(m.group(1).rstrip(".,"))))
+    m = re.search(r"\b(?:my phone|my number|phone number)\s*[:is]*\s*(\+?\d[\d\-\s]{7,15}\d)\b", text, re.IGNORECASE)
+    if m: candidates.append(("phone", re.sub(r"\s+", "", m.group(1)).strip()))
+    m = re.search(r"\b([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})\b", text)
+    if m: candidates.append(("email", clean(m.group(1))))
+    m = re.search(r"\bi like\s+([A-Za-z0-9 ,.&\-]{1,60})", text, re.IGNORECASE)
+    if m: candidates.append(("likes", clean(m.group(1).rstrip(".,"))))
+    m = re.search(r"\b(?:i am working on|i'm working on|currently working on|my work is|i'm doing|i work on)\s+(.{5,120})", text, re.IGNORECASE)
+    if m: candidates.append(("current_task", clean(m.group(1))))
+    m = re.search(r"\b(?:i am responsible for|my responsibilities (?:are|include)|i handle)\s+(.{5,120})", text, re.IGNORECASE)
+    if m: candidates.append(("responsibilities", clean(m.group(1))))
+    m = re.search(r"\b(?:my skills (?:are|include)|skills:?)\s+([A-Za-z0-9 ,.&\-]{3,160})", text, re.IGNORECASE)
+    if m: candidates.append(("skills", clean(m.group(1), limit=160)))
+    m = re.search(r"\b(?:i use|tools:|tech stack:|stack:|we use|i work with)\s+([A-Za-z0-9 ,.&\-/]{3,160})", text, re.IGNORECASE)
+    if m: candidates.append(("tools", clean(m.group(1), limit=160)))
+    m = re.search(r"\b(?:i work in)\s+([A-Za-z][A-Za-z\s\-/]{2,60})", text, re.IGNORECASE)
+    if m: candidates.append(("department", clean(m.group(1))))
+    m = re.search(r"\b(?:my department is|department:|i'm in the)\s+([A-Za-z][A-Za-z\s\-/]{2,60})", text, re.IGNORECASE)
+    if m: candidates.append(("department", clean(m.group(1))))
+    m = re.search(r"\b(?:my manager is|i report to)\s+([A-Za-z][A-Za-z\s\-]{2,60})", text, re.IGNORECASE)
+    if m: candidates.append(("manager", clean(m.group(1))))
+    m = re.search(r"\b(?:my team is|team:|i'm on the)\s+([A-Za-z][A-Za-z\s\-]{2,60})", text, re.IGNORECASE)
+    if m: candidates.append(("team", clean(m.group(1))))
+    m = re.search(r"\b(?:i am available|availability is|available from)\s+([0-9:APMapm\-\s]{5,40})", text)
+    if m: candidates.append(("availability_hours", clean(m.group(1))))
+    m = re.search(r"\b(?:timezone|time zone)\s*[:is]*\s*([A-Za-z/_+\-0-9]{3,32})", text, re.IGNORECASE)
+    if m: candidates.append(("timezone", clean(m.group(1))))
+    m = re.search(r"\b(?:i speak|languages?:)\s+([A-Za-z ,\-]{3,80})", text, re.IGNORECASE)
+    if m: candidates.append(("languages", clean(m.group(1))))
+    m = re.search(r"\b(?:my goal is|my goals are|i want to)\s+(.{5,120})", text, re.IGNORECASE)
+    if m: candidates.append(("goals", clean(m.group(1))))
+    return candidates
+
+
+def legacy_memory_facts(text):
+    facts = []
+    for p in [
+        r"\bmy name is\s+([A-Za-z][A-Za-z\s\-]{1,40})",
+        r"\bi am\s+([A-Za-z][A-Za-z\s\-]{1,40})",
+        r"\bi'm\s+([A-Za-z][A-Za-z\s\-]{1,40})",
+        r"\bi like\s+([A-Za-z0-9 ,.&\-]{1,60})",
+        r"\bmy role is\s+([A-Za-z][A-Za-z\s\-]{1,40})",
+        r"\bcall me\s+([A-Za-z][A-Za-z\s\-]{1,40})",
+    ]:
+        m = re.search(p, text, flags=re.IGNORECASE)
+        if m:
+            facts.append(m.group(0).strip())
+    return facts
+
+
+def load_corpus():
+    lines = list(CORPUS)
+    try:
+        with open("memory.json", "r", encoding="utf-8") as f:
+            for entry in json.load(f).values():
+                lines.extend(entry.get("facts", []))
+    except (OSError, ValueError):
+        pass
+    return lines
+
+
+if __name__ == "__main__":
+    corpus = load_corpus()
+    rounds = 300
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for line in corpus:
+            legacy_user_facts(line)
+            legacy_memory_facts(line)
+    old = (time.perf_counter() - start) / (rounds * len(corpus))
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for line in corpus:
+            scan.__wrapped__(line)  # bypass the per-message cache
+    new = (time.perf_counter() - start) / (rounds * len(corpus))
+
+    print(f"re.search chain : {old * 1e6:7.1f} us/message")
+    print(f"compiled engine : {new * 1e6:7.1f} us/message  ({old / new:.1f}x faster)")
@@ -0,0 +1,61 @@
+"""
+Per-message cost of remember(): whole-file memory.json rewrite vs the
+append-only fact log, at 10k users.
+
+Run from backend/:  python -m benchmarks.bench_fact_log
+"""
+import json
+import os
+import random
+import tempfile
+import time
+
+from memory import FactLogStore
+
+USERS = 10_000
+MESSAGES = 2_000
+REWRITE_MESSAGES = 100  # the old path is slow enough that a sample suffices
+
+
+def seed(path):
+    data = {f"user{i}@we3vision.com": {"facts": [f"my name is user{i}", "i like python"],
+                                       "last_seen": "2025-01-01T00:00:00+00:00"}
+            for i in range(USERS)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def bench_rewrite(path, data):
+    start = time.perf_counter()
+    for n in range(REWRITE_MESSAGES):
+        email = f"user{random.randrange(USERS)}@we3vision.com"
+        entry = data[email]
+        if n % 20 == 0:  # ~5% of messages carry a new fact
+            entry["facts"].append(f"i like topic {n}")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    return (time.perf_counter() - start) / REWRITE_MESSAGES
+
+
+def bench_fact_log(path):
+    store = FactLogStore(path, compact_every=10_000)
+    start = time.perf_counter()
+    for n in range(MESSAGES):
+        email = f"user{random.randrange(USERS)}@we3vision.com"
+        facts = [f"i like topic {n}"] if n % 20 == 0 else ["i like python"]
+        store.add_facts(email, facts)
+        store.touch(email)
+    return (time.perf_counter() - start) / MESSAGES
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old.json")
+        new_path = os.path.join(tmp, "new.json")
+        old = bench_rewrite(old_path, seed(old_path))
+        seed(new_path)
+        new = bench_fact_log(new_path)
+    print(f"users={USERS} messages={MESSAGES}")
+    print(f"whole-file rewrite : {old * 1e3:8.3f} ms/message")
+    print(f"append-only log    : {new * 1e3:8.3f} ms/message  ({old / new:,.0f}x faster)")
@@ -0,0 +1,78 @@
+"""
+detect_intent keyword stage: the original ordered substring checks vs the
+compiled router in prompting/intent.py, timed on the queries of CASES, a
+table of expected intents that includes queries the old checks mis-routed
+(checked in tests/test_intent_router.py). Best of five interleaved passes.
+
+Run from backend/:  python -m benchmarks.bench_intent_router
+"""
+import time
+
+from prompting.intent import SPECIFIC_FIELDS, route_intent
+
+# (query, expected intent, what the original returned when it differs)
+CASES = [
+    ("show all projects", "all_projects", None),
+    ("badha project batavo", "all_projects", None),
+    ("give me project details", "project_details", None),
+    ("tell me about this project", "project_details", None),
+    ("what is the project status", "status", "project_details"),
+    ("who is the leader of the project", "leader", "project_details"),
+    ("project timeline please", "timeline", "project_details"),
+    ("which tools are used in this project", "tech_stack", "project_details"),
+    ("list the team members", "members", None),
+    ("who is working on onboarding", "members", None),
+    ("what is the deadline", "timeline", None),
+    ("who is the client", "client", None),
+    ("current state of payments", "status", None),
+    ("write a python function to parse dates", "coding", None),
+    ("fix this sql error", "debugging", None),
+    ("why does my loop raise an exception", "debugging", None),
+    ("solve this equation for x", "math", None),
+    ("give me a summary", "general", "math"),
+    ("what is the capital of france", None, "coding"),
+    ("who is ahead in the race", None, "leader"),
+    ("describe the architecture", "general", None),
+    ("hello", None, None),
+]
+
+
+# ---- original keyword stage of detect_intent (None = would ask the LLM) ----
+def legacy_route(user_query):
+    q = user_query.lower().strip()
+    if any(word in q for word in ["all project", "all projects", "list projects", "every project", "badha project", "badha"]):
+        return "all_projects"
+    if any(word in q for word in ["project details", "project info", "give me project", "all details", "project", "details of project"]):
+        return "project_details"
+    if any(word in q for word in ["code", "function", "script", "program", "sql", "api", "class", "loop", "```"]):
+        if any(word in q for word in ["error", "traceback", "exception", "bug", "fix", "issue"]):
+            return "debugging"
+        return "coding"
+    if any(word in q for word in ["solve", "integral", "derivative", "equation", "calculate", "sum", "matrix", "theorem"]):
+        return "math"
+    for field, keywords in SPECIFIC_FIELDS.items():
+        for k in keywords:
+            if k in q:
+                return field
+    for g in ["overview", "summary", "introduction", "info", "information", "details", "describe", "about"]:
+        if g in q:
+            return "general"
+    return None
+
+
+if __name__ == "__main__":
+    queries = [q for q, _, _ in CASES]
+    rounds = 2000
+    fns = {"original": legacy_route, "router": route_intent.__wrapped__, "router, cached": route_intent}
+    best = dict.fromkeys(fns, float("inf"))
+    # passes are interleaved so that clock drift hits every variant alike
+    for _ in range(5):
+        for label, fn in fns.items():
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for q in queries:
+                    fn(q)
+            best[label] = min(best[label], time.perf_counter() - start)
+    n = rounds * len(queries)
+    for label, t in best.items():
+        print(f"{label:<15}: {t / n * 1e6:6.2f} µs/query  ({n / t:,.0f} queries/s)")
@@ -0,0 +1,102 @@
+"""
+Reply cleaning for the verifier: the original _clean_reply_text +
+_normalize_for_compare + _token_set chain (seven re.sub passes on inline
+patterns, then a tokenize) vs verification.text (two heading passes and one
+fused substitution). Asserts identical normalized text and token sets on
+randomly generated markdown-ish replies, then times both on long replies,
+and times verify_response_final with the per-reply memo cold and warm.
+
+Run from backend/:  python -m benchmarks.bench_reply_text
+"""
+import random
+import re
+import time
+
+from verification import get_verification_index, verify_response_final
+from verification.text import normalize_reply, reply_text, token_set
+
+
+# ---- original helpers (verification/verifier.py and verification/index.py) ----
+def legacy_clean(text):
+    if not text:
+        return ""
+    s = text
+    s = re.sub(r"(?mi)^(summary|details|information|info|result|solution|overview|response)\s*$", "", s, flags=re.MULTILINE)
+    s = re.sub(r"(?m)^[A-Z\s]{2,60}\n", "", s)
+    s = re.sub(r"[-•*]{1,2}\s+", " ", s)
+    s = re.sub(r"\([^)]*\)", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s.lower()
+
+
+def legacy_normalize(s):
+    if not s:
+        return ""
+    s = s.lower()
+    s = re.sub(r"[^\w\s@._-]", " ", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s
+
+
+def legacy_tokens(s):
+    return set([t.lower() for t in re.findall(r"[a-z0-9@._-]+", s or "", re.I)])
+
+
+PIECES = ["SUMMARY", "Summary", "Details:", "OVERVIEW\n", "PROJECT STATUS", "- ", "* ", "• ", "** ", "(", ")",
+          "(priya@example.com)", "Priya Shah", "In Progress", "2025-03-01", "Flask/React", "e.g.", "über",
+          "İstanbul", "ſtatus", "ıd", "—", "it's", "TEAM", "A", "\n", "\n\n", "  ", "\t", "100%", "#", "**bold**", "x-y_z"]
+
+
+def make_reply(rng, n):
+    return "".join(rng.choice(PIECES) + rng.choice(["", " ", "\n"]) for _ in range(n))
+
+
+SENTENCES = ["The project is currently in progress and the team is working on the billing module.",
+             "Priya Shah (priya@example.com) leads the backend work, with Arjun handling the React frontend.",
+             "The tech stack is Flask, Supabase and React; deployment runs on Docker.",
+             "The start date was 2025-03-01 and the end date is planned for 2025-09-30.",
+             "Open issues: invoice export, role-based access and the audit log."]
+
+
+def make_long_reply(rng, paragraphs):
+    """A realistic LLM answer: headings, bullets and prose."""
+    out = []
+    for i in range(paragraphs):
+        out.append(rng.choice(["SUMMARY", "PROJECT DETAILS", "Overview", f"Section {i}:"]))
+        out.extend(f"{rng.choice(['-', '*', '•'])} {rng.choice(SENTENCES)}" for _ in range(rng.randint(2, 5)))
+        out.append(" ".join(rng.choice(SENTENCES) for _ in range(rng.randint(2, 6))))
+        out.append("")
+    return "\n".join(out)
+
+
+def timed(fn, items, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for x in items:
+            fn(x)
+    return (time.perf_counter() - start) / (rounds * len(items)) * 1e6
+
+
+if __name__ == "__main__":
+    rng = random.Random(11)
+    for i in range(5000):
+        reply = make_reply(rng, rng.randint(0, 60)) if i % 10 else make_long_reply(rng, 2)
+        expected = legacy_normalize(legacy_clean(reply))
+        assert normalize_reply(reply) == expected, repr(reply)
+        assert reply_text.__wrapped__(reply).tokens == legacy_tokens(expected), repr(reply)
+        assert token_set(expected) == legacy_tokens(expected)
+    print("5,000 random replies: normalized text and token sets identical to the original")
+
+    long_replies = [make_long_reply(rng, 12) for _ in range(50)]  # ~8 KB each
+    t_old = timed(lambda r: legacy_tokens(legacy_normalize(legacy_clean(r))), long_replies, 20)
+    t_new = timed(lambda r: reply_text.__wrapped__(r).tokens, long_replies, 20)
+    print(f"clean+normalize+tokens, 8 KB reply: original {t_old:7.1f} µs → {t_new:7.1f} µs  ({t_old / t_new:.1f}x)")
+
+    projects = [{"id": i, "project_name": f"Project {i}", "status": "In Progress", "leader_of_project": "Priya Shah",
+                 "start_date": "2025-03-01", "tech_stack": ["Flask", "React"],
+                 "project_description": "Delivery tracking dashboard"} for i in range(20)]
+    index = get_verification_index(projects)
+    query = "what is the project status, leader, team and tech stack timeline"
+    cold = timed(lambda r: (reply_text.cache_clear(), verify_response_final(query, r, index)), long_replies, 10)
+    warm = timed(lambda r: verify_response_final(query, r, index), long_replies[:1], 500)
+    print(f"verify_response_final, 8 KB reply: cold {cold:7.1f} µs, memoized reply {warm:7.1f} µs")
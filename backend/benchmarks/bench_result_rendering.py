@@ -0,0 +1,67 @@
+"""
+query_supabase result formatting: the original per-cell loop vs
+rendering.render_bullets at 1,000 project-like rows (nested tech_stack lists,
+member dicts, empty cells). Output parity is checked in
+tests/test_result_rendering.py.
+
+Run from backend/:  python -m benchmarks.bench_result_rendering
+"""
+import json
+import random
+import time
+
+from rendering import render_bullets
+
+
+# ---- original formatting block of query_supabase ----
+def legacy_bullets(data):
+    formatted = []
+    for row in data:
+        details = []
+        for k, v in row.items():
+            if v in [None, "", [], {}]:
+                continue
+            if isinstance(v, (list, dict)):
+                try:
+                    v = json.dumps(v, ensure_ascii=False)
+                except:
+                    v = str(v)
+            details.append(f"{k.replace('_', ' ').title()}: {v}")
+        formatted.append("• " + "\n  ".join(details))
+    return "\n\n---\n\n".join(formatted)
+
+
+def make_rows(n, seed=3):
+    rng = random.Random(seed)
+    stacks = ["Flask", "React", "Supabase", "Docker", "Node", "Postgres", "Redis", "Next.js"]
+    rows = []
+    for i in range(n):
+        rows.append({
+            "uuid": f"0000-{i:06d}",
+            "project_name": f"Project {i} – Überblick",
+            "project_description": "Internal dashboard for tracking deliveries and invoices. " * rng.randint(1, 4),
+            "status": rng.choice(["In Progress", "Completed", "On Hold", ""]),
+            "priority": rng.choice(["High", "Medium", "Low", None]),
+            "client_name": rng.choice(["Acme", "Globex", None]),
+            "start_date": "2025-01-15",
+            "end_date": rng.choice(["2025-09-30", None]),
+            "tech_stack": rng.sample(stacks, rng.randint(0, 5)),
+            "assigned_to_emails": [f"user{j}@example.com" for j in range(rng.randint(0, 6))],
+            "leader_of_project": {"name": "Priya", "email": "priya@example.com"} if rng.random() < 0.5 else {},
+            "budget": rng.randint(1000, 90000),
+            "is_active": rng.random() < 0.8,
+        })
+    return rows
+
+
+def timed(fn, rows, rounds=20):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn(rows)
+    return (time.perf_counter() - start) / rounds * 1e3
+
+
+if __name__ == "__main__":
+    rows = make_rows(1000)
+    t_old, t_new = timed(legacy_bullets, rows), timed(render_bullets, rows)
+    print(f"bullets: original {t_old:6.2f} ms → {t_new:6.2f} ms  ({t_old / t_new:.1f}x)")
@@ -0,0 +1,90 @@
+"""
+Session storage round trip (load + save per request) for the filesystem
+layout Flask-Session uses today vs the SQLite and in-memory stores.
+
+The filesystem case mirrors cachelib's FileSystemCache: one pickle file per
+session id, written to a temp file and renamed into place. Flask itself is not
+needed; this measures the storage layer each request pays for.
+
+Run from backend/:  python -m benchmarks.bench_session_stores
+"""
+import hashlib
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
+
+from sessions import MemorySessionStore, SQLiteSessionStore
+
+SESSIONS = 2_000
+REQUESTS = 20_000
+THREADS = 4
+TTL = 3600
+
+
+class FileSystemStore:
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, sid):
+        return os.path.join(self.root, hashlib.md5(sid.encode()).hexdigest())
+
+    def get(self, sid):
+        try:
+            with open(self._path(sid), "rb") as f:
+                expires = pickle.load(f)
+                if expires < time.time():
+                    return None
+                return pickle.load(f)
+        except OSError:
+            return None
+
+    def set(self, sid, value, ttl):
+        fd, tmp = tempfile.mkstemp(dir=self.root)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(time.time() + ttl, f)
+            pickle.dump(value, f)
+        os.replace(tmp, self._path(sid))
+
+
+def payload(i):
+    ring = [{"role": "user" if n % 2 == 0 else "assistant", "content": "x" * 300} for n in range(6)]
+    return pickle.dumps({"user_email": f"user{i}@we3vision.com", "user_name": "User",
+                         "project_id": "p-1", "chat_id": f"chat-{i}", "chat_history": ring})
+
+
+def run(store):
+    sids = [f"sid-{i}" for i in range(SESSIONS)]
+    for i, sid in enumerate(sids):
+        store.set(sid, payload(i), TTL)
+    per_thread = REQUESTS // THREADS
+
+    def worker():
+        for _ in range(per_thread):
+            sid = random.choice(sids)
+            data = store.get(sid)
+            store.set(sid, data, TTL)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * THREADS / elapsed, elapsed / (per_thread * THREADS)
+
+
+if __name__ == "__main__":
+    print(f"sessions={SESSIONS} requests={REQUESTS} threads={THREADS}")
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "fs"))
+        for name, store in [
+            ("filesystem", FileSystemStore(os.path.join(tmp, "fs"))),
+            ("sqlite", SQLiteSessionStore(os.path.join(tmp, "sessions.db"))),
+            ("memory", MemorySessionStore()),
+        ]:
+            rps, latency = run(store)
+            print(f"{name:10s}: {rps:10,.0f} req/s  {latency * 1e6:8.1f} us/request")
@@ -0,0 +1,52 @@
+"""
+Retrieval sidecar transport cost: one short Unix-socket connection per call.
+Serves a fixed-result retriever so only connect + JSON line + reply is timed,
+then compares N single-query calls with one query_many call of N queries.
+
+Run from backend/:  python -m benchmarks.bench_sidecar_roundtrip
+"""
+import os
+import tempfile
+import threading
+import time
+
+from retrieval.sidecar import RemoteRetriever, RetrievalServer
+
+CHUNK = "Acme builds internal tooling for logistics teams. " * 8
+
+
+class FixedRetriever:
+    def query(self, query, k=3, scope=None):
+        return [CHUNK] * k
+
+
+def bench(fn, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - t0) / n * 1e3
+
+
+def main(n=2000, batch=4):
+    path = os.path.join(tempfile.mkdtemp(), "retrieval.sock")
+    server = RetrievalServer(path, FixedRetriever())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    remote = RemoteRetriever(path)
+    queries = [f"query {i}" for i in range(batch)]
+    try:
+        ping = bench(remote.client.ping, n)
+        one = bench(lambda: remote.query("company information"), n)
+        singles = bench(lambda: [remote.query(q) for q in queries], n // batch)
+        many = bench(lambda: remote.query_many(queries), n // batch)
+        print(f"ping                 {ping:7.3f} ms/call")
+        print(f"query (1 query)      {one:7.3f} ms/call")
+        print(f"{batch} x query          {singles:7.3f} ms")
+        print(f"query_many({batch})        {many:7.3f} ms  ({singles / many:.1f}x)")
+    finally:
+        server.shutdown()
+        server.server_close()
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Verifier similarity backends on ~2k-character replies: raw similarity cost
+per call, full verify_response_final cost, and score parity against the
+original uncached difflib.SequenceMatcher on a fixed, seeded corpus. The
+exactness checks live in tests/test_similarity.py.
+
+Run from backend/:  python -m benchmarks.bench_similarity
+"""
+import random
+import time
+from difflib import SequenceMatcher
+
+from verification import BACKENDS, get_verification_index, verify_response_final
+
+SEED = 7
+REPLIES = 200
+REPLY_CHARS = 2000
+WORDS = ("apollo hermes atlas crm portal mobile app dashboard flask react python supabase docker "
+         "kubernetes api auth jwt token deployment sprint milestone client acme globex leader team "
+         "alice bob carol dave erin status in progress completed on hold timeline start end 2024 2025 "
+         "integration testing review design database schema migration analytics report").split()
+QUERIES = ["what is the project name", "who is the leader", "tell me about the project",
+           "describe the scope", "project title please"]
+
+
+def _text(rng, chars):
+    out, n = [], 0
+    while n < chars:
+        w = rng.choice(WORDS)
+        out.append(w)
+        n += len(w) + 1
+    return " ".join(out)
+
+
+def corpus():
+    rng = random.Random(SEED)
+    projects = [{
+        "id": i,
+        "updated_at": "2025-01-01T00:00:00+00:00",
+        "project_name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+        "leader_of_project": rng.choice(["Alice Smith", "Bob Jones", "Carol White"]),
+        "status": rng.choice(["In Progress", "Completed", "On Hold"]),
+        "start_date": f"202{rng.randint(3, 5)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}",
+        "project_description": _text(rng, 600),
+        "project_scope": _text(rng, 300),
+    } for i in range(12)]
+    cases = [(rng.choice(QUERIES), _text(rng, REPLY_CHARS)) for _ in range(REPLIES)]
+    return projects, cases
+
+
+def original_ratio(a, b):
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def bench_ratio(fn, pairs):
+    start = time.perf_counter()
+    values = [fn(a, b) for a, b in pairs]
+    return (time.perf_counter() - start) / len(pairs), values
+
+
+def bench_verify(sim, index, cases):
+    start = time.perf_counter()
+    results = [verify_response_final(q, r, index, similarity=sim) for q, r in cases]
+    return (time.perf_counter() - start) / len(cases), results
+
+
+if __name__ == "__main__":
+    projects, cases = corpus()
+    index = get_verification_index(projects)
+    pairs = [(r.lower(), index.text["description"]) for _, r in cases]
+
+    base_t, base_vals = bench_ratio(original_ratio, pairs)
+    vbase_t, vbase = bench_verify(original_ratio, index, cases)
+    print(f"replies={len(cases)} chars/reply≈{REPLY_CHARS} description chars={len(index.text['description'])}")
+    print(f"{'backend':<14}{'ratio ms':>10}{'speedup':>9}{'verify ms':>11}{'speedup':>9}"
+          f"{'mean |Δscore|':>15}{'trust agree':>13}")
+    print(f"{'original':<14}{base_t * 1e3:>10.3f}{'1.0x':>9}{vbase_t * 1e3:>11.3f}{'1.0x':>9}{0:>15.2f}{'100.0%':>13}")
+    for name, fn in BACKENDS.items():
+        t, _ = bench_ratio(fn, pairs)
+        vt, res = bench_verify(name, index, cases)
+        deltas = [abs((a["alignment_score"] or 0) - (b["alignment_score"] or 0)) for a, b in zip(vbase, res)]
+        agree = sum(a["trust_level"] == b["trust_level"] for a, b in zip(vbase, res)) / len(res)
+        print(f"{name:<14}{t * 1e3:>10.3f}{base_t / t:>8.1f}x{vt * 1e3:>11.3f}{vbase_t / vt:>8.1f}x"
+              f"{sum(deltas) / len(deltas):>15.2f}{agree:>12.1%}")
@@ -0,0 +1,97 @@
+"""
+is_technical_prompt: the original per-pattern re.search loop that re-tokenized
+every project on each call vs the compiled detector in
+verification/technical.py. Checks both classify every corpus line the same.
+
+Run from backend/:  python -m benchmarks.bench_technical_prompt
+"""
+import random
+import re
+import time
+
+from verification.technical import TechnicalPromptDetector
+
+CORPUS = [
+    "hi", "hello there", "good morning team", "thanks, bye", "how are you today",
+    "what's your name", "what is the weather in surat", "who is narendra modi",
+    "tell me the company name", "what is the capital of france",
+    "who is the leader of apollo", "what is the tech stack of the crm portal",
+    "why does the api return 500 when the token expires",
+    "list the team members on atlas", "when is the deadline for hermes",
+    "explain the deployment pipeline", "give me a summary of orion billing",
+    "status of zephyr migration", "which database do we use", "any update on the analytics dashboard",
+    "can you summarize this document", "write a poem about the sea", "ok", "nova",
+]
+WORDS = ("apollo hermes atlas orion zephyr nova billing analytics dashboard crm portal mobile migration "
+         "payments onboarding reporting sync").split()
+
+
+# ---- original implementation (app.py before the compiled detector) ----
+def legacy_is_technical_prompt(user_input, project_data):
+    if not user_input:
+        return False
+    text = user_input.lower().strip()
+    non_tech_patterns = [
+        r"\bwho is narendra\b", r"\bprime minister\b", r"\bweather\b", r"\btime\b",
+        r"\bcompany name\b", r"\bwe3vision\b", r"\babout company\b",
+        r"\bhello\b", r"\bhi\b", r"\bhey\b", r"\bthanks\b", r"\bbye\b",
+        r"\bgood (morning|afternoon|evening)\b", r"\bhow are you\b",
+        r"\bwhat('?s| is) your name\b"
+    ]
+    for pat in non_tech_patterns:
+        if re.search(pat, text):
+            return False
+    tokens = re.findall(r"[a-z0-9_@]+", text)
+    if len(tokens) < 2:
+        return False
+    tech_keywords = {
+        "api", "flask", "backend", "frontend", "database", "sql", "supabase", "bug",
+        "error", "debug", "react", "node", "python", "javascript", "deployment",
+        "auth", "token", "jwt", "docker", "kubernetes", "langchain", "chroma",
+        "project", "timeline", "leader", "team", "client", "scope", "stack",
+        "tech", "framework", "field", "deadline", "responsibility"
+    }
+    if any(k in text for k in tech_keywords):
+        return True
+    project_keywords = set()
+    for proj in project_data or []:
+        if not isinstance(proj, dict):
+            continue
+        for key in ("project_name", "project_description", "project_scope",
+                    "tech_stack", "tech_stack_custom", "project_field", "leader_of_project"):
+            val = proj.get(key)
+            if val:
+                project_keywords.update(re.findall(r"[a-z0-9_@]+", str(val).lower()))
+    if not project_keywords:
+        return False
+    overlap = len([t for t in tokens if t in project_keywords])
+    if overlap >= 1:
+        return True
+
+
+def projects(n=200, seed=5):
+    rng = random.Random(seed)
+    return [{"id": i, "updated_at": "2025-01-01T00:00:00+00:00",
+             "project_name": f"{rng.choice(WORDS)} {rng.choice(WORDS)}",
+             "project_description": " ".join(rng.choices(WORDS, k=40)),
+             "tech_stack": ["React", "Flask"], "leader_of_project": "Alice"} for i in range(n)]
+
+
+if __name__ == "__main__":
+    data = projects()
+    detector = TechnicalPromptDetector()
+    for line in CORPUS:
+        assert bool(legacy_is_technical_prompt(line, data)) == detector(line, data), line
+    print(f"parity ok on {len(CORPUS)} lines, {len(data)} projects")
+
+    rounds = 50
+    # "fresh list" mimics a per-request Supabase fetch: same rows, new list object
+    for label, fn, fresh in (("original", legacy_is_technical_prompt, False),
+                             ("compiled", detector, False),
+                             ("compiled, fresh list", detector, True)):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for line in CORPUS:
+                fn(line, list(data) if fresh else data)
+        per_call = (time.perf_counter() - start) / (rounds * len(CORPUS))
+        print(f"{label:<21}: {per_call * 1e6:10.1f} µs/call")
@@ -0,0 +1,20 @@
+"""
+Local Data Paths
+
+The SQLite stores and archives this backend writes default to DATA_DIR
+(default: the working directory, as before), so one setting moves all of
+them out of the source tree. A store's own variable (MEMORY_DB, ...) still
+takes precedence. The default file names are listed in .gitignore.
+"""
+import os
+
+
+def data_path(name: str, env: str = None) -> str:
+    """``$env`` if set, else ``name`` inside DATA_DIR (created on first use)."""
+    if env and os.getenv(env):
+        return os.getenv(env)
+    data_dir = os.getenv("DATA_DIR", "")
+    if not data_dir:
+        return name
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, name)
@@ -0,0 +1,46 @@
+# Gunicorn settings picked up automatically from the working directory.
+import os
+import subprocess
+import sys
+import time
+
+PREWARM_RETRIEVAL = os.getenv("PREWARM_RETRIEVAL", "0") == "1"
+RETRIEVAL_SIDECAR = os.getenv("RETRIEVAL_SIDECAR", "0") == "1"
+SIDECAR_SOCKET = os.getenv("RETRIEVAL_SOCKET", "/tmp/debugmate-retrieval.sock")
+
+_sidecar = None
+
+
+def on_starting(server):
+    """Start one shared retrieval sidecar before any worker is forked."""
+    global _sidecar
+    if not RETRIEVAL_SIDECAR:
+        return
+    _sidecar = subprocess.Popen([sys.executable, "-m", "retrieval.sidecar", "--socket", SIDECAR_SOCKET])
+    # Workers inherit the environment, so app.py picks the RemoteRetriever.
+    os.environ["RETRIEVAL_SOCKET"] = SIDECAR_SOCKET
+    from retrieval import SidecarClient
+    client = SidecarClient(SIDECAR_SOCKET, timeout=2.0)
+    deadline = time.time() + 120
+    while time.time() < deadline and _sidecar.poll() is None:
+        if client.ping():
+            server.log.info("Retrieval sidecar ready on %s", SIDECAR_SOCKET)
+            return
+        time.sleep(0.5)
+    server.log.warning("Retrieval sidecar did not become ready; workers will retry on demand")
+
+
+def on_exit(server):
+    if _sidecar is not None and _sidecar.poll() is None:
+        _sidecar.terminate()
+
+
+def post_worker_init(worker):
+    """Optionally load the embedding model and Chroma before serving requests."""
+    if not PREWARM_RETRIEVAL or os.getenv("RETRIEVAL_SOCKET"):
+        return
+    try:
+        from retrieval import prewarm
+        prewarm()
+    except Exception as e:
+        worker.log.warning("Retrieval prewarm failed: %s", e)
@@ -0,0 +1,22 @@
+from .archive import ChatArchive, archive_older_than, archive_rows
+from .chat_cache import ChatHistoryCache
+from .messages import Message, to_wire
+from .session_ring import push_turn, recent_turns, SESSION_HISTORY_TURNS
+from .transfer import export_history, import_history
+from .writer import OrderedWriter
+
+# Chat history helpers (session ring, caches, archives)
+__all__ = [
+    'push_turn',
+    'recent_turns',
+    'SESSION_HISTORY_TURNS',
+    'ChatHistoryCache',
+    'Message',
+    'to_wire',
+    'export_history',
+    'import_history',
+    'ChatArchive',
+    'archive_older_than',
+    'archive_rows',
+    'OrderedWriter'
+]
@@ -0,0 +1,185 @@
+"""
+Tiered Chat History Retention
+
+save_chat_message used to delete everything past ``keep_limit`` messages per
+chat, so old conversations were lost, and the hot user_memory table kept
+growing across chats. Cold messages are now moved into compressed archive
+segments on local disk before they leave Supabase.
+
+Each segment is a file of concatenated gzip members; every member holds the
+JSON lines of one (user, project, chat) batch. A SQLite index records where
+each member starts, so a page of one chat is read by seeking to its members
+and decompressing only those. Segments are per-process files, so gunicorn
+workers never interleave writes.
+
+Run the age-based pass from backend/:
+    python -m history.archive --older-than-days 30
+"""
+import argparse
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from data_paths import data_path
+
+# CHAT_ARCHIVE_DIR, else chat_archive/ in DATA_DIR
+ARCHIVE_DIR = data_path("chat_archive", "CHAT_ARCHIVE_DIR")
+SEGMENT_BYTES = int(os.getenv("CHAT_ARCHIVE_SEGMENT_MB", "64")) * 1024 * 1024
+TABLE = "user_memory"
+COLUMNS = "id, user_id, project_id, chat_id, role, content, timestamp"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS archive_members (
+    user_id    TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    chat_id    TEXT NOT NULL,
+    segment    TEXT NOT NULL,
+    offset     INTEGER NOT NULL,
+    length     INTEGER NOT NULL,
+    rows       INTEGER NOT NULL,
+    first_ts   TEXT,
+    last_ts    TEXT
+);
+CREATE INDEX IF NOT EXISTS archive_members_chat
+    ON archive_members(user_id, project_id, chat_id, last_ts);
+"""
+
+ChatKey = Tuple[str, str, str]
+
+
+class ChatArchive:
+    def __init__(self, root: str = ARCHIVE_DIR, segment_bytes: int = SEGMENT_BYTES):
+        self.root = root
+        self.segment_bytes = segment_bytes
+        os.makedirs(root, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._segment = None
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.root, "index.db"), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _segment_path(self) -> str:
+        # one open segment per process; rotate once it is large
+        if (self._segment is None or not os.path.exists(self._segment)
+                or os.path.getsize(self._segment) >= self.segment_bytes):
+            name = f"seg-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{time.monotonic_ns()}.jsonl.gz"
+            self._segment = os.path.join(self.root, name)
+        return self._segment
+
+    def append(self, rows: Iterable[dict]) -> int:
+        """Archive rows, one gzip member per chat. Returns the number of rows written."""
+        by_chat: Dict[ChatKey, List[dict]] = {}
+        for row in rows:
+            key = (str(row["user_id"]), row.get("project_id") or "default", row.get("chat_id") or "default")
+            by_chat.setdefault(key, []).append(row)
+        if not by_chat:
+            return 0
+
+        entries = []
+        with self._write_lock:
+            path = self._segment_path()
+            with open(path, "ab") as f:
+                for key, chat_rows in by_chat.items():
+                    chat_rows.sort(key=lambda r: r.get("timestamp") or "")
+                    payload = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in chat_rows)
+                    blob = gzip.compress(payload.encode("utf-8"))
+                    offset = f.tell()
+                    f.write(blob)
+                    entries.append((*key, os.path.basename(path), offset, len(blob), len(chat_rows),
+                                    chat_rows[0].get("timestamp"), chat_rows[-1].get("timestamp")))
+                f.flush()
+                os.fsync(f.fileno())
+        conn = self._conn()
+        with conn:
+            conn.executemany("INSERT INTO archive_members VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", entries)
+        return sum(e[6] for e in entries)
+
+    def count(self, user_id: str, project_id: str = None, chat_id: str = None) -> int:
+        row = self._conn().execute(
+            "SELECT COALESCE(SUM(rows), 0) FROM archive_members WHERE user_id = ? AND project_id = ? AND chat_id = ?",
+            (str(user_id), project_id or "default", chat_id or "default")).fetchone()
+        return row[0]
+
+    def _read_member(self, segment: str, offset: int, length: int) -> List[dict]:
+        with open(os.path.join(self.root, segment), "rb") as f:
+            f.seek(offset)
+            blob = f.read(length)
+        return [json.loads(line) for line in gzip.decompress(blob).decode("utf-8").splitlines() if line]
+
+    def page(self, user_id: str, project_id: str = None, chat_id: str = None,
+             cursor: int = 0, limit: int = 50) -> Tuple[List[dict], Optional[int]]:
+        """
+        Page backwards through one chat's archive, newest first.
+        ``cursor`` is the number of messages already returned; the page comes
+        back oldest-first together with the next cursor (None when exhausted).
+        """
+        members = self._conn().execute(
+            "SELECT segment, offset, length, rows FROM archive_members "
+            "WHERE user_id = ? AND project_id = ? AND chat_id = ? ORDER BY last_ts DESC, rowid DESC",
+            (str(user_id), project_id or "default", chat_id or "default")).fetchall()
+        skip, out, remaining = cursor, [], 0
+        for i, (segment, offset, length, rows) in enumerate(members):
+            if len(out) >= limit:
+                remaining = sum(m[3] for m in members[i:])
+                break
+            if skip >= rows:
+                # whole member already returned; no need to decompress it
+                skip -= rows
+                continue
+            newest_first = self._read_member(segment, offset, length)[::-1][skip:]
+            skip = 0
+            take = newest_first[:limit - len(out)]
+            out.extend(take)
+            remaining += len(newest_first) - len(take)
+        next_cursor = cursor + len(out) if remaining else None
+        return [{"role": r["role"], "content": r["content"], "timestamp": r.get("timestamp")}
+                for r in reversed(out)], next_cursor
+
+
+def archive_rows(client, archive: ChatArchive, rows: List[dict], delete_batch: int = 500) -> int:
+    """Write rows to the archive, then delete them from the hot table."""
+    written = archive.append(rows)
+    ids = [r["id"] for r in rows]
+    for i in range(0, len(ids), delete_batch):
+        client.table(TABLE).delete().in_("id", ids[i:i + delete_batch]).execute()
+    return written
+
+
+def archive_older_than(client, archive: ChatArchive, days: int, page_size: int = 1000) -> dict:
+    """Move every message older than ``days`` from user_memory into the archive."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    start, total = time.perf_counter(), 0
+    while True:
+        # archived rows are deleted, so the first page is always the next one
+        page = (client.table(TABLE).select(COLUMNS).lt("timestamp", cutoff)
+                .order("id").limit(page_size).execute().data or [])
+        if not page:
+            break
+        total += archive_rows(client, archive, page)
+        if len(page) < page_size:
+            break
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"🗄 Archived {total:,} messages older than {days}d in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    return {"rows": total, "seconds": round(elapsed, 3)}
+
+
+if __name__ == "__main__":
+    from .transfer import _client
+
+    parser = argparse.ArgumentParser(description="Move old chat history from user_memory into archive segments")
+    parser.add_argument("--older-than-days", type=int, default=int(os.getenv("CHAT_ARCHIVE_DAYS", "30")))
+    parser.add_argument("--dir", default=ARCHIVE_DIR)
+    args = parser.parse_args()
+    archive_older_than(_client(), ChatArchive(args.dir), args.older_than_days)
@@ -0,0 +1,89 @@
+"""
+Per-Worker Chat History Cache
+
+load_chat_history used to query Supabase on every message even though the
+same worker had just written those messages through save_chat_message. This
+keeps a bounded ring of recent messages per (user, project, chat_id): it is
+filled on the first read, appended on every write, and idle chats are evicted
+in LRU order. Supabase is only read on a cache miss.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Iterable, List, Optional, Tuple
+
+from .messages import Message
+
+CHAT_CACHE_CHATS = int(os.getenv("CHAT_CACHE_CHATS", "1024"))
+CHAT_CACHE_MESSAGES = int(os.getenv("CHAT_CACHE_MESSAGES", "30"))
+# other workers may write the same chat; bound how stale a ring can get
+CHAT_CACHE_TTL = float(os.getenv("CHAT_CACHE_TTL", "300"))
+
+ChatKey = Tuple[str, str, str]
+
+
+class _ChatRing:
+    __slots__ = ("messages", "complete", "loaded_at")
+
+    def __init__(self, capacity: int, messages: Iterable[Message], complete: bool):
+        self.messages = deque(messages, maxlen=capacity)
+        # True when the ring holds the chat's entire history
+        self.complete = complete
+        self.loaded_at = time.monotonic()
+
+
+class ChatHistoryCache:
+    def __init__(self, max_chats: int = CHAT_CACHE_CHATS, capacity: int = CHAT_CACHE_MESSAGES,
+                 ttl: float = CHAT_CACHE_TTL):
+        self.max_chats = max_chats
+        self.capacity = capacity
+        self.ttl = ttl
+        self._rings: "OrderedDict[ChatKey, _ChatRing]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: ChatKey, limit: int) -> Optional[List[Message]]:
+        """Last ``limit`` messages oldest-first, or None when Supabase must be read."""
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is not None and self.ttl and time.monotonic() - ring.loaded_at > self.ttl:
+                del self._rings[key]
+                ring = None
+            if ring is None or (len(ring.messages) < limit and not ring.complete):
+                self.misses += 1
+                return None
+            self._rings.move_to_end(key)
+            self.hits += 1
+            # the records themselves are shared, only the list is new
+            return list(ring.messages)[-limit:] if limit else []
+
+    def fill(self, key: ChatKey, messages: List[Message], limit: int):
+        """Seed a ring from a Supabase read that asked for ``limit`` messages."""
+        complete = len(messages) < limit and len(messages) <= self.capacity
+        ring = _ChatRing(self.capacity, map(Message.from_wire, messages), complete)
+        with self._lock:
+            self._rings[key] = ring
+            self._rings.move_to_end(key)
+            while len(self._rings) > self.max_chats:
+                self._rings.popitem(last=False)
+
+    def append(self, key: ChatKey, role: str, content: str):
+        """Record a message this worker just wrote; unknown chats wait for their first read."""
+        with self._lock:
+            ring = self._rings.get(key)
+            if ring is None:
+                return
+            if len(ring.messages) == ring.messages.maxlen:
+                ring.complete = False
+            ring.messages.append(Message(role, content))
+            self._rings.move_to_end(key)
+
+    def invalidate(self, key: ChatKey):
+        with self._lock:
+            self._rings.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"chats": len(self._rings), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,64 @@
+"""
+Compact Chat Message Records
+
+History used to travel as plain {"role", "content"} dicts that were copied at
+every step (load_chat_history, the cache, the endpoint message lists). A
+Message is a two-slot record whose role is interned, so a cached chat costs
+one small object per message and the same records are shared, never copied,
+from the cache to the prompt. Dicts are only produced at the edge, when the
+request is serialized for OpenRouter.
+
+Records are shared between requests: treat them as immutable.
+"""
+import sys
+from typing import Iterable, List, Union
+
+ROLES = {r: sys.intern(r) for r in ("system", "user", "assistant", "tool")}
+
+
+class Message:
+    __slots__ = ("role", "content")
+
+    def __init__(self, role: str, content: str):
+        self.role = ROLES.get(role) or sys.intern(role)
+        self.content = content or ""
+
+    @classmethod
+    def from_wire(cls, msg: Union["Message", dict]) -> "Message":
+        if isinstance(msg, Message):
+            return msg
+        return cls(msg["role"], msg["content"])
+
+    def to_wire(self) -> dict:
+        return {"role": self.role, "content": self.content}
+
+    # read-only mapping access so code written against dicts keeps working
+    def __getitem__(self, key: str) -> str:
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Message):
+            return self.role is other.role and self.content == other.content
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # consistent with __eq__: role strings are interned, so equal roles hash alike
+        return hash((self.role, self.content))
+
+    def __repr__(self) -> str:
+        return f"Message({self.role!r}, {self.content[:40]!r})"
+
+
+def to_wire(messages: Iterable[Union[Message, dict]]) -> List[dict]:
+    """Serialize a mixed list of Message records and dicts for the chat API."""
+    return [m.to_wire() if isinstance(m, Message) else m for m in messages]
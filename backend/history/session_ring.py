@@ -0,0 +1,26 @@
+"""
+Bounded Session History
+
+The Flask session is pickled and rewritten on every request, so it only keeps
+identifiers and a small ring of recent turns. The full conversation lives in
+Supabase (user_memory) and is read through load_chat_history.
+"""
+import os
+from typing import List
+
+SESSION_HISTORY_TURNS = int(os.getenv("SESSION_HISTORY_TURNS", "6"))
+SESSION_MESSAGE_CHARS = int(os.getenv("SESSION_MESSAGE_CHARS", "1000"))
+SESSION_KEY = "chat_history"
+
+
+def push_turn(sess, role: str, content: str, limit: int = SESSION_HISTORY_TURNS):
+    """Append one message to the session ring, dropping the oldest beyond ``limit``."""
+    ring = list(sess.get(SESSION_KEY) or [])[-(limit - 1):] if limit > 1 else []
+    ring.append({"role": role, "content": (content or "")[:SESSION_MESSAGE_CHARS]})
+    # reassign so flask_session marks the session modified
+    sess[SESSION_KEY] = ring
+
+
+def recent_turns(sess, n: int = SESSION_HISTORY_TURNS) -> List[dict]:
+    """Return up to the last ``n`` messages kept in the session."""
+    return list(sess.get(SESSION_KEY) or [])[-n:]
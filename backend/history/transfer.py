@@ -0,0 +1,143 @@
+"""
+Bulk Chat History Export / Import
+
+Streams user_memory rows for one user and/or project to gzip-compressed JSON
+lines and back. Reads use keyset pagination on ``id`` (no OFFSET scans) and
+writes are batched inserts, so memory stays constant however many rows move.
+
+Run from backend/:
+    python -m history.transfer export --user alice@we3vision.com --out alice.jsonl.gz
+    python -m history.transfer export --project <uuid> --out project.jsonl.gz
+    python -m history.transfer import --in alice.jsonl.gz
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+from typing import Iterator, List, Optional
+
+TABLE = "user_memory"
+COLUMNS = "id, user_id, project_id, chat_id, role, content, timestamp"
+PAGE_SIZE = 1000
+INSERT_BATCH = 500
+REPORT_EVERY = 10.0  # seconds
+
+
+class _Progress:
+    def __init__(self, label: str):
+        self.label = label
+        self.rows = 0
+        self.start = self.last = time.perf_counter()
+
+    def add(self, n: int):
+        self.rows += n
+        now = time.perf_counter()
+        if now - self.last >= REPORT_EVERY:
+            self.last = now
+            self.report()
+
+    def report(self, final: bool = False) -> dict:
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        rate = self.rows / elapsed
+        print(f"{'✅' if final else '⏳'} {self.label}: {self.rows:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)")
+        return {"rows": self.rows, "seconds": round(elapsed, 3), "rows_per_sec": round(rate, 1)}
+
+
+def resolve_user_id(client, email: str) -> Optional[str]:
+    res = client.table("user_perms").select("id").eq("email", email).execute()
+    return res.data[0]["id"] if res.data else None
+
+
+def iter_rows(client, user_id: str = None, project_id: str = None,
+              page_size: int = PAGE_SIZE) -> Iterator[dict]:
+    """Yield matching rows in ``id`` order, one keyset page at a time."""
+    last_id = None
+    while True:
+        q = client.table(TABLE).select(COLUMNS)
+        if user_id:
+            q = q.eq("user_id", user_id)
+        if project_id:
+            q = q.eq("project_id", project_id)
+        if last_id is not None:
+            q = q.gt("id", last_id)
+        page = q.order("id").limit(page_size).execute().data or []
+        yield from page
+        if len(page) < page_size:
+            return
+        last_id = page[-1]["id"]
+
+
+def export_history(client, out_path: str, user_id: str = None, project_id: str = None,
+                   page_size: int = PAGE_SIZE) -> dict:
+    if not user_id and not project_id:
+        raise ValueError("export needs a user and/or a project")
+    progress = _Progress(f"export {out_path}")
+    with gzip.open(out_path, "wt", encoding="utf-8") as f:
+        for row in iter_rows(client, user_id, project_id, page_size):
+            f.write(json.dumps(row, ensure_ascii=False, default=str))
+            f.write("\n")
+            progress.add(1)
+    return progress.report(final=True)
+
+
+def _flush(client, batch: List[dict], progress: _Progress):
+    if batch:
+        client.table(TABLE).insert(batch).execute()
+        progress.add(len(batch))
+        batch.clear()
+
+
+def import_history(client, in_path: str, batch_size: int = INSERT_BATCH, keep_ids: bool = False) -> dict:
+    """Insert exported rows in batches; ids are reassigned unless ``keep_ids``."""
+    progress = _Progress(f"import {in_path}")
+    batch: List[dict] = []
+    with gzip.open(in_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if not keep_ids:
+                row.pop("id", None)
+            batch.append(row)
+            if len(batch) >= batch_size:
+                _flush(client, batch, progress)
+        _flush(client, batch, progress)
+    return progress.report(final=True)
+
+
+def _client():
+    from dotenv import load_dotenv
+    from supabase import create_client
+
+    load_dotenv()
+    url, key = os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in .env")
+    return create_client(url, key)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk export/import of chat history (user_memory)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    exp = sub.add_parser("export")
+    exp.add_argument("--user", help="user email")
+    exp.add_argument("--project", help="project id")
+    exp.add_argument("--out", required=True, help="output .jsonl.gz")
+    exp.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    imp = sub.add_parser("import")
+    imp.add_argument("--in", dest="in_path", required=True, help="input .jsonl.gz")
+    imp.add_argument("--batch-size", type=int, default=INSERT_BATCH)
+    imp.add_argument("--keep-ids", action="store_true")
+    args = parser.parse_args()
+
+    client = _client()
+    if args.command == "export":
+        user_id = None
+        if args.user:
+            user_id = resolve_user_id(client, args.user)
+            if not user_id:
+                parser.error(f"no user found for email: {args.user}")
+        export_history(client, args.out, user_id, args.project, args.page_size)
+    else:
+        import_history(client, args.in_path, args.batch_size, args.keep_ids)
@@ -0,0 +1,37 @@
+"""
+Ordered Background Writer
+
+The small-talk fast path replies before its chat row is stored. An
+OrderedWriter runs submitted writes on one daemon thread, in submission
+order. flush() waits until everything submitted so far has run, so a
+synchronous save that follows (e.g. the next request's reply) still lands
+after the queued rows.
+"""
+import queue
+import threading
+from typing import Callable
+
+
+class OrderedWriter:
+    def __init__(self, name: str = "chat-writer", maxsize: int = 1000):
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs):
+        """Queue ``fn(*args, **kwargs)``; blocks only while the queue is full, so no write is dropped."""
+        self._queue.put((fn, args, kwargs))
+
+    def flush(self):
+        """Wait for every queued write to finish. Never call from inside a queued write."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            fn, args, kwargs = self._queue.get()
+            try:
+                fn(*args, **kwargs)
+            except Exception as e:
+                print("⚠ chat writer error:", e)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,16 @@
+from .fact_log import FactLogStore
+from .facts import extract_memory_facts, extract_user_facts
+from .shared_store import SQLiteMemoryStore, open_memory_store
+from .summaries import ConversationSummaryStore, SummaryQueue, open_summary_store
+
+# Persistent per-user memory stores
+__all__ = [
+    'FactLogStore',
+    'extract_memory_facts',
+    'extract_user_facts',
+    'SQLiteMemoryStore',
+    'open_memory_store',
+    'ConversationSummaryStore',
+    'SummaryQueue',
+    'open_summary_store'
+]
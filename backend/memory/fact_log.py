@@ -0,0 +1,163 @@
+"""
+Append-Only User Fact Log
+
+``remember()`` used to rewrite the whole memory.json (every user's facts) on
+every chat message. This store keeps memory.json as a snapshot and records
+changes in a JSON-lines journal next to it:
+
+    memory.json           snapshot  { "<email>": {"facts": [...], "last_seen": "ISO"} }
+    memory.json.log       journal   {"op": "fact", "user": "<email>", "fact": "...", "ts": "ISO"}
+
+A line is appended only when a fact is actually new, so per-message cost no
+longer grows with the number of users. ``last_seen`` is kept in memory and
+folded into the snapshot at compaction, which runs once the journal reaches
+``compact_every`` records.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows dev machines: single process, thread lock only
+    fcntl = None
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class FactLogStore:
+    """Snapshot + journal store for per-user facts."""
+
+    def __init__(self, path: str = "memory.json", compact_every: int = 500):
+        self.path = path
+        self.journal_path = f"{path}.log"
+        self.lock_path = f"{path}.lock"
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        self._data: Dict[str, dict] = {}
+        self._journal_records = 0
+        self.reload()
+
+    # ---------------- file helpers ----------------
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive inter-process lock around journal appends and compaction."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, "a") as lf:
+                fcntl.flock(lf, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def _read_snapshot(self) -> Dict[str, dict]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception as e:
+            print("⚠ memory snapshot unreadable:", e)
+            return {}
+
+    def _replay(self, data: Dict[str, dict]) -> int:
+        if not os.path.exists(self.journal_path):
+            return 0
+        count = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn trailing line from a crashed writer
+                count += 1
+                self._apply(data, rec)
+        return count
+
+    @staticmethod
+    def _apply(data: Dict[str, dict], rec: dict):
+        entry = data.setdefault(rec.get("user"), {"facts": [], "last_seen": None})
+        if rec.get("op") == "fact" and rec.get("fact") not in entry["facts"]:
+            entry["facts"].append(rec["fact"])
+        if rec.get("ts") and (entry.get("last_seen") or "") < rec["ts"]:
+            entry["last_seen"] = rec["ts"]
+
+    # ---------------- public API ----------------
+    def reload(self):
+        """Rebuild the in-memory view from snapshot + journal."""
+        with self._lock:
+            data = self._read_snapshot()
+            self._journal_records = self._replay(data)
+            self._data = data
+
+    def get(self, user_email: str, default=None) -> Optional[dict]:
+        return self._data.get(user_email, default)
+
+    def facts(self, user_email: str) -> List[str]:
+        return list(self._data.get(user_email, {}).get("facts", []))
+
+    def __contains__(self, user_email: str) -> bool:
+        return user_email in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def touch(self, user_email: str):
+        """Record activity in memory only; persisted at the next compaction."""
+        with self._lock:
+            entry = self._data.setdefault(user_email, {"facts": [], "last_seen": None})
+            entry["last_seen"] = _now()
+
+    def add_facts(self, user_email: str, facts: Iterable[str]) -> int:
+        """Append the facts that are new for this user; returns how many were written."""
+        if not user_email:
+            return 0
+        with self._lock:
+            entry = self._data.setdefault(user_email, {"facts": [], "last_seen": None})
+            new = [f for f in dict.fromkeys(facts) if f and f not in entry["facts"]]
+            if not new:
+                return 0
+            ts = _now()
+            lines = "".join(json.dumps({"op": "fact", "user": user_email, "fact": f, "ts": ts},
+                                       ensure_ascii=False) + "\n" for f in new)
+            with self._file_lock():
+                with open(self.journal_path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+            entry["facts"].extend(new)
+            entry["last_seen"] = ts
+            self._journal_records += len(new)
+            if self._journal_records >= self.compact_every:
+                self.compact()
+            return len(new)
+
+    def compact(self):
+        """
+        Fold the journal into a fresh snapshot. Re-reads both files under the
+        file lock so facts appended by other workers are never dropped.
+        """
+        with self._file_lock():
+            data = self._read_snapshot()
+            self._replay(data)
+            for email, entry in self._data.items():
+                merged = data.setdefault(email, {"facts": [], "last_seen": None})
+                for fact in entry.get("facts", []):
+                    if fact not in merged["facts"]:
+                        merged["facts"].append(fact)
+                if (entry.get("last_seen") or "") > (merged.get("last_seen") or ""):
+                    merged["last_seen"] = entry["last_seen"]
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp, self.path)
+            open(self.journal_path, "w").close()
+            self._data = data
+            self._journal_records = 0
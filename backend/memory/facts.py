@@ -0,0 +1,155 @@
+"""
+Compiled Fact Extraction
+
+``extract_and_store_user_facts`` and ``remember`` used to run ~26 separate
+``re.search`` calls with inline patterns over every message. Here every
+pattern is compiled once, and a single alternation of all trigger phrases
+("my name is", "i'm", "i work at", ...) is scanned first; only the field
+extractors whose trigger occurs in the message are then run. Results match
+the original patterns exactly (see tests/test_fact_extraction.py).
+"""
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+from patterns import trie_pattern
+
+_WS_RE = re.compile(r"\s+")
+
+
+def _clean(val: str, limit: int = 120) -> str:
+    return _WS_RE.sub(" ", (val or "").strip())[:limit]
+
+
+def _clean_strip(val: str, limit: int = 120) -> str:
+    return _clean(val.rstrip(".,"), limit)
+
+
+def _clean_phone(val: str, limit: int = 120) -> str:
+    return _WS_RE.sub("", val).strip()
+
+
+# (field, triggers, pattern, flags, cleaner, limit) in the original evaluation order.
+# Triggers are lowercase literal prefixes of the pattern's lead-in; a field is only
+# searched when one of its triggers occurs in the message.
+_FIELD_SPECS = [
+    ("name", ("my name is", "i am", "i'm", "this is", "call me"),
+     r"\b(?:my name is|i am|i'm|this is|call me)\s+([A-Za-z][A-Za-z\s\-]{1,40})", re.I, _clean_strip, 120),
+    ("role", ("i work as", "my role is", "i am a", "i'm a"),
+     r"\b(?:i work as|my role is|i am a|i'm a)\s+([A-Za-z][A-Za-z\s\-/]{1,60})", re.I, _clean_strip, 120),
+    ("age", ("i am", "i'm"),
+     r"\b(?:i am|i'm)\s+(\d{1,2})\s*(?:years old|yrs old|yo|years)?\b", re.I, _clean, 120),
+    ("experience_years", ("i have", "i've"),
+     r"\b(?:i have|i've)\s+(\d{1,2})\s+(?:years|yrs)\s+of\s+(?:experience|exp)\b", re.I, _clean, 120),
+    ("location", ("i live in", "i am from", "i'm from", "based in"),
+     r"\b(?:i live in|i am from|i'm from|based in)\s+([A-Za-z][A-Za-z\s\-]{1,60})", re.I, _clean_strip, 120),
+    ("company", ("i work at", "i work for", "my company is"),
+     r"\b(?:i work at|i work for|my company is)\s+([A-Za-z0-9][A-Za-z0-9\s&\-]{1,60})", re.I, _clean_strip, 120),
+    ("phone", ("my phone", "my number", "phone number"),
+     r"\b(?:my phone|my number|phone number)\s*[:is]*\s*(\+?\d[\d\-\s]{7,15}\d)\b", re.I, _clean_phone, 120),
+    ("email", ("@",),
+     r"\b([A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})\b", 0, _clean, 120),
+    ("likes", ("i like",),
+     r"\bi like\s+([A-Za-z0-9 ,.&\-]{1,60})", re.I, _clean_strip, 120),
+    ("current_task", ("i am working on", "i'm working on", "currently working on", "my work is", "i'm doing", "i work on"),
+     r"\b(?:i am working on|i'm working on|currently working on|my work is|i'm doing|i work on)\s+(.{5,120})", re.I, _clean, 120),
+    ("responsibilities", ("i am responsible for", "my responsibilities", "i handle"),
+     r"\b(?:i am responsible for|my responsibilities (?:are|include)|i handle)\s+(.{5,120})", re.I, _clean, 120),
+    ("skills", ("my skills", "skills"),
+     r"\b(?:my skills (?:are|include)|skills:?)\s+([A-Za-z0-9 ,.&\-]{3,160})", re.I, _clean, 160),
+    ("tools", ("i use", "tools:", "tech stack:", "stack:", "we use", "i work with"),
+     r"\b(?:i use|tools:|tech stack:|stack:|we use|i work with)\s+([A-Za-z0-9 ,.&\-/]{3,160})", re.I, _clean, 160),
+    ("department", ("i work in",),
+     r"\b(?:i work in)\s+([A-Za-z][A-Za-z\s\-/]{2,60})", re.I, _clean, 120),
+    ("department", ("my department is", "department:", "i'm in the"),
+     r"\b(?:my department is|department:|i'm in the)\s+([A-Za-z][A-Za-z\s\-/]{2,60})", re.I, _clean, 120),
+    ("manager", ("my manager is", "i report to"),
+     r"\b(?:my manager is|i report to)\s+([A-Za-z][A-Za-z\s\-]{2,60})", re.I, _clean, 120),
+    ("team", ("my team is", "team:", "i'm on the"),
+     r"\b(?:my team is|team:|i'm on the)\s+([A-Za-z][A-Za-z\s\-]{2,60})", re.I, _clean, 120),
+    ("availability_hours", ("i am available", "availability is", "available from"),
+     r"\b(?:i am available|availability is|available from)\s+([0-9:APMapm\-\s]{5,40})", 0, _clean, 120),
+    ("timezone", ("timezone", "time zone"),
+     r"\b(?:timezone|time zone)\s*[:is]*\s*([A-Za-z/_+\-0-9]{3,32})", re.I, _clean, 120),
+    ("languages", ("i speak", "language"),
+     r"\b(?:i speak|languages?:)\s+([A-Za-z ,\-]{3,80})", re.I, _clean, 120),
+    ("goals", ("my goal is", "my goals are", "i want to"),
+     r"\b(?:my goal is|my goals are|i want to)\s+(.{5,120})", re.I, _clean, 120),
+]
+
+# remember() patterns: the whole match is stored as a free-text fact.
+_MEMORY_SPECS = [
+    (("my name is",), r"\bmy name is\s+([A-Za-z][A-Za-z\s\-]{1,40})"),
+    (("i am",), r"\bi am\s+([A-Za-z][A-Za-z\s\-]{1,40})"),
+    (("i'm",), r"\bi'm\s+([A-Za-z][A-Za-z\s\-]{1,40})"),
+    (("i like",), r"\bi like\s+([A-Za-z0-9 ,.&\-]{1,60})"),
+    (("my role is",), r"\bmy role is\s+([A-Za-z][A-Za-z\s\-]{1,40})"),
+    (("call me",), r"\bcall me\s+([A-Za-z][A-Za-z\s\-]{1,40})"),
+]
+
+_FIELD_EXTRACTORS = [(field, re.compile(pat, flags), cleaner, limit)
+                     for field, _, pat, flags, cleaner, limit in _FIELD_SPECS]
+_MEMORY_EXTRACTORS = [re.compile(pat, re.I) for _, pat in _MEMORY_SPECS]
+
+# trigger phrase -> extractor slots; field slots are ints, memory slots are ("m", i)
+_TRIGGERS = {}
+for _i, (_, _triggers, *_rest) in enumerate(_FIELD_SPECS):
+    for _t in _triggers:
+        _TRIGGERS.setdefault(_t, set()).add(_i)
+for _i, (_triggers, _) in enumerate(_MEMORY_SPECS):
+    for _t in _triggers:
+        _TRIGGERS.setdefault(_t, set()).add(("m", _i))
+
+# The scan reports the longest phrase starting at each position, so a hit on
+# "i am working on" must also enable the extractors of its prefix "i am" (and
+# of any other trigger it contains, e.g. "tech stack:" contains "stack:").
+_SLOTS = {t: set().union(*(s for o, s in _TRIGGERS.items() if o in t)) for t in _TRIGGERS}
+
+# Zero-width lookahead, so matches may overlap: "i'm a" must not consume the
+# start of "available from" in "i'm available from 10:00".
+_TRIGGER_RE = re.compile(
+    r"(?=(\b" + trie_pattern(t for t in _TRIGGERS if t[0].isalpha()) + "|@))"
+)
+
+
+@lru_cache(maxsize=512)
+def scan(text: str) -> Tuple[Tuple[Tuple[str, str], ...], Tuple[str, ...]]:
+    """
+    One pass over ``text``: returns (field facts, memory facts).
+
+    Field facts are (key, value) pairs as stored in Supabase ``user_facts``;
+    memory facts are the raw phrases ``remember()`` keeps per user. Cached so
+    that the two callers on the same message share one scan.
+    """
+    if not text:
+        return (), ()
+    slots = set()
+    for m in _TRIGGER_RE.finditer(text.lower()):
+        slots |= _SLOTS.get(m.group(1), ())
+    if not slots:
+        return (), ()
+
+    fields: List[Tuple[str, str]] = []
+    for i, (field, regex, cleaner, limit) in enumerate(_FIELD_EXTRACTORS):
+        if i in slots:
+            m = regex.search(text)
+            if m:
+                fields.append((field, cleaner(m.group(1), limit)))
+
+    memory: List[str] = []
+    for i, regex in enumerate(_MEMORY_EXTRACTORS):
+        if ("m", i) in slots:
+            m = regex.search(text)
+            if m:
+                memory.append(m.group(0).strip())
+    return tuple(fields), tuple(memory)
+
+
+def extract_user_facts(text: str) -> List[Tuple[str, str]]:
+    """(key, value) facts for Supabase user_facts, in the original pattern order."""
+    return list(scan(text or "")[0])
+
+
+def extract_memory_facts(text: str) -> List[str]:
+    """Free-text facts for the local user_memory store."""
+    return list(scan(text or "")[1])
@@ -0,0 +1,192 @@
+"""
+Cross-Worker User Memory Store
+
+Every gunicorn worker used to load memory.json once and then overwrite it with
+its own copy, so facts written by one worker vanished from the others. This
+store keeps facts in a local SQLite file shared by all workers:
+
+    memory_users(email PK, last_seen, version)
+    memory_facts(email, fact, created_at, PK(email, fact))
+
+Adding facts is an atomic per-user upsert that bumps the user's ``version``.
+Each worker thread keeps a read cache; ``PRAGMA data_version`` (which changes
+whenever another connection commits) tells it when to re-check versions, so a
+cache hit costs no table reads.
+"""
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Iterable, List, Optional
+
+from data_paths import data_path
+
+from .fact_log import FactLogStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memory_users (
+    email      TEXT PRIMARY KEY,
+    last_seen  TEXT,
+    version    INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS memory_facts (
+    email      TEXT NOT NULL,
+    fact       TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (email, fact)
+);
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class SQLiteMemoryStore:
+    """SQLite-backed per-user fact store with a version-checked read cache."""
+
+    def __init__(self, path: str = "memory.db", import_from: Optional[str] = None,
+                 touch_interval: float = 60.0):
+        self.path = path
+        self.touch_interval = touch_interval
+        self._local = threading.local()
+        self._touched = {}
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        if import_from:
+            self._import_json(import_from)
+
+    # ---------------- connection / cache ----------------
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.cache = {}
+        return conn
+
+    def _cache(self) -> dict:
+        self._conn()
+        return self._local.cache
+
+    def _data_version(self) -> int:
+        return self._conn().execute("PRAGMA data_version").fetchone()[0]
+
+    def _import_json(self, json_path: str):
+        """One-time migration of memory.json (+ journal) when the DB is empty."""
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM memory_users LIMIT 1").fetchone():
+            return
+        if not os.path.exists(json_path):
+            return
+        legacy = FactLogStore(json_path)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for email, entry in legacy._data.items():
+                if not email:
+                    continue
+                conn.execute("INSERT OR IGNORE INTO memory_users(email, last_seen, version) VALUES (?, ?, 1)",
+                             (email, entry.get("last_seen")))
+                conn.executemany("INSERT OR IGNORE INTO memory_facts(email, fact, created_at) VALUES (?, ?, ?)",
+                                 [(email, f, entry.get("last_seen") or _now()) for f in entry.get("facts", [])])
+            conn.execute("COMMIT")
+            print(f"📦 Imported {len(legacy)} users from {json_path} into {self.path}")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _load(self, email: str):
+        conn = self._conn()
+        row = conn.execute("SELECT last_seen, version FROM memory_users WHERE email = ?", (email,)).fetchone()
+        if row is None:
+            return None
+        facts = [r[0] for r in conn.execute(
+            "SELECT fact FROM memory_facts WHERE email = ? ORDER BY created_at, rowid", (email,))]
+        return {"facts": facts, "last_seen": row[0]}, row[1]
+
+    # ---------------- public API ----------------
+    def get(self, user_email: str, default=None) -> Optional[dict]:
+        if not user_email:
+            return default
+        cache = self._cache()
+        dv = self._data_version()
+        hit = cache.get(user_email)
+        if hit and hit[2] == dv:
+            return hit[0]
+        if hit:
+            row = self._conn().execute("SELECT version FROM memory_users WHERE email = ?", (user_email,)).fetchone()
+            if row and row[0] == hit[1]:
+                cache[user_email] = (hit[0], hit[1], dv)
+                return hit[0]
+        loaded = self._load(user_email)
+        if loaded is None:
+            cache.pop(user_email, None)
+            return default
+        entry, version = loaded
+        cache[user_email] = (entry, version, dv)
+        return entry
+
+    def facts(self, user_email: str) -> List[str]:
+        return list((self.get(user_email) or {}).get("facts", []))
+
+    def __contains__(self, user_email: str) -> bool:
+        return self.get(user_email) is not None
+
+    def add_facts(self, user_email: str, facts: Iterable[str]) -> int:
+        """Atomically insert the new facts for one user; returns how many were added."""
+        if not user_email:
+            return 0
+        facts = [f for f in dict.fromkeys(facts) if f]
+        if not facts:
+            return 0
+        conn = self._conn()
+        ts = _now()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = 0
+            for fact in facts:
+                added += conn.execute(
+                    "INSERT OR IGNORE INTO memory_facts(email, fact, created_at) VALUES (?, ?, ?)",
+                    (user_email, fact, ts)).rowcount
+            if added:
+                conn.execute(
+                    "INSERT INTO memory_users(email, last_seen, version) VALUES (?, ?, 1) "
+                    "ON CONFLICT(email) DO UPDATE SET version = version + 1, last_seen = excluded.last_seen",
+                    (user_email, ts))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        if added:
+            self._cache().pop(user_email, None)
+            self._touched[user_email] = time.monotonic()
+        return added
+
+    def touch(self, user_email: str):
+        """Update last_seen at most once per ``touch_interval`` seconds per user."""
+        if not user_email:
+            return
+        now = time.monotonic()
+        if now - self._touched.get(user_email, -self.touch_interval) < self.touch_interval:
+            return
+        self._touched[user_email] = now
+        self._conn().execute(
+            "INSERT INTO memory_users(email, last_seen) VALUES (?, ?) "
+            "ON CONFLICT(email) DO UPDATE SET last_seen = excluded.last_seen",
+            (user_email, _now()))
+
+
+def open_memory_store(json_path: str = "memory.json", backend: Optional[str] = None):
+    """
+    Return the user memory store selected by MEMORY_BACKEND:
+      - "sqlite" (default): shared SQLite file, safe across gunicorn workers
+      - "journal": memory.json snapshot + append-only log (single process)
+    """
+    backend = (backend or os.getenv("MEMORY_BACKEND", "sqlite")).lower()
+    if backend == "journal":
+        return FactLogStore(json_path)
+    db_path = data_path(os.path.splitext(os.path.basename(json_path))[0] + ".db", "MEMORY_DB")
+    return SQLiteMemoryStore(db_path, import_from=json_path)
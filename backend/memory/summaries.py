@@ -0,0 +1,181 @@
+"""
+Rolling Conversation Summaries
+
+Every chat used to send the last 15 raw messages to the LLM. Instead, each
+(user, project, chat_id) keeps a rolling summary in the same SQLite file as
+user_memory. New turns are queued as ``pending``; every ``every_n_turns``
+turns they are folded into the summary by the supplied ``summarize`` callable
+(previous summary + pending messages -> new summary). The synthesis prompt
+then carries the summary plus only the last few raw turns. SummaryQueue
+records turns on one background worker, in the order they were submitted.
+"""
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+from data_paths import data_path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_summaries (
+    user_email TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    chat_id    TEXT NOT NULL,
+    summary    TEXT NOT NULL DEFAULT '',
+    pending    TEXT NOT NULL DEFAULT '[]',
+    turns      INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    PRIMARY KEY (user_email, project_id, chat_id)
+);
+"""
+
+Summarizer = Callable[[str, List[dict]], Optional[str]]
+
+
+def _keep_newest(text: str, limit: int) -> str:
+    """The last ``limit`` characters of ``text``, from a word boundary when one is close."""
+    text = text.strip()
+    if len(text) <= limit:
+        return text
+    tail = text[-limit:]
+    cut = min((i for i in (tail.find("\n"), tail.find(" ")) if i >= 0), default=-1)
+    return tail[cut + 1:].lstrip() if 0 <= cut < limit // 5 else tail
+
+
+class ConversationSummaryStore:
+    def __init__(self, path: str = "memory.db", every_n_turns: int = 4, max_chars: int = 1500):
+        self.path = path
+        self.every_n_turns = every_n_turns
+        self.max_chars = max_chars
+        self._local = threading.local()
+        self._folding = set()
+        self._folding_lock = threading.Lock()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(user_email, project_id, chat_id):
+        return (user_email or "", project_id or "default", chat_id or "default")
+
+    def get(self, user_email: str, project_id: str = None, chat_id: str = None) -> str:
+        row = self._conn().execute(
+            "SELECT summary FROM chat_summaries WHERE user_email = ? AND project_id = ? AND chat_id = ?",
+            self._key(user_email, project_id, chat_id)).fetchone()
+        return row[0] if row else ""
+
+    def record_turn(self, user_email: str, project_id: str, chat_id: str,
+                    user_message: str, assistant_message: str, summarize: Summarizer) -> bool:
+        """
+        Queue one user/assistant turn; fold the queue into the summary once it
+        holds ``every_n_turns`` turns. Returns True when a fold happened.
+        """
+        key = self._key(user_email, project_id, chat_id)
+        turn = [{"role": "user", "content": user_message or ""},
+                {"role": "assistant", "content": assistant_message or ""}]
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT summary, pending FROM chat_summaries WHERE user_email = ? AND project_id = ? AND chat_id = ?",
+                key).fetchone()
+            summary, pending = (row[0], json.loads(row[1])) if row else ("", [])
+            pending.extend(turn)
+            conn.execute(
+                "INSERT INTO chat_summaries(user_email, project_id, chat_id, summary, pending, turns, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 1, ?) ON CONFLICT(user_email, project_id, chat_id) "
+                "DO UPDATE SET pending = excluded.pending, turns = turns + 1, updated_at = excluded.updated_at",
+                (*key, summary, json.dumps(pending, ensure_ascii=False), datetime.now(timezone.utc).isoformat()))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        if len(pending) < 2 * self.every_n_turns:
+            return False
+        with self._folding_lock:
+            if key in self._folding:
+                return False
+            self._folding.add(key)
+        try:
+            return self._fold(key, summary, pending, summarize)
+        finally:
+            with self._folding_lock:
+                self._folding.discard(key)
+
+    def _fold(self, key, summary: str, pending: List[dict], summarize: Summarizer) -> bool:
+        # the LLM call happens outside any transaction
+        new_summary = summarize(summary, pending)
+        if not new_summary:
+            return False
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT pending FROM chat_summaries WHERE user_email = ? AND project_id = ? AND chat_id = ?",
+                key).fetchone()
+            # keep turns queued by other requests while we were summarizing
+            remaining = json.loads(row[0])[len(pending):] if row else []
+            conn.execute(
+                "UPDATE chat_summaries SET summary = ?, pending = ?, updated_at = ? "
+                "WHERE user_email = ? AND project_id = ? AND chat_id = ?",
+                # summaries grow at the end, so an over-long one loses its oldest part
+                (_keep_newest(new_summary, self.max_chars), json.dumps(remaining, ensure_ascii=False),
+                 datetime.now(timezone.utc).isoformat(), *key))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+
+class SummaryQueue:
+    """
+    Records turns (and runs the folds they trigger) on a single daemon worker,
+    in submission order, instead of one thread per message. submit() never
+    blocks; turns are dropped and counted when the queue is full.
+    """
+    def __init__(self, store: ConversationSummaryStore, summarize: Summarizer, maxsize: int = 1000):
+        self.store = store
+        self.summarize = summarize
+        self.dropped = 0
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="chat-summaries", daemon=True)
+        self._thread.start()
+
+    def submit(self, user_email: str, project_id: str, chat_id: str,
+               user_message: str, assistant_message: str) -> bool:
+        try:
+            self._queue.put_nowait((user_email, project_id, chat_id, user_message, assistant_message))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            turn = self._queue.get()
+            try:
+                self.store.record_turn(*turn, self.summarize)
+            except Exception as e:
+                print("⚠ chat summary error:", e)
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        self._queue.join()
+
+
+def open_summary_store(json_path: str = "memory.json", **kwargs) -> ConversationSummaryStore:
+    """Summary store in the same SQLite file as the shared user memory store."""
+    db_path = data_path(os.path.splitext(os.path.basename(json_path))[0] + ".db", "MEMORY_DB")
+    return ConversationSummaryStore(db_path, **kwargs)
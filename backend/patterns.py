@@ -0,0 +1,33 @@
+"""
+Shared Regex Helpers
+
+Pattern builders used by more than one package (fact extraction in memory/,
+the keyword intent router in prompting/).
+"""
+import re
+
+
+def trie_pattern(words) -> str:
+    """
+    Factor common prefixes into one regex ("i am", "i am a", "i'm" ->
+    "i(?:'m| am(?: a)?)") so the scan does not retry every alternative at
+    every position. Longer continuations are tried first.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + ")?" if len(branches) > 1 or len(body) > 1 else body + "?"
+        return body
+
+    return build(trie)
@@ -0,0 +1,18 @@
+from .budget import assemble_context, estimate_tokens, DEFAULT_BUDGET
+from .intent import IntentMatch, SPECIFIC_FIELDS, route_intent
+from .smalltalk import GREETING_RE, answer_small_talk, classify_small_talk, short_circuits, small_talk_reply
+
+# Prompt construction helpers for the chat routes
+__all__ = [
+    'assemble_context',
+    'estimate_tokens',
+    'DEFAULT_BUDGET',
+    'IntentMatch',
+    'SPECIFIC_FIELDS',
+    'route_intent',
+    'GREETING_RE',
+    'answer_small_talk',
+    'classify_small_talk',
+    'short_circuits',
+    'small_talk_reply'
+]
@@ -0,0 +1,161 @@
+"""
+Token-Budget Context Assembly
+
+The synthesis prompt used to concatenate the whole DB answer, every RAG chunk
+and up to 15 history messages with no size limit. This module estimates
+tokens locally, ranks the candidate snippets by relevance to the query and
+packs them greedily into a fixed budget, reporting how many tokens were saved.
+"""
+import math
+import os
+import re
+from typing import Dict, List, Optional
+
+from retrieval.bm25 import tokenize
+
+DEFAULT_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1500"))
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+
+# Base weight per snippet kind: DB rows are authoritative, docs next, history last.
+KIND_WEIGHTS = {"db": 1.0, "doc": 0.8, "history": 0.6}
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap local token estimate: the larger of chars/4 and the count of word
+    and punctuation pieces. Close enough to BPE counts for budgeting.
+    """
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / 4), len(_PIECE_RE.findall(text)))
+
+
+def _relevance(query_terms: set, text: str) -> float:
+    if not query_terms:
+        return 0.0
+    terms = set(tokenize(text))
+    if not terms:
+        return 0.0
+    return len(query_terms & terms) / len(query_terms)
+
+
+ROW_SEPARATOR = "\n---\n"
+
+
+def _db_rows(db_answer: Optional[str]) -> List[List[str]]:
+    """
+    query_supabase renders one "Key: value" field per line and separates rows
+    with "---" lines. Rows are ranked and packed as units so every field stays
+    attributable to its project; the first line (the row's name) leads.
+    """
+    if not db_answer:
+        return []
+    rows, current = [], []
+    for line in str(db_answer).split("\n"):
+        stripped = line.strip()
+        if stripped == "---":
+            if current:
+                rows.append(current)
+            current = []
+        elif stripped:
+            current.append(line.rstrip())
+    if current:
+        rows.append(current)
+    return rows
+
+
+def _truncate_row(lines: List[str], query_terms: set, room: int) -> Optional[str]:
+    """
+    The row's first line plus its most query-relevant other lines that fit in
+    ``room`` tokens, in their original order; None if not even the first fits.
+    """
+    head_cost = estimate_tokens(lines[0])
+    if head_cost > room:
+        return None
+    room -= head_cost
+    keep = set()
+    ranked = sorted(range(1, len(lines)), key=lambda i: _relevance(query_terms, lines[i]), reverse=True)
+    for i in ranked:
+        cost = estimate_tokens(lines[i]) + 1
+        if cost <= room:
+            keep.add(i)
+            room -= cost
+    return "\n".join([lines[0]] + [lines[i] for i in range(1, len(lines)) if i in keep])
+
+
+def assemble_context(query: str, instructions: str = "", history: Optional[List[dict]] = None,
+                     db_answer: Optional[str] = None, doc_chunks: Optional[List[str]] = None,
+                     budget: int = DEFAULT_BUDGET, pinned_history: int = 2) -> Dict:
+    """
+    Pick the history messages, DB fields and doc chunks that fit in ``budget``.
+
+    Instructions are always kept and charged first; the last ``pinned_history``
+    messages are kept when they fit so the conversation stays coherent.
+    Everything else is ranked by query-term overlap (weighted by kind, with a
+    recency bonus for history) and added greedily. Selected snippets keep
+    their original order.
+
+    Returns:
+        dict: {
+            'history': [messages],
+            'db_facts': str,
+            'doc_context': str,
+            'stats': {'budget', 'used', 'candidates', 'saved', 'dropped'}
+        }
+    """
+    history = history or []
+    doc_chunks = [c for c in (doc_chunks or []) if c and c.strip()]
+    query_terms = set(tokenize(query))
+
+    candidates = []  # (kind, position, text, tokens, score)
+    n_hist = len(history)
+    for i, msg in enumerate(history):
+        text = msg.get("content") or ""
+        recency = (i + 1) / n_hist
+        score = KIND_WEIGHTS["history"] * (_relevance(query_terms, text) + recency)
+        candidates.append(("history", i, text, estimate_tokens(text) + 4, score))
+    db_rows = _db_rows(db_answer)
+    for i, lines in enumerate(db_rows):
+        text = "\n".join(lines)
+        score = KIND_WEIGHTS["db"] * (_relevance(query_terms, text) + 0.5)
+        candidates.append(("db", i, text, estimate_tokens(text) + 2, score))
+    for i, text in enumerate(doc_chunks):
+        # retrieval order already reflects relevance; keep it as a tie-breaker
+        score = KIND_WEIGHTS["doc"] * (_relevance(query_terms, text) + 1.0 / (i + 2))
+        candidates.append(("doc", i, text, estimate_tokens(text), score))
+
+    used = estimate_tokens(instructions) + estimate_tokens(query)
+    selected = set()
+    db_text: Dict[int, str] = {}
+
+    pinned = [c for c in candidates if c[0] == "history" and c[1] >= n_hist - pinned_history]
+    rest = sorted((c for c in candidates if c not in pinned), key=lambda c: c[4], reverse=True)
+    for cand in sorted(pinned, key=lambda c: c[1], reverse=True) + rest:
+        if used + cand[3] <= budget:
+            selected.add((cand[0], cand[1]))
+            used += cand[3]
+            if cand[0] == "db":
+                db_text[cand[1]] = cand[2]
+        elif cand[0] == "db":
+            # a row that does not fit whole keeps its name line and best fields
+            text = _truncate_row(db_rows[cand[1]], query_terms, budget - used - 2)
+            if text is not None:
+                selected.add(("db", cand[1]))
+                used += estimate_tokens(text) + 2
+                db_text[cand[1]] = text
+
+    total = estimate_tokens(instructions) + estimate_tokens(query) + sum(c[3] for c in candidates)
+    stats = {
+        "budget": budget,
+        "used": used,
+        "candidates": total,
+        "saved": max(0, total - used),
+        "dropped": len(candidates) - len(selected),
+    }
+    return {
+        "history": [m for i, m in enumerate(history) if ("history", i) in selected],
+        "db_facts": ROW_SEPARATOR.join(db_text[i] for i in sorted(db_text)),
+        "doc_context": "\n".join(t for i, t in enumerate(doc_chunks) if ("doc", i) in selected),
+        "stats": stats,
+    }
@@ -0,0 +1,100 @@
+"""
+Keyword Intent Router
+
+detect_intent used to walk several keyword lists in order with ``word in q``
+substring checks, so the first list that hit anywhere won: "project" inside
+any sentence routed to project_details, "sum" matched "summary" and "api"
+matched "capital". All keyword groups are now compiled into one trie-factored
+regex with word boundaries (plural "s"/"es" allowed). A single findall pass
+scores every group; more specific groups and longer phrases weigh more. The
+router returns the top intent with a confidence (its share of the total
+score) and the read-only per-group scores; no match means the caller should
+fall back to the LLM classifier.
+"""
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from patterns import trie_pattern
+
+SPECIFIC_FIELDS = {
+    "timeline": ["timeline", "deadline", "end date", "start date", "duration", "finish", "schedule"],
+    "status": ["status", "progress", "phase", "current state"],
+    "client": ["client", "customer"],
+    "leader": ["leader", "manager", "owner", "head"],
+    "members": ["members", "team", "assigned", "who is working", "employees"],
+    "tech_stack": ["tech stack", "technology", "framework", "tools", "languages"],
+}
+
+# (group, base weight, keywords)
+KEYWORD_GROUPS: List[Tuple[str, float, List[str]]] = [
+    ("all_projects", 2.0, ["all project", "list projects", "every project", "badha project", "badha"]),
+    ("project_details", 1.0, ["project details", "project info", "give me project", "all details",
+                              "details of project"]),
+    # a bare "project" is a weak hint: "project status" is about status
+    ("project_details", 0.5, ["project"]),
+    ("coding", 1.5, ["code", "function", "script", "program", "sql", "api", "class", "loop", "```"]),
+    ("debug_terms", 0.0, ["error", "traceback", "exception", "bug", "fix", "issue"]),
+    ("math", 1.5, ["solve", "integral", "derivative", "equation", "calculate", "sum", "matrix", "theorem"]),
+    *((field, 2.0, words) for field, words in SPECIFIC_FIELDS.items()),
+    ("general", 0.5, ["overview", "summary", "introduction", "info", "information", "details", "describe", "about"]),
+]
+
+# tie-break: more specific intents first
+PRIORITY = ["all_projects", "debugging", "coding", "math", "timeline", "status", "client", "leader",
+            "members", "tech_stack", "project_details", "general"]
+PHRASE_BONUS = 0.5  # per extra word in a multi-word keyword
+
+
+class IntentMatch(NamedTuple):
+    intent: Optional[str]
+    confidence: float
+    # read-only: route_intent results are cached and shared between callers
+    scores: Mapping[str, float]
+
+
+def _build() -> Tuple[re.Pattern, Tuple[str, ...], Dict[str, Tuple[Tuple[str, float], ...]]]:
+    table: Dict[str, List[Tuple[str, float]]] = {}
+    for group, weight, words in KEYWORD_GROUPS:
+        for w in words:
+            table.setdefault(w, []).append((group, weight + PHRASE_BONUS * w.count(" ")))
+    words = [w for w in table if w[0].isalnum() and w[-1].isalnum()]
+    # word keywords need word boundaries; symbol keywords such as ``` are counted anywhere
+    pattern = re.compile(r"(?<![a-z0-9_])(" + trie_pattern(words) + r")(?:e?s)?(?![a-z0-9_])")
+    symbols = tuple(w for w in table if w not in words)
+    return pattern, symbols, {w: tuple(hits) for w, hits in table.items()}
+
+
+_KEYWORD_RE, _SYMBOLS, _KEYWORDS = _build()
+_RANK = {intent: i for i, intent in enumerate(PRIORITY)}
+_NO_MATCH = IntentMatch(None, 0.0, MappingProxyType({}))
+
+
+def _scores(q: str) -> Dict[str, float]:
+    scores: Dict[str, float] = {}
+    hits = _KEYWORD_RE.findall(q)
+    for sym in _SYMBOLS:
+        if sym in q:
+            hits += [sym] * q.count(sym)
+    for hit in hits:
+        for group, weight in _KEYWORDS[hit]:
+            scores[group] = scores.get(group, 0.0) + weight
+    if "debug_terms" in scores:
+        del scores["debug_terms"]
+        if "coding" in scores:
+            scores["debugging"] = scores.pop("coding")
+    return scores
+
+
+@lru_cache(maxsize=2048)
+def route_intent(query: str) -> IntentMatch:
+    """Score every keyword group in one pass; intent is None when nothing matched."""
+    scores = _scores((query or "").lower())
+    if not scores:
+        return _NO_MATCH
+    if len(scores) == 1:
+        intent, = scores
+        return IntentMatch(intent, 1.0, MappingProxyType(scores))
+    intent = min(scores, key=lambda g: (-scores[g], _RANK[g]))
+    return IntentMatch(intent, round(scores[intent] / sum(scores.values()), 3), MappingProxyType(scores))
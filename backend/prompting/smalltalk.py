@@ -0,0 +1,110 @@
+"""
+Small-Talk Fast Path
+
+A bare "hi" used to reach handle_greetings only after the chat routes had
+looked up the user's role and facts, run fact extraction and (in dual_chat)
+loaded the chat history: several Supabase round trips for a canned reply.
+classify_small_talk() decides from the text alone, with the compiled
+matchers of handle_greetings (question/intent indicators, at most four
+words) and maybe_greeting (word-bounded greeting words), plus short
+thanks/goodbye messages. The routes call answer_small_talk() before any
+network I/O and reply from templates (work_chat hands the history row to an
+ordered background writer); ShortCircuitCounter counts the requests
+answered this way, per kind.
+"""
+import random
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+MAX_WORDS = 4
+
+# words that indicate a question or request: never short-circuit those.
+# Substring semantics, as in handle_greetings ("all" also matches "small").
+INTENT_INDICATORS = ["?", "can", "could", "would", "please", "project", "details", "all", "give", "show",
+                     "help", "how", "what", "who", "where", "when", "why"]
+INTENT_RE = re.compile("|".join(map(re.escape, INTENT_INDICATORS)))
+GREETING_RE = re.compile(r"\b(hi|hello|hey|good\s*(morning|afternoon|evening)|gm|ga|ge)\b")
+# the whole message must be a thank-you or a goodbye (trailing punctuation/emoji allowed)
+THANKS_RE = re.compile(r"(?:ok(?:ay)?\s+)?(?:thanks?(?:\s+(?:a lot|so much))?|thank\s+you(?:\s+so\s+much)?|thx|ty)"
+                       r"[\s!.]*\W*")
+BYE_RE = re.compile(r"(?:ok(?:ay)?\s+)?(?:bye|goodbye|good\s+bye|see\s+you|see\s+ya|cya)[\s!.]*\W*")
+
+
+@lru_cache(maxsize=1024)
+def classify_small_talk(text: str) -> Optional[str]:
+    """'greeting', 'thanks', 'bye', or None when the message needs the full pipeline."""
+    t = " ".join((text or "").lower().split())
+    if not t or t.count(" ") >= MAX_WORDS or INTENT_RE.search(t):
+        return None
+    if THANKS_RE.fullmatch(t):
+        return "thanks"
+    if BYE_RE.fullmatch(t):
+        return "bye"
+    if GREETING_RE.search(t):
+        return "greeting"
+    return None
+
+
+def _time_of_day(hour: int) -> str:
+    if hour < 12:
+        return "morning"
+    if hour < 18:
+        return "afternoon"
+    return "evening"
+
+
+def small_talk_reply(kind: str, user_name: str = None) -> str:
+    if kind == "thanks":
+        return random.choice(["You're welcome! Anything else I can help with?",
+                              "Happy to help! Let me know if you need anything else."])
+    if kind == "bye":
+        return random.choice([f"Goodbye{', ' + user_name if user_name else ''}! Have a great day.",
+                              "See you soon! I'm here whenever you need me."])
+    tod = _time_of_day(datetime.now().hour)
+    if user_name:
+        templates = [
+            f"Good {tod}, {user_name}! How can I help you?",
+            f"Hey {user_name}! What would you like help with today?",
+            f"Hi {user_name}! How's your {tod} going?"
+        ]
+    else:
+        templates = [
+            f"Good {tod}! How can I help you?",
+            "Hey there! What can I do for you?",
+            "Hi! How can I assist?"
+        ]
+    return random.choice(templates)
+
+
+class ShortCircuitCounter:
+    """Per-process count of requests answered by the fast path, by route and kind."""
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def add(self, route: str, kind: str):
+        with self._lock:
+            self._counts[(route, kind)] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._counts)
+        out = {f"{route}.{kind}": n for (route, kind), n in sorted(counts.items())}
+        out["total"] = sum(counts.values())
+        return out
+
+
+short_circuits = ShortCircuitCounter()
+
+
+def answer_small_talk(text: str, user_name: str = None, route: str = "chat") -> Optional[Tuple[str, str]]:
+    """(kind, reply) for trivial small talk, counted under ``route``; None otherwise."""
+    kind = classify_small_talk(text)
+    if kind is None:
+        return None
+    short_circuits.add(route, kind)
+    return kind, small_talk_reply(kind, user_name)
@@ -0,0 +1,12 @@
+from .results import NO_RESULTS, display_headers, render_bullets
+from .stream import ResponseFormatter, format_stream, format_text
+
+# Reply and result rendering for the chat routes
+__all__ = [
+    'ResponseFormatter',
+    'format_stream',
+    'format_text',
+    'NO_RESULTS',
+    'display_headers',
+    'render_bullets'
+]
@@ -0,0 +1,100 @@
+"""
+Query Result Rendering
+
+query_supabase formatted rows one cell at a time: a title-case call per key
+and a fresh json.dumps per nested cell (which builds a new JSONEncoder each
+call because of ensure_ascii=False). render_bullets renders rows column by
+column instead: display headers are computed once per column set, nested
+list/dict cells go through one shared encoder as part of a single pass per
+column, and the output is assembled with joins. The "• Key: value" blocks
+are separated by "---", as before.
+
+format_results_as_table in app.py is not handled here: its time goes into
+str() of each cell, so a rewrite could not beat it without changing output.
+"""
+import json
+from functools import lru_cache
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+NO_RESULTS = "⚠ No matching records found."
+ROW_SEPARATOR = "\n\n---\n\n"
+
+
+# json.dumps(value, ensure_ascii=False) builds this encoder on every call
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+
+
+@lru_cache(maxsize=256)
+def display_headers(columns: Tuple[str, ...]) -> Tuple[str, ...]:
+    """``project_name`` -> ``Project Name`` for every column, once per column set."""
+    return tuple(c.replace("_", " ").title() for c in columns)
+
+
+_TEXT = {str, type(None)}
+_SCALAR = {int, float, bool}
+
+
+def _nested(value) -> str:
+    try:
+        return _encode(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _render_column(values: Sequence[Any]) -> List[Optional[str]]:
+    """Cell strings for one column; None marks an empty cell (None, "", [], {})."""
+    kinds = set(map(type, values))
+    if kinds <= _TEXT:
+        return [v or None for v in values]
+    if kinds <= _SCALAR:
+        return list(map(str, values))
+    out: List[Optional[str]] = [None] * len(values)
+    for i, v in enumerate(values):
+        if v is None:
+            continue
+        if type(v) is str:
+            if v:
+                out[i] = v
+        elif isinstance(v, (list, dict)):
+            if v:
+                out[i] = _nested(v)
+        else:
+            out[i] = str(v)
+    return out
+
+
+def _columns(rows: Sequence[Dict[str, Any]]) -> Tuple[Tuple[str, ...], bool]:
+    """
+    Column order of the first row, plus any keys that only later rows have, and
+    whether every row has exactly the same keys.
+    """
+    first = rows[0].keys()
+    # key-view comparison is a C-level set check; rows from one select all pass
+    if all(map(first.__eq__, map(dict.keys, rows))):
+        return tuple(first), True
+    columns = dict.fromkeys(first)
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    return tuple(columns), False
+
+
+def _render_columns(rows: Sequence[Dict[str, Any]]) -> Tuple[Tuple[str, ...], List[List[Optional[str]]]]:
+    columns, uniform = _columns(rows)
+    if uniform and len(columns) > 1:
+        # transpose in C: one itemgetter call per row, then zip into columns
+        values = zip(*map(itemgetter(*columns), rows))
+    else:
+        values = ([row.get(c) for row in rows] for c in columns)
+    return columns, [_render_column(v) for v in values]
+
+
+def render_bullets(rows: Sequence[Dict[str, Any]]) -> str:
+    if not rows:
+        return NO_RESULTS
+    columns, cells = _render_columns(rows)
+    headers = display_headers(columns)
+    blocks = []
+    for row in zip(*cells):
+        blocks.append("• " + "\n  ".join([f"{h}: {c}" for h, c in zip(headers, row) if c is not None]))
+    return ROW_SEPARATOR.join(blocks)
@@ -0,0 +1,89 @@
+"""
+Line-Streaming Response Formatter
+
+format_response used to build its text with ``+=`` and then split and rejoin
+the whole string twice to strip lines and drop empty paragraphs, so it could
+only run on a finished reply. ResponseFormatter does the same clean-up one
+line at a time: feed() takes arbitrary chunks (e.g. streamed LLM tokens),
+holds back the unfinished last line, and returns the text that is final.
+Because every decision depends only on the current line and a little state
+(has output started, is a blank line pending), the output is identical
+whether the text arrives whole or token by token.
+
+Plain mode strips each line and collapses runs of blank lines into one.
+Structured mode additionally applies the LLM-reply rules of format_response:
+input blank lines are dropped, "Heading:" lines are upper-cased with a blank
+line before them, "- " / "* " / "• " bullets become "• ", and "**" lines are
+skipped.
+"""
+from typing import Iterable, Iterator
+
+_BULLETS = ("- ", "* ", "• ")
+
+
+class ResponseFormatter:
+    __slots__ = ("structured", "_partial", "_started", "_blank")
+
+    def __init__(self, structured: bool = False):
+        self.structured = structured
+        self._partial = ""
+        self._started = False
+        self._blank = False
+
+    def _lines(self, lines) -> str:
+        # one loop with the state in locals: this is the hot path for whole replies
+        structured, started, blank = self.structured, self._started, self._blank
+        out = []
+        append = out.append
+        for line in lines:
+            line = line.strip()
+            if not line:
+                # blank input lines are dropped in structured mode, collapsed otherwise
+                if not structured:
+                    blank = True
+                continue
+            if structured:
+                # same precedence as the original: heading, then bullet, then "**" skip
+                if line[-1] == ":":
+                    blank = True
+                    line = line.upper()
+                elif line.startswith(_BULLETS):
+                    line = "• " + line[2:].strip()
+                elif line.startswith("**"):
+                    continue
+            if started:
+                append("\n\n" if blank else "\n")
+            append(line)
+            started, blank = True, False
+        self._started, self._blank = started, blank
+        return "".join(out)
+
+    def feed(self, chunk: str) -> str:
+        """Consume a chunk; returns the formatted text of the lines it completed."""
+        if not chunk:
+            return ""
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        return self._lines(lines)
+
+    def close(self) -> str:
+        """Flush the last (unterminated) line; trailing blank lines are dropped."""
+        partial, self._partial = self._partial, ""
+        return self._lines((partial,)) if partial else ""
+
+
+def format_stream(chunks: Iterable[str], structured: bool = False) -> Iterator[str]:
+    """Yield formatted text as soon as each line of ``chunks`` is complete."""
+    fmt = ResponseFormatter(structured)
+    for chunk in chunks:
+        out = fmt.feed(chunk)
+        if out:
+            yield out
+    out = fmt.close()
+    if out:
+        yield out
+
+
+def format_text(text: str, structured: bool = False) -> str:
+    fmt = ResponseFormatter(structured)
+    return fmt.feed(text) + fmt.close()
@@ -0,0 +1,22 @@
+from .bm25 import BM25Index, tokenize
+from .hybrid import HybridRetriever, reciprocal_rank_fusion
+from .store import get_chroma_client, get_collection, prewarm
+from .scope import build_where, chunk_metadata, project_document_map
+from .sidecar import RemoteRetriever, SidecarClient, SidecarError
+
+# Document retrieval helpers used by get_context
+__all__ = [
+    'BM25Index',
+    'tokenize',
+    'HybridRetriever',
+    'reciprocal_rank_fusion',
+    'get_chroma_client',
+    'get_collection',
+    'prewarm',
+    'RemoteRetriever',
+    'SidecarClient',
+    'SidecarError',
+    'build_where',
+    'chunk_metadata',
+    'project_document_map'
+]
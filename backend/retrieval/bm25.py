@@ -0,0 +1,125 @@
+"""
+BM25 Keyword Index
+
+In-memory inverted index over the same chunks stored in Chroma. Dense
+similarity misses exact terms (project names, policy numbers, tool names),
+so this index scores them lexically and is fused with the vector results.
+"""
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[._\-/][a-z0-9]+)*")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from",
+    "how", "i", "in", "is", "it", "me", "my", "of", "on", "or", "our", "please",
+    "the", "this", "to", "was", "we", "what", "when", "where", "which", "who",
+    "why", "with", "you", "your",
+})
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; compound tokens like 'hr-12' also emit their parts."""
+    tokens = []
+    for tok in TOKEN_RE.findall((text or "").lower()):
+        if tok not in STOPWORDS:
+            tokens.append(tok)
+        if not tok.isalnum():
+            tokens.extend(p for p in re.split(r"[._\-/]", tok) if p and p not in STOPWORDS)
+    return tokens
+
+
+class BM25Index:
+    """Incrementally built Okapi BM25 index keyed by chunk id."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._doc_len: Dict[str, int] = {}
+        self._docs: Dict[str, str] = {}
+        self._metadata: Dict[str, dict] = {}
+        self._total_len = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_len
+
+    def add(self, doc_id: str, text: str, metadata: Optional[dict] = None):
+        """Add (or replace) a single chunk."""
+        terms = Counter(tokenize(text))
+        with self._lock:
+            if doc_id in self._doc_len:
+                self._remove_locked(doc_id)
+            for term, tf in terms.items():
+                self._postings[term][doc_id] = tf
+            length = sum(terms.values())
+            self._doc_len[doc_id] = length
+            self._docs[doc_id] = text
+            self._metadata[doc_id] = metadata or {}
+            self._total_len += length
+
+    def add_many(self, ids: Iterable[str], documents: Iterable[str],
+                 metadatas: Optional[Iterable[dict]] = None):
+        metadatas = list(metadatas) if metadatas is not None else None
+        for i, (doc_id, text) in enumerate(zip(ids, documents)):
+            self.add(doc_id, text, metadatas[i] if metadatas else None)
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            if doc_id in self._doc_len:
+                self._remove_locked(doc_id)
+
+    def _remove_locked(self, doc_id: str):
+        for term in set(tokenize(self._docs.get(doc_id, ""))):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id, 0)
+        self._docs.pop(doc_id, None)
+        self._metadata.pop(doc_id, None)
+
+    def document(self, doc_id: str) -> Optional[str]:
+        return self._docs.get(doc_id)
+
+    def metadata(self, doc_id: str) -> dict:
+        return self._metadata.get(doc_id, {})
+
+    def set_metadata(self, doc_id: str, metadata: dict):
+        if doc_id in self._doc_len:
+            self._metadata[doc_id] = metadata or {}
+
+    def search(self, query: str, k: int = 3,
+               predicate: Optional[Callable[[dict], bool]] = None) -> List[Tuple[str, float]]:
+        """
+        Return the top-k (doc_id, score) pairs; empty when no term matches.
+        ``predicate`` receives each candidate's metadata and can exclude it.
+        """
+        terms = set(tokenize(query))
+        n_docs = len(self._doc_len)
+        if not terms or not n_docs:
+            return []
+
+        avg_len = self._total_len / n_docs if n_docs else 0.0
+        scores: Dict[str, float] = defaultdict(float)
+        for term in terms:
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in posting.items():
+                if predicate is not None and not predicate(self._metadata.get(doc_id, {})):
+                    continue
+                norm = 1 - self.b + self.b * (self._doc_len[doc_id] / avg_len if avg_len else 1.0)
+                scores[doc_id] += idf * (tf * (self.k1 + 1)) / (tf + self.k1 * norm)
+
+        return sorted(scores.items(), key=lambda kv: kv[1], reverse=True)[:k]
@@ -0,0 +1,163 @@
+"""
+Hybrid Retrieval
+
+Fuses Chroma's dense similarity ranking with the BM25 keyword ranking using
+reciprocal-rank fusion (RRF). Chunks are written to both stores through the
+same ``add`` call so the keyword index is built incrementally with ingestion.
+"""
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from .bm25 import BM25Index
+from .scope import build_where, chunk_metadata, matches
+
+RRF_K = 60
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = RRF_K) -> List[str]:
+    """
+    Merge several ranked id lists into one.
+
+    Each id scores sum(1 / (k + rank)) over the lists it appears in; ties keep
+    the order in which ids were first seen.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda d: scores[d], reverse=True)
+
+
+class HybridRetriever:
+    """
+    Dense (Chroma) + sparse (BM25) retriever over the company_docs chunks.
+
+    ``collection`` may be a Chroma collection or a zero-argument factory that
+    returns one, so the Chroma client is only opened on first use.
+    """
+
+    def __init__(self, collection, index: Optional[BM25Index] = None,
+                 min_vector_words: int = 3, candidates: int = 10):
+        self._collection = collection
+        self.index = index or BM25Index()
+        self.min_vector_words = min_vector_words
+        self.candidates = candidates
+        self._bootstrapped = False
+        self._bootstrap_lock = threading.Lock()
+
+    @property
+    def collection(self):
+        if callable(self._collection) and not hasattr(self._collection, "query"):
+            self._collection = self._collection()
+        return self._collection
+
+    def bootstrap(self):
+        """
+        Build the keyword index from chunks already persisted in Chroma.
+
+        Concurrent first queries wait for one load instead of searching a
+        half-built index; a failed load is retried by the next query.
+        """
+        if self._bootstrapped:
+            return
+        with self._bootstrap_lock:
+            if self._bootstrapped:
+                return
+            try:
+                existing = self.collection.get(include=["documents", "metadatas"])
+            except Exception as e:
+                print("⚠ BM25 bootstrap error:", e)
+                return
+            ids = existing.get("ids") or []
+            metadatas = existing.get("metadatas") or [None] * len(ids)
+            metadatas = self._backfill_scope(ids, metadatas)
+            self.index.add_many(ids, existing.get("documents") or [], metadatas)
+            self._bootstrapped = True
+        print(f"🔎 BM25 index ready: {len(self.index)} chunks")
+
+    def _backfill_scope(self, ids: List[str], metadatas: List[Optional[dict]]) -> List[dict]:
+        """
+        Give chunks ingested before scoping existed explicit ``shared`` and
+        ``department`` keys. build_where filters Chroma on those keys, while
+        matches() treats a missing key as shared/all; writing the defaults to
+        Chroma makes both rankers see the same corpus. rescope() refines them
+        from the projects table later.
+        """
+        filled, stale = [], []
+        for doc_id, meta in zip(ids, metadatas):
+            meta = meta or {}
+            if "shared" not in meta or "department" not in meta:
+                meta = {**chunk_metadata(meta.get("source", "")), **meta}
+                stale.append((doc_id, meta))
+            filled.append(meta)
+        if stale:
+            try:
+                self.collection.update(ids=[d for d, _ in stale], metadatas=[m for _, m in stale])
+                print(f"🔎 Backfilled scope metadata on {len(stale)} legacy chunks")
+            except Exception as e:
+                print("⚠ Scope backfill error:", e)
+        return filled
+
+    def add(self, ids: List[str], documents: List[str], metadatas: Optional[List[dict]] = None):
+        """Ingest chunks into Chroma and the keyword index together."""
+        self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+        self.index.add_many(ids, documents, metadatas)
+
+    def update_metadata(self, ids: List[str], metadatas: List[dict]):
+        """Replace chunk metadata in both stores (used to backfill scopes)."""
+        if not ids:
+            return
+        self.collection.update(ids=ids, metadatas=metadatas)
+        for doc_id, meta in zip(ids, metadatas):
+            self.index.set_metadata(doc_id, meta)
+
+    def rescope(self, doc_map: Dict[str, set]) -> int:
+        """Recompute project/department metadata for every persisted chunk."""
+        existing = self.collection.get(include=["metadatas"])
+        ids = existing.get("ids") or []
+        metadatas = [chunk_metadata((meta or {}).get("source", ""), doc_map)
+                     for meta in existing.get("metadatas") or [{}] * len(ids)]
+        self.update_metadata(ids, metadatas)
+        return len(ids)
+
+    def _vector_ids(self, query: str, n: int, where: Optional[dict] = None) -> List[str]:
+        # Dense similarity is noise for one- or two-word queries; BM25 covers those.
+        if len(query.split()) < self.min_vector_words:
+            return []
+        try:
+            kwargs = {"where": where} if where else {}
+            results = self.collection.query(query_texts=[query], n_results=n,
+                                            include=["documents", "metadatas"], **kwargs)
+        except Exception as e:
+            print("⚠ Vector query error:", e)
+            return []
+        ids = (results or {}).get("ids") or [[]]
+        docs = (results or {}).get("documents") or [[]]
+        metas = (results or {}).get("metadatas") or [[None] * len(ids[0])]
+        # Keep documents the keyword index has not seen (e.g. added by another worker).
+        for doc_id, doc, meta in zip(ids[0], docs[0], metas[0]):
+            if doc_id not in self.index and doc:
+                self.index.add(doc_id, doc, meta)
+        return list(ids[0])
+
+    def query(self, query: str, k: int = 3, scope: Optional[dict] = None) -> List[str]:
+        """
+        Return up to k chunk texts ranked by RRF over vector and BM25 results.
+
+        ``scope`` ({"project_id": ..., "department": ...}) restricts both
+        searches to chunks tagged for that project/department plus shared ones.
+        """
+        if not query or not query.strip():
+            return []
+        self.bootstrap()
+        n = max(k, self.candidates)
+        where = build_where(scope)
+        predicate = (lambda meta: matches(meta, scope)) if where else None
+        keyword_ids = [doc_id for doc_id, _ in self.index.search(query, n, predicate)]
+        vector_ids = self._vector_ids(query, n, where)
+        fused = reciprocal_rank_fusion([vector_ids, keyword_ids])[:k]
+        return [self.index.document(doc_id) for doc_id in fused if self.index.document(doc_id)]
+
+    def query_many(self, queries: List[str], k: int = 3, scope: Optional[dict] = None) -> List[List[str]]:
+        """``query`` for each of ``queries`` (RemoteRetriever sends them in one call)."""
+        return [self.query(q, k=k, scope=scope) for q in queries]
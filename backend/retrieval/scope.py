@@ -0,0 +1,97 @@
+"""
+Retrieval Scope Metadata
+
+Chunks carry precomputed project/department metadata so that Chroma can filter
+by ``where`` before ranking, and the BM25 index can skip out-of-scope chunks.
+
+Chroma metadata values must be scalars, so a chunk linked to several projects
+gets one boolean flag per project (``project:<uuid>``). Chunks not linked to
+any project are ``shared`` and stay visible in every project scope.
+"""
+import os
+from typing import Dict, Iterable, Optional, Set
+
+PROJECT_FLAG_PREFIX = "project:"
+ALL_DEPARTMENTS = "all"
+
+
+def _project_flag(project_id: str) -> str:
+    return f"{PROJECT_FLAG_PREFIX}{project_id}"
+
+
+def project_document_map(projects: Iterable[dict]) -> Dict[str, Set[str]]:
+    """
+    Map document file names to the project uuids that list them in
+    ``projects.upload_documents`` (a list or a comma-separated string of
+    file names / URLs).
+    """
+    doc_map: Dict[str, Set[str]] = {}
+    for proj in projects or []:
+        uuid = proj.get("uuid")
+        docs = proj.get("upload_documents")
+        if not uuid or not docs:
+            continue
+        if isinstance(docs, str):
+            docs = docs.split(",")
+        for doc in docs:
+            if isinstance(doc, dict):
+                doc = doc.get("name") or doc.get("url") or doc.get("path")
+            name = os.path.basename(str(doc or "").strip().split("?")[0])
+            if name:
+                doc_map.setdefault(name.lower(), set()).add(str(uuid))
+    return doc_map
+
+
+def chunk_metadata(source: str, doc_map: Optional[Dict[str, Set[str]]] = None,
+                   docs_root: str = "company_docs") -> dict:
+    """
+    Build the metadata stored with every chunk of ``source``.
+
+    Department comes from the first sub-folder under ``docs_root``
+    (company_docs/<department>/file.pdf); top-level files apply to all.
+    """
+    meta = {"source": source}
+    rel = os.path.relpath(source, docs_root) if source else ""
+    parts = rel.replace("\\", "/").split("/")
+    meta["department"] = parts[0].lower() if len(parts) > 1 and parts[0] not in ("", "..") else ALL_DEPARTMENTS
+
+    project_ids = (doc_map or {}).get(os.path.basename(source or "").lower(), set())
+    meta["shared"] = not project_ids
+    for pid in project_ids:
+        meta[_project_flag(pid)] = True
+    return meta
+
+
+def _normalize(scope: Optional[dict]) -> dict:
+    scope = scope or {}
+    project_id = scope.get("project_id")
+    if project_id in (None, "", "default", "general"):
+        project_id = None
+    department = (scope.get("department") or "").strip().lower() or None
+    return {"project_id": project_id, "department": department}
+
+
+def build_where(scope: Optional[dict]) -> Optional[dict]:
+    """Translate a scope into a Chroma ``where`` filter (None means unscoped)."""
+    scope = _normalize(scope)
+    clauses = []
+    if scope["project_id"]:
+        clauses.append({"$or": [{_project_flag(scope["project_id"]): True}, {"shared": True}]})
+    if scope["department"]:
+        clauses.append({"$or": [{"department": scope["department"]}, {"department": ALL_DEPARTMENTS}]})
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def matches(metadata: Optional[dict], scope: Optional[dict]) -> bool:
+    """Python equivalent of ``build_where`` for the in-memory BM25 index."""
+    scope = _normalize(scope)
+    meta = metadata or {}
+    if scope["project_id"]:
+        if not (meta.get(_project_flag(scope["project_id"])) or meta.get("shared", True)):
+            return False
+    if scope["department"]:
+        if meta.get("department", ALL_DEPARTMENTS) not in (scope["department"], ALL_DEPARTMENTS):
+            return False
+    return True
@@ -0,0 +1,166 @@
+"""
+Retrieval Sidecar
+
+A single local process that owns the Chroma handle (and with it Chroma's
+embedding function) and the BM25 index, served over a Unix socket. Gunicorn
+workers talk to it through ``RemoteRetriever`` instead of each loading their
+own model and opening their own SQLite-backed Chroma client, so memory stays
+flat as workers are added.
+
+Every call is one short connection: connect, one JSON line each way, close.
+That transport costs about 0.3-0.5 ms per call (connect, JSON encode/decode,
+one thread per connection; benchmarks/bench_sidecar_roundtrip.py), small next
+to an embedding + Chroma query but paid once per call, so callers that need
+several lookups use ``query_many`` to send them in one call.
+
+Protocol: one JSON object per line in each direction.
+    {"op": "query", "queries": [...], "k": 3, "scope": {...}} -> {"ok": true, "results": [[doc, ...], ...]}
+    {"op": "add", "ids": [...], "documents": [...], "metadatas": [...]} -> {"ok": true}
+    {"op": "ping"}                                  -> {"ok": true}
+    {"op": "rescope", "doc_map": {"file.pdf": [uuid, ...]}} -> {"ok": true, "updated": n}
+
+Run with:  python -m retrieval.sidecar --socket /tmp/debugmate-retrieval.sock
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+from typing import List, Optional
+
+DEFAULT_SOCKET = "/tmp/debugmate-retrieval.sock"
+
+
+class SidecarError(RuntimeError):
+    """Raised when the sidecar cannot be reached or reports a failure."""
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = self.server.dispatch(json.loads(line))
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class RetrievalServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path: str, retriever=None):
+        from .hybrid import HybridRetriever
+        from .store import get_collection
+
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, _Handler)
+        self.retriever = retriever or HybridRetriever(get_collection)
+
+    def dispatch(self, req: dict) -> dict:
+        op = req.get("op")
+        if op == "ping":
+            return {"ok": True}
+        if op == "query":
+            k = int(req.get("k", 3))
+            scope = req.get("scope")
+            return {"ok": True, "results": [self.retriever.query(q, k=k, scope=scope) for q in req.get("queries") or []]}
+        if op == "add":
+            self.retriever.add(req.get("ids") or [], req.get("documents") or [], req.get("metadatas"))
+            return {"ok": True}
+        if op == "rescope":
+            doc_map = {name: set(pids) for name, pids in (req.get("doc_map") or {}).items()}
+            return {"ok": True, "updated": self.retriever.rescope(doc_map)}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+
+class SidecarClient:
+    """Blocking client for the retrieval sidecar; one short connection per call."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET, timeout: float = 30.0):
+        self.path = path
+        self.timeout = timeout
+
+    def _call(self, payload: dict) -> dict:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(self.timeout)
+                sock.connect(self.path)
+                sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+                with sock.makefile("rb") as f:
+                    line = f.readline()
+        except OSError as e:
+            raise SidecarError(f"retrieval sidecar unavailable at {self.path}: {e}") from e
+        if not line:
+            raise SidecarError("retrieval sidecar closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise SidecarError(response.get("error", "retrieval sidecar error"))
+        return response
+
+    def ping(self) -> bool:
+        try:
+            return self._call({"op": "ping"})["ok"]
+        except SidecarError:
+            return False
+
+    def query(self, queries: List[str], k: int = 3, scope: Optional[dict] = None) -> List[List[str]]:
+        payload = {"op": "query", "queries": list(queries), "k": k}
+        if scope:
+            payload["scope"] = scope
+        return self._call(payload)["results"]
+
+    def add(self, ids: List[str], documents: List[str], metadatas: Optional[List[dict]] = None):
+        self._call({"op": "add", "ids": list(ids), "documents": list(documents), "metadatas": metadatas})
+
+    def rescope(self, doc_map: dict) -> int:
+        payload = {name: sorted(pids) for name, pids in doc_map.items()}
+        return self._call({"op": "rescope", "doc_map": payload})["updated"]
+
+
+class RemoteRetriever:
+    """Drop-in replacement for HybridRetriever that forwards to the sidecar."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET):
+        self.client = SidecarClient(path)
+
+    def add(self, ids: List[str], documents: List[str], metadatas: Optional[List[dict]] = None):
+        self.client.add(ids, documents, metadatas)
+
+    def rescope(self, doc_map: dict) -> int:
+        return self.client.rescope(doc_map)
+
+    def query(self, query: str, k: int = 3, scope: Optional[dict] = None) -> List[str]:
+        if not query or not query.strip():
+            return []
+        return self.client.query([query], k=k, scope=scope)[0]
+
+    def query_many(self, queries: List[str], k: int = 3, scope: Optional[dict] = None) -> List[List[str]]:
+        """Several queries in one round trip."""
+        return self.client.query(queries, k=k, scope=scope) if queries else []
+
+
+def serve(path: str = DEFAULT_SOCKET, prewarm_store: bool = True):
+    server = RetrievalServer(path)
+    if prewarm_store:
+        from .store import prewarm
+        prewarm()
+        server.retriever.bootstrap()
+    print(f"📡 Retrieval sidecar listening on {path}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DebugMate retrieval sidecar")
+    parser.add_argument("--socket", default=os.getenv("RETRIEVAL_SOCKET", DEFAULT_SOCKET))
+    parser.add_argument("--no-prewarm", action="store_true")
+    args = parser.parse_args()
+    serve(args.socket, prewarm_store=not args.no_prewarm)
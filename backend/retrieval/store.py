@@ -0,0 +1,55 @@
+"""
+Lazy Chroma Store
+
+The Chroma client and its embedding function are expensive to create, so they
+are built on first use instead of at import time. Workers that only serve auth
+or session routes never pay for them; ``prewarm`` loads them up front for
+workers that will serve chat traffic. Chroma embeds documents and queries with
+its own default function, so no separate embedding model is loaded.
+"""
+import os
+import threading
+
+CHROMA_PATH = os.getenv("CHROMA_PATH", "./chroma_db")
+COLLECTION_NAME = os.getenv("CHROMA_COLLECTION", "company_docs")
+
+_lock = threading.RLock()
+_client = None
+_collection = None
+
+
+def get_chroma_client():
+    """Return the shared persistent Chroma client, opening it on first call."""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                import chromadb
+                _client = chromadb.PersistentClient(path=CHROMA_PATH)
+    return _client
+
+
+def get_collection():
+    """Return the company_docs collection, creating it on first call."""
+    global _collection
+    if _collection is None:
+        with _lock:
+            if _collection is None:
+                _collection = get_chroma_client().get_or_create_collection(COLLECTION_NAME)
+    return _collection
+
+
+def prewarm():
+    """
+    Eagerly open Chroma and load its embedding function.
+
+    Meant for worker start-up (see gunicorn.conf.py). A throwaway query forces
+    the embedding function to load.
+    """
+    collection = get_collection()
+    try:
+        if collection.count():
+            collection.query(query_texts=["warmup"], n_results=1)
+    except Exception as e:
+        print("⚠ Chroma prewarm query failed:", e)
+    print("🔥 Retrieval store prewarmed")
@@ -0,0 +1,9 @@
+from .stores import MemorySessionStore, SQLiteSessionStore, RedisSessionStore, ExpirySweeper
+
+# Server-side session storage; Flask wiring lives in sessions.interface
+__all__ = [
+    'MemorySessionStore',
+    'SQLiteSessionStore',
+    'RedisSessionStore',
+    'ExpirySweeper'
+]
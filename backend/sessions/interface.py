@@ -0,0 +1,104 @@
+"""
+Flask wiring for the server-side session stores.
+
+SESSION_BACKEND selects the backend:
+    filesystem (default)  Flask-Session files under ./flask_session
+    sqlite                sessions/stores.SQLiteSessionStore (SESSION_DB, default sessions.db in DATA_DIR)
+    memory                in-process dict; single worker or sticky routing only
+    redis                 any Redis-compatible server at SESSION_REDIS_URL; needs the
+                          optional packages in requirements-redis.txt
+"""
+import os
+import secrets
+from datetime import timedelta
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from data_paths import data_path
+
+from .stores import ExpirySweeper, MemorySessionStore, RedisSessionStore, SQLiteSessionStore
+
+
+class StoreSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, new=False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+
+
+class StoreSessionInterface(SessionInterface):
+    """Keeps session data in a store; the cookie only carries a random session id."""
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store, ttl: timedelta = timedelta(days=1)):
+        self.store = store
+        self.ttl = ttl
+
+    def _ttl_seconds(self, app) -> float:
+        return (app.permanent_session_lifetime if app.config.get("SESSION_PERMANENT") else self.ttl).total_seconds()
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            raw = self.store.get(sid)
+            if raw is not None:
+                try:
+                    data = self.serializer.loads(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+                    return StoreSession(data, sid=sid)
+                except Exception:
+                    pass
+        return StoreSession(sid=secrets.token_urlsafe(32), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if not session:
+            if session.modified:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+        if not self.should_set_cookie(app, session):
+            return
+        self.store.set(session.sid, self.serializer.dumps(dict(session)).encode("utf-8"), self._ttl_seconds(app))
+        response.set_cookie(
+            name,
+            session.sid,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def configure_session_backend(app, backend: str = None):
+    """Install the session backend chosen by SESSION_BACKEND (see module docstring)."""
+    backend = (backend or os.getenv("SESSION_BACKEND", "filesystem")).lower()
+    if backend == "filesystem":
+        from flask_session import Session
+        Session(app)
+        return None
+
+    if backend == "sqlite":
+        store = SQLiteSessionStore(data_path("sessions.db", "SESSION_DB"))
+    elif backend == "memory":
+        store = MemorySessionStore()
+    elif backend == "redis":
+        store = RedisSessionStore(os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0"))
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+
+    ttl = timedelta(seconds=int(os.getenv("SESSION_TTL_SECONDS", "86400")))
+    app.session_interface = StoreSessionInterface(store, ttl=ttl)
+    sweeper = ExpirySweeper(store, interval=float(os.getenv("SESSION_SWEEP_SECONDS", "300")))
+    sweeper.start()
+    print(f"🗄 Session backend: {backend}")
+    return sweeper
@@ -0,0 +1,140 @@
+"""
+Server-Side Session Stores
+
+Storage backends for ``StoreSessionInterface`` (sessions/interface.py). Each
+store maps an opaque session id to serialized session bytes with an absolute
+expiry time, and can ``sweep`` expired entries; ``ExpirySweeper`` runs that on
+a background thread so stale sessions never pile up the way the files under
+backend/flask_session did.
+"""
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+
+class MemorySessionStore:
+    """
+    In-process store. Only correct with a single worker or sticky routing
+    (every request of a session reaching the same worker).
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, sid: str) -> Optional[bytes]:
+        item = self._data.get(sid)
+        if item is None:
+            return None
+        if item[1] < time.time():
+            self.delete(sid)
+            return None
+        return item[0]
+
+    def set(self, sid: str, value: bytes, ttl: float):
+        with self._lock:
+            self._data[sid] = (value, time.time() + ttl)
+
+    def delete(self, sid: str):
+        with self._lock:
+            self._data.pop(sid, None)
+
+    def sweep(self) -> int:
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (_, exp) in self._data.items() if exp < now]
+            for sid in expired:
+                del self._data[sid]
+        return len(expired)
+
+
+class SQLiteSessionStore:
+    """Single-file store shared by all workers on a host (WAL mode)."""
+
+    def __init__(self, path: str = "sessions.db"):
+        self.path = path
+        self._local = threading.local()
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " sid TEXT PRIMARY KEY, data BLOB NOT NULL, expires REAL NOT NULL)"
+        )
+        self._conn().execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions(expires)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, sid: str) -> Optional[bytes]:
+        row = self._conn().execute(
+            "SELECT data FROM sessions WHERE sid = ? AND expires >= ?", (sid, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, sid: str, value: bytes, ttl: float):
+        self._conn().execute(
+            "INSERT INTO sessions(sid, data, expires) VALUES (?, ?, ?) "
+            "ON CONFLICT(sid) DO UPDATE SET data = excluded.data, expires = excluded.expires",
+            (sid, value, time.time() + ttl),
+        )
+
+    def delete(self, sid: str):
+        self._conn().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+    def sweep(self) -> int:
+        return self._conn().execute("DELETE FROM sessions WHERE expires < ?", (time.time(),)).rowcount
+
+
+class RedisSessionStore:
+    """
+    Store for any Redis-compatible server (redis, valkey, KeyDB, ...), so
+    workers on different hosts share sessions. Expiry is native (SETEX).
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "session:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("SESSION_BACKEND=redis requires the 'redis' package "
+                               "(pip install -r requirements-redis.txt)") from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, sid: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + sid)
+
+    def set(self, sid: str, value: bytes, ttl: float):
+        self.client.setex(self.prefix + sid, max(1, int(ttl)), value)
+
+    def delete(self, sid: str):
+        self.client.delete(self.prefix + sid)
+
+    def sweep(self) -> int:
+        return 0  # the server expires keys itself
+
+
+class ExpirySweeper(threading.Thread):
+    """Daemon thread that periodically removes expired sessions from a store."""
+
+    def __init__(self, store, interval: float = 300.0):
+        super().__init__(name="session-sweeper", daemon=True)
+        self.store = store
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                removed = self.store.sweep()
+                if removed:
+                    print(f"🧹 Swept {removed} expired sessions")
+            except Exception as e:
+                print("⚠ session sweep error:", e)
+
+    def stop(self):
+        self._stop_event.set()
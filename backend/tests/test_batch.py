@@ -0,0 +1,53 @@
+import gzip
+import json
+
+from verification.batch import evaluate_corpus, load_projects
+
+PROJECTS = [
+    {"uuid": "8c1f2d3e-0000-4000-8000-000000000001", "id": 1, "project_name": "Apollo CRM",
+     "status": "Active", "client_name": "Acme", "leader_of_project": "Priya Shah"},
+    {"uuid": "8c1f2d3e-0000-4000-8000-000000000002", "id": 2, "project_name": "Hermes Portal",
+     "status": "Completed", "client_name": "Globex", "leader_of_project": "Bob Jones"},
+]
+
+
+def _write_corpus(path, items):
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for item in items:
+            f.write(json.dumps(item) + "\n")
+
+
+def test_scores_logged_replies_by_project_uuid(tmp_path):
+    corpus = tmp_path / "replies.jsonl.gz"
+    items = []
+    for i in range(60):
+        project = PROJECTS[i % 2]
+        items.append({"id": i, "query": "what is the status of the project",
+                      "reply": f"{project['project_name']} is {project['status']} for {project['client_name']}.",
+                      "project_id": project["uuid"]})
+    items.append({"id": 60, "query": "status?", "reply": "Apollo CRM is Active.", "project_id": 1})
+    items.append({"id": 61, "query": "status?", "reply": "Unknown.", "project_id": "no-such-project"})
+    items.append({"id": 62, "query": "what is the status", "reply": "Zeus is Active.",
+                  "project": {"uuid": "inline", "project_name": "Zeus", "status": "Active"}})
+    _write_corpus(corpus, items)
+    rows_out = tmp_path / "rows.jsonl.gz"
+
+    summary = evaluate_corpus(str(corpus), PROJECTS, workers=2, chunk_size=7, rows_out=str(rows_out))
+
+    assert summary["replies"] == len(items)
+    assert summary["trust_levels"].get("No Data") == 1
+    assert summary["overall"]["count"] == len(items) - 1
+    with gzip.open(rows_out, "rt", encoding="utf-8") as f:
+        rows = {r["id"]: r for r in map(json.loads, f)}
+    assert sorted(rows) == list(range(len(items)))
+    assert rows[61]["trust_level"] == "No Data"
+    for i in (0, 1, 60, 62):
+        assert rows[i]["alignment_score"] is not None
+        assert "status" in rows[i]["field_scores"]
+
+
+def test_load_projects_array_or_lines(tmp_path):
+    as_array, as_lines = tmp_path / "p.json", tmp_path / "p.jsonl"
+    as_array.write_text(json.dumps(PROJECTS), encoding="utf-8")
+    as_lines.write_text("\n".join(map(json.dumps, PROJECTS)) + "\n", encoding="utf-8")
+    assert load_projects(str(as_array)) == load_projects(str(as_lines)) == PROJECTS
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from benchmarks.bench_fact_extraction import CORPUS, legacy_memory_facts, legacy_user_facts
+from memory.facts import _TRIGGERS, extract_memory_facts, extract_user_facts, scan
+
+# triggers that overlap: a longer phrase ("i'm a") must not hide one starting inside it
+OVERLAPS = [
+    "I'm available from 10:00 AM - 6:00 PM",
+    "i am availability is 9:00 AM - 5:00 PM",
+    "I am available 10:00 - 18:00",
+    "i'm a dev, available from 09:00 - 17:00",
+    "i am working on retrieval; i am a backend developer",
+    "my tech stack: flask and chroma",
+    "i'm in the data team: analytics",
+]
+
+
+@pytest.mark.parametrize("text", CORPUS + OVERLAPS)
+def test_matches_original_patterns(text):
+    fields, memory = scan.__wrapped__(text)
+    assert list(fields) == legacy_user_facts(text)
+    assert list(memory) == legacy_memory_facts(text)
+
+
+def test_overlapping_triggers():
+    assert ("availability_hours", "10:00 AM - 6:00 PM") in extract_user_facts(OVERLAPS[0])
+
+
+def test_fuzzed_trigger_soup():
+    rng = random.Random(5)
+    pieces = list(_TRIGGERS) + ["available from", "availability is", "a", "am", "I'M", "zeel", "10:00 AM - 6:00 PM",
+                                "3", "years", "of", "experience", "x@y.com", "python, sql", ":", "-", ",", " "]
+    for _ in range(3000):
+        text = " ".join(rng.choice(pieces) for _ in range(rng.randint(1, 8)))
+        if rng.random() < 0.3:
+            text = text.upper()
+        assert extract_user_facts(text) == legacy_user_facts(text), text
+        assert extract_memory_facts(text) == legacy_memory_facts(text), text
+
+
+def test_empty():
+    assert scan("") == ((), ())
+    assert extract_user_facts(None) == []
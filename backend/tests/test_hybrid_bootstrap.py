@@ -0,0 +1,54 @@
+import threading
+import time
+
+from retrieval.hybrid import HybridRetriever
+
+
+class SlowCollection:
+    """Chroma stand-in whose first ``get`` is slow, and can be made to fail."""
+
+    def __init__(self, fail=0):
+        self.gets = 0
+        self.fail = fail
+
+    def get(self, include=None):
+        self.gets += 1
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("chroma unavailable")
+        time.sleep(0.05)
+        return {
+            "ids": ["a", "b"],
+            "documents": ["apollo release checklist", "hermes onboarding guide"],
+            "metadatas": [{"source": "a.md", "shared": True, "department": "all"},
+                          {"source": "b.md", "shared": True, "department": "all"}],
+        }
+
+    def query(self, **kwargs):
+        return {"ids": [[]], "documents": [[]], "metadatas": [[]]}
+
+
+def test_concurrent_queries_wait_for_one_bootstrap():
+    collection = SlowCollection()
+    retriever = HybridRetriever(collection)
+    results, start = [], threading.Barrier(8)
+
+    def ask():
+        start.wait()
+        results.append(retriever.query("apollo", k=1))
+
+    threads = [threading.Thread(target=ask) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert collection.gets == 1
+    assert results == [["apollo release checklist"]] * 8
+
+
+def test_failed_bootstrap_is_retried():
+    collection = SlowCollection(fail=1)
+    retriever = HybridRetriever(collection)
+    assert retriever.query("apollo", k=1) == []
+    assert retriever.query("apollo", k=1) == ["apollo release checklist"]
+    assert collection.gets == 2
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+
+from benchmarks.bench_intent_router import CASES, legacy_route
+from patterns import trie_pattern
+from prompting import route_intent
+
+
+@pytest.mark.parametrize("query,expected,original", CASES)
+def test_routing_table(query, expected, original):
+    assert route_intent(query).intent == expected
+    if expected is not None:
+        # the original checks agree unless the table records what they returned instead
+        assert legacy_route(query) == (original or expected)
+
+
+def test_confidence_is_share_of_total_score():
+    match = route_intent("fix this sql error")
+    assert match.intent == "debugging"
+    assert match.confidence == 1.0
+    mixed = route_intent("project status")
+    assert mixed.intent == "status"
+    assert mixed.confidence == round(mixed.scores["status"] / sum(mixed.scores.values()), 3)
+
+
+def test_plurals_and_code_fences():
+    assert route_intent("list the clients").intent == "client"
+    assert route_intent("```print(1)```").scores == {"coding": 3.0}
+
+
+def test_no_match():
+    for query in ("", None, "hello there"):
+        match = route_intent(query)
+        assert (match.intent, match.confidence, dict(match.scores)) == (None, 0.0, {})
+
+
+def test_cached_scores_are_read_only():
+    match = route_intent("who is the client")
+    with pytest.raises(TypeError):
+        match.scores["client"] = 0.0
+    assert route_intent("who is the client").scores["client"] == 2.0
+
+
+def test_trie_pattern_matches_the_plain_alternation():
+    words = ["i am", "i am a", "i'm", "api", "apis", "a", "about"]
+    trie = re.compile(r"\b(?:" + trie_pattern(words) + r")\b")
+    plain = re.compile(r"\b(?:" + "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True)) + r")\b")
+    for text in ("i am a dev", "i'm here", "about the apis", "a api", "iam"):
+        assert trie.findall(text) == plain.findall(text)
@@ -0,0 +1,28 @@
+import threading
+import time
+
+from history import OrderedWriter
+
+
+def test_writes_run_in_submission_order_and_flush_waits():
+    writer = OrderedWriter(name="test-writer")
+    done = []
+    gate = threading.Event()
+    writer.submit(gate.wait)
+    for i in range(50):
+        writer.submit(done.append, i)
+    assert done == []
+    gate.set()
+    writer.flush()
+    assert done == list(range(50))
+
+
+def test_failed_write_does_not_stop_later_ones(capsys):
+    writer = OrderedWriter(name="test-writer")
+    done = []
+    writer.submit(lambda: 1 / 0)
+    writer.submit(time.sleep, 0.01)
+    writer.submit(done.append, "after")
+    writer.flush()
+    assert done == ["after"]
+    assert "chat writer error" in capsys.readouterr().out
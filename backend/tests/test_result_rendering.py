@@ -0,0 +1,27 @@
+from benchmarks.bench_result_rendering import legacy_bullets, make_rows
+from rendering import NO_RESULTS, display_headers, render_bullets
+
+
+def test_bullets_match_original_formatting():
+    rows = make_rows(300)
+    assert render_bullets(rows) == legacy_bullets(rows)
+
+
+def test_bullets_with_ragged_rows():
+    rows = [{"project_name": "Apollo", "tech_stack": ["Flask", "React"]},
+            {"status": "Done", "project_name": None, "members": {"lead": "Priya"}},
+            {"project_name": "", "budget": 0, "is_active": False}]
+    assert render_bullets(rows) == legacy_bullets(rows)
+
+
+def test_bullets_unicode_and_unserializable_cells():
+    rows = [{"name": "Überblick", "tags": ["naïve", "ü"], "odd": [{1, 2}]}]
+    assert render_bullets(rows) == legacy_bullets(rows)
+
+
+def test_empty_result():
+    assert render_bullets([]) == NO_RESULTS
+
+
+def test_display_headers():
+    assert display_headers(("project_name", "uuid")) == ("Project Name", "Uuid")
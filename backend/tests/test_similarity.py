@@ -0,0 +1,103 @@
+import os
+import random
+import subprocess
+import sys
+from difflib import SequenceMatcher
+
+import pytest
+
+from verification import get_verification_index, verify_response_final
+from verification.similarity import (_sketch, bounded_levenshtein, get_similarity, levenshtein_ratio,
+                                     minhash_similarity, sequence_ratio)
+
+WORDS = "apollo hermes atlas crm portal flask react api token sprint client acme alice bob status 2024".split()
+
+
+def _text(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n))
+
+
+def _levenshtein(a, b):
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(7)
+    projects = [{
+        "id": i,
+        "project_name": f"{rng.choice(WORDS)} {rng.choice(WORDS)} {i}",
+        "leader_of_project": rng.choice(["Alice Smith", "Bob Jones"]),
+        "status": rng.choice(["In Progress", "Completed"]),
+        "project_description": _text(rng, 80),
+    } for i in range(4)]
+    replies = [("tell me about the project", _text(rng, rng.randint(5, 120))) for _ in range(40)]
+    return projects, replies
+
+
+def test_difflib_backend_matches_sequence_matcher(corpus):
+    projects, replies = corpus
+    target = projects[0]["project_description"]
+    for _, reply in replies:
+        # twice, so the cached matcher for ``target`` is reused
+        for _ in range(2):
+            assert sequence_ratio(reply, target) == SequenceMatcher(None, reply, target).ratio()
+
+
+def test_difflib_backend_keeps_verifier_scores(corpus):
+    projects, replies = corpus
+    index = get_verification_index(projects)
+
+    def original(a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+    for query, reply in replies:
+        assert (verify_response_final(query, reply, index, similarity="difflib")
+                == verify_response_final(query, reply, index, similarity=original))
+
+
+def test_bounded_levenshtein_matches_full_distance():
+    rng = random.Random(3)
+    for _ in range(300):
+        a = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 70)))
+        b = "".join(rng.choice("abc ") for _ in range(rng.randint(0, 70)))
+        dist = _levenshtein(a, b)
+        for max_dist in (0, 5, 20, 100):
+            assert bounded_levenshtein(a, b, max_dist) == (dist if dist <= max_dist else max_dist + 1)
+
+
+def test_levenshtein_ratio_floor():
+    assert levenshtein_ratio("", "") == 1.0
+    assert levenshtein_ratio("apollo", "apollo") == 1.0
+    assert levenshtein_ratio("abcdefghij", "abcdefghxy") == pytest.approx(0.8)
+    assert levenshtein_ratio("abcdefghij", "zzzzzzzzzz", floor=0.3) == 0.0
+
+
+def test_minhash_bounds():
+    assert minhash_similarity("apollo portal", "apollo portal") == 1.0
+    assert minhash_similarity("aaaa", "zzzz") == 0.0
+    assert 0.0 < minhash_similarity("apollo portal rollout", "apollo portal") < 1.0
+
+
+def test_minhash_sketch_is_stable_across_processes():
+    text = "apollo crm portal for acme, led by alice"
+    code = ("from verification.similarity import _sketch, minhash_similarity;"
+            f"print(_sketch({text!r}), minhash_similarity({text!r}, 'apollo portal'))")
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = {
+        subprocess.run([sys.executable, "-c", code], cwd=backend, capture_output=True, text=True, check=True,
+                       env={**os.environ, "PYTHONHASHSEED": seed}).stdout
+        for seed in ("1", "2")
+    }
+    assert outputs == {f"{_sketch(text)} {minhash_similarity(text, 'apollo portal')}\n"}
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_similarity("cosine")
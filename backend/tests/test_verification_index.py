@@ -0,0 +1,45 @@
+from verification import CachedProjects, get_verification_index
+from verification import index as index_module
+
+
+def _projects():
+    return [
+        {"id": 1, "project_name": "Apollo", "leader_email": "Ann@x.io", "start_date": "2024-01-01"},
+        {"id": 2, "project_name": "Hermes", "tech_stack": ["flask", "react"]},
+    ]
+
+
+def test_same_list_skips_version_scan(monkeypatch):
+    data = _projects()
+    first = get_verification_index(data)
+    calls = []
+    real = index_module.project_version
+    monkeypatch.setattr(index_module, "project_version", lambda p: calls.append(p) or real(p))
+    assert get_verification_index(data) is first
+    assert calls == []
+
+
+def test_new_list_is_rescanned():
+    data = _projects()
+    first = get_verification_index(data)
+    # an equal copy hits the version-keyed cache
+    assert get_verification_index(_projects()) is first
+    edited = _projects()
+    edited[1]["project_name"] = "Atlas"
+    assert "atlas" in get_verification_index(edited).text["name"]
+    # a grown list with the same identity is not served the stale index
+    data.append({"id": 3, "project_name": "Zephyr"})
+    assert "zephyr" in get_verification_index(data).text["name"]
+
+
+def test_cached_projects_refresh_swaps_index():
+    version = {"name": "Apollo"}
+    projects = CachedProjects(lambda: [{"id": 1, "project_name": version["name"]}], ttl=0)
+    assert "apollo" in get_verification_index(projects()).text["name"]
+    version["name"] = "Hermes"
+    assert "hermes" in get_verification_index(projects()).text["name"]
+
+
+def test_empty_and_none():
+    assert get_verification_index(None).size == 0
+    assert get_verification_index([]).size == 0
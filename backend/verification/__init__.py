@@ -0,0 +1,30 @@
+from .batch import evaluate_corpus, load_projects
+from .index import ProjectEntry, VerificationIndex, get_verification_index, project_version
+from .jobs import AlignmentQueue, AlignmentResultStore, CachedProjects, historic_turns, run_batch
+from .similarity import BACKENDS, get_similarity
+from .technical import TechnicalPromptDetector, is_technical_prompt
+from .text import ReplyText, normalize_reply, reply_text
+from .verifier import verify_response_final
+
+# Reply-vs-project-data accuracy checks
+__all__ = [
+    'ProjectEntry',
+    'VerificationIndex',
+    'get_verification_index',
+    'project_version',
+    'verify_response_final',
+    'BACKENDS',
+    'get_similarity',
+    'AlignmentQueue',
+    'AlignmentResultStore',
+    'CachedProjects',
+    'historic_turns',
+    'run_batch',
+    'evaluate_corpus',
+    'load_projects',
+    'TechnicalPromptDetector',
+    'is_technical_prompt',
+    'ReplyText',
+    'normalize_reply',
+    'reply_text'
+]
@@ -0,0 +1,200 @@
+"""
+Batch Verification
+
+Scores a JSON-lines corpus of logged (query, reply, project) triples with
+verify_response_final across a process pool. Each worker builds the
+VerificationIndex of every project once, at start-up; the corpus is streamed
+in chunks with at most two chunks per worker in flight, and results are
+consumed as they complete, so memory does not grow with its size. The output is a per-field
+score distribution (count, mean, percentiles, 10-point histogram) plus trust
+level counts, and optionally one scored row per input line (in completion
+order; each row carries its id).
+
+Corpus lines: {"query": ..., "reply": ..., "project_id": ...} where
+project_id is the project's uuid (as chat logs store it; a numeric id also
+works), or {"project": {...}} inline.
+
+Run from backend/:
+    python -m verification.batch --corpus replies.jsonl.gz --projects projects.json --out summary.json
+"""
+import argparse
+import gzip
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+
+from .index import VerificationIndex, get_verification_index
+from .verifier import verify_response_final
+
+CHUNK_SIZE = 2000
+BUCKETS = 10
+
+_indexes: Dict[str, VerificationIndex] = {}
+_similarity: Optional[str] = None
+
+
+def _open(path: str, mode: str = "rt"):
+    return gzip.open(path, mode, encoding="utf-8") if path.endswith(".gz") else open(path, mode, encoding="utf-8")
+
+
+def load_projects(path: str) -> List[dict]:
+    """A JSON array of project rows, or JSON lines of them."""
+    with _open(path) as f:
+        text = f.read().strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+def _init_worker(projects: List[dict], similarity: Optional[str]):
+    global _similarity
+    _similarity = similarity
+    for p in projects:
+        index = get_verification_index([p])
+        # chat logs store the project uuid; rows without one are found by id
+        for key in (p.get("uuid"), p.get("id")):
+            if key is not None:
+                _indexes[str(key)] = index
+
+
+def _score_chunk(lines: List[str]) -> List[dict]:
+    out = []
+    for line in lines:
+        item = json.loads(line)
+        if isinstance(item.get("project"), dict):
+            index = get_verification_index([item["project"]])
+        else:
+            index = _indexes.get(str(item.get("project_id")))
+        if index is None:
+            out.append({"id": item.get("id"), "project_id": item.get("project_id"), "alignment_score": None,
+                        "trust_level": "No Data", "field_scores": {}})
+            continue
+        check = verify_response_final(item.get("query", ""), item.get("reply", ""), index, similarity=_similarity)
+        out.append({"id": item.get("id"), "project_id": item.get("project_id"),
+                    "alignment_score": check.get("alignment_score"), "trust_level": check.get("trust_level"),
+                    "field_scores": check.get("field_scores", {})})
+    return out
+
+
+def _chunks(path: str, size: int) -> Iterator[List[str]]:
+    with _open(path) as f:
+        lines = (line for line in f if line.strip())
+        while True:
+            chunk = list(islice(lines, size))
+            if not chunk:
+                return
+            yield chunk
+
+
+def _scored(pool: ProcessPoolExecutor, chunks: Iterator[List[str]], window: int) -> Iterator[List[dict]]:
+    """
+    Results of _score_chunk in completion order, keeping at most ``window``
+    chunks submitted at a time (Executor.map would read every chunk up front).
+    """
+    pending = {pool.submit(_score_chunk, chunk) for chunk in islice(chunks, window)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+        pending.update(pool.submit(_score_chunk, chunk) for chunk in islice(chunks, len(done)))
+
+
+class _Distribution:
+    __slots__ = ("count", "total", "hist", "exact")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.hist = [0] * BUCKETS
+        # scores are rounded to 2 decimals, so exact counts stay small
+        self.exact: Dict[float, int] = {}
+
+    def add(self, score: float):
+        self.count += 1
+        self.total += score
+        self.hist[min(BUCKETS - 1, int(score // (100 / BUCKETS)))] += 1
+        self.exact[score] = self.exact.get(score, 0) + 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank, seen = q * (self.count - 1), 0
+        for value in sorted(self.exact):
+            seen += self.exact[value]
+            if seen > rank:
+                return value
+        return max(self.exact)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count, 2) if self.count else None,
+            "p10": self.percentile(0.10), "p50": self.percentile(0.50), "p90": self.percentile(0.90),
+            "histogram": {f"{i * 100 // BUCKETS}-{(i + 1) * 100 // BUCKETS}": n for i, n in enumerate(self.hist)},
+        }
+
+
+def evaluate_corpus(corpus: str, projects: List[dict], workers: int = None, chunk_size: int = CHUNK_SIZE,
+                    similarity: str = None, rows_out: str = None) -> dict:
+    fields: Dict[str, _Distribution] = {}
+    overall = _Distribution()
+    trust: Dict[str, int] = {}
+    start, n = time.perf_counter(), 0
+    rows_file = gzip.open(rows_out, "wt", encoding="utf-8") if rows_out else None
+    try:
+        workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(projects, similarity)) as pool:
+            for results in _scored(pool, _chunks(corpus, chunk_size), 2 * workers):
+                for r in results:
+                    n += 1
+                    trust[r["trust_level"]] = trust.get(r["trust_level"], 0) + 1
+                    if r["alignment_score"] is not None:
+                        overall.add(r["alignment_score"])
+                    for field, score in r["field_scores"].items():
+                        fields.setdefault(field, _Distribution()).add(score)
+                    if rows_file:
+                        rows_file.write(json.dumps(r, ensure_ascii=False) + "\n")
+    finally:
+        if rows_file:
+            rows_file.close()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    return {
+        "replies": n,
+        "seconds": round(elapsed, 2),
+        "replies_per_sec": round(n / elapsed, 1),
+        "overall": overall.as_dict(),
+        "fields": {k: v.as_dict() for k, v in sorted(fields.items())},
+        "trust_levels": trust,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score logged replies against project data in parallel")
+    parser.add_argument("--corpus", required=True, help="JSON lines of {query, reply, project_id|project}")
+    parser.add_argument("--projects", help="JSON array or JSON lines of project rows (default: fetch from Supabase)")
+    parser.add_argument("--out", default="-", help="summary JSON path, or - for stdout")
+    parser.add_argument("--rows", help="also write per-reply scores to this .jsonl.gz")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--similarity", default=None, help="verification.similarity backend")
+    args = parser.parse_args()
+
+    if args.projects:
+        project_rows = load_projects(args.projects)
+    else:
+        from history.transfer import _client
+        project_rows = _client().table("projects").select("*").execute().data or []
+
+    summary = evaluate_corpus(args.corpus, project_rows, args.workers, args.chunk_size, args.similarity, args.rows)
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    if args.out == "-":
+        print(text)
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ Scored {summary['replies']:,} replies in {summary['seconds']}s "
+              f"({summary['replies_per_sec']:,.0f}/s) → {args.out}")
@@ -0,0 +1,174 @@
+"""
+Project Verification Index
+
+verify_response_final used to rebuild the aggregated, normalized project
+fields (name, leader, team, tech, timeline, ...) from the whole projects table
+on every reply. Each project is now normalized once per version into a
+ProjectEntry, and the aggregate VerificationIndex over a project list is
+cached by the list's version key, together with its token sets, email sets
+and timeline year. Repeat calls with the same list object (CachedProjects
+hands out one list until it refreshes) skip even the key; an equal new list
+only costs computing the key; a single edited project only re-normalizes that
+project.
+"""
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from .text import find_year
+from .text import normalize_for_compare as _normalize_for_compare, token_set as _token_set
+
+TEXT_FIELDS = ("name", "status", "timeline", "leader", "team", "tech", "client", "description")
+TOKEN_FIELDS = ("name", "leader", "team", "tech", "timeline", "description")
+
+_ENTRY_CACHE_SIZE = 4096
+_INDEX_CACHE_SIZE = 8
+
+
+class ProjectEntry:
+    """Normalized verification fields of a single project row."""
+    __slots__ = ("text", "leader_emails", "team_emails")
+
+    def __init__(self, p: dict):
+        parts: Dict[str, List[str]] = {k: [] for k in TEXT_FIELDS}
+        leader_emails, team_emails = set(), set()
+        # name
+        for k in ("project_name", "project_title", "name"):
+            if p.get(k):
+                parts["name"].append(str(p.get(k)))
+        # status
+        if p.get("status"):
+            parts["status"].append(str(p.get("status")))
+        # timeline
+        for k in ("start_date", "end_date"):
+            if p.get(k):
+                parts["timeline"].append(str(p.get(k)))
+        # leader fields
+        for k in ("leader_of_project", "leader", "project_lead", "leader_name"):
+            if p.get(k):
+                parts["leader"].append(str(p.get(k)))
+        # leader emails (common custom names)
+        for ek in ("leader_email", "leader_of_project_email", "lead_email"):
+            if p.get(ek):
+                leader_emails.add(str(p.get(ek)).lower())
+        # team members and assigned emails
+        members = p.get("team_members") or []
+        if isinstance(members, list):
+            for m in members:
+                if isinstance(m, dict):
+                    # try email then name/role
+                    email = m.get("email") or m.get("mail")
+                    if email:
+                        team_emails.add(str(email).lower())
+                    # join human tokens
+                    parts["team"].append(" ".join([str(v) for v in m.values() if v]))
+                else:
+                    parts["team"].append(str(m))
+        # assigned_to_emails
+        for k in ("assigned_to_emails", "assigned_to", "assigned"):
+            val = p.get(k)
+            if isinstance(val, (list, tuple)):
+                for e in val:
+                    if e:
+                        team_emails.add(str(e).lower())
+            elif val:
+                team_emails.add(str(val).lower())
+        # tech
+        for tk in ("tech_stack", "tech_stack_custom", "technology"):
+            tval = p.get(tk)
+            if tval:
+                if isinstance(tval, list):
+                    parts["tech"].append(" ".join([str(x) for x in tval]))
+                else:
+                    parts["tech"].append(str(tval))
+        # client and description
+        if p.get("client_name"):
+            parts["client"].append(str(p.get("client_name")))
+        if p.get("project_description"):
+            parts["description"].append(str(p.get("project_description")))
+        if p.get("project_scope"):
+            parts["description"].append(str(p.get("project_scope")))
+
+        self.text = {k: _normalize_for_compare(" ".join(v)) for k, v in parts.items()}
+        self.leader_emails = frozenset(e for e in leader_emails if e)
+        self.team_emails = frozenset(e for e in team_emails if e)
+
+
+class VerificationIndex:
+    """
+    Aggregate of every project in a list, in the shape verify_response_final
+    reads: normalized field strings, their token sets, email sets and the
+    first timeline year.
+    """
+    __slots__ = ("text", "tokens", "leader_emails", "team_emails", "timeline_year", "size")
+
+    def __init__(self, entries: List[ProjectEntry]):
+        # normalizing each project and joining equals normalizing the joined text
+        self.text = {k: " ".join(e.text[k] for e in entries if e.text[k]) for k in TEXT_FIELDS}
+        self.tokens: Dict[str, FrozenSet[str]] = {k: frozenset(_token_set(self.text[k])) for k in TOKEN_FIELDS}
+        self.leader_emails = frozenset().union(*(e.leader_emails for e in entries))
+        self.team_emails = frozenset().union(*(e.team_emails for e in entries))
+        self.timeline_year = find_year(self.text["timeline"])
+        self.size = len(entries)
+
+    def get(self, field: str, default=""):
+        if field == "leader_emails":
+            return self.leader_emails
+        if field == "team_emails":
+            return self.team_emails
+        return self.text.get(field, default)
+
+
+def project_version(p: dict) -> Tuple:
+    """Cheap version key for one project row: (id, updated_at) or a content hash."""
+    updated = p.get("updated_at") or p.get("modified_at")
+    if p.get("id") is not None and updated:
+        return (p.get("id"), str(updated))
+    # rows come back from PostgREST with a stable column order, so repr is a stable fingerprint
+    text = repr(p)
+    return (p.get("id"), len(text), hash(text))
+
+
+_entries: "OrderedDict[Tuple, ProjectEntry]" = OrderedDict()
+_indexes: "OrderedDict[Tuple, VerificationIndex]" = OrderedDict()
+_lock = threading.Lock()
+# (projects list object, its length, index) from the last call
+_last: Optional[tuple] = None
+
+
+def _entry(version: Tuple, p: dict) -> ProjectEntry:
+    with _lock:
+        entry = _entries.get(version)
+        if entry is not None:
+            _entries.move_to_end(version)
+            return entry
+    entry = ProjectEntry(p)
+    with _lock:
+        _entries[version] = entry
+        while len(_entries) > _ENTRY_CACHE_SIZE:
+            _entries.popitem(last=False)
+    return entry
+
+
+def get_verification_index(project_data: list) -> VerificationIndex:
+    """Return the cached index for this version of ``project_data``, building it if needed."""
+    global _last
+    last = _last
+    if project_data and last is not None and last[0] is project_data and last[1] == len(project_data):
+        return last[2]
+    rows = [p for p in project_data or [] if isinstance(p, dict)]
+    versions = [project_version(p) for p in rows]
+    key = tuple(versions)
+    with _lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+    if index is None:
+        index = VerificationIndex([_entry(v, p) for v, p in zip(versions, rows)])
+        with _lock:
+            _indexes[key] = index
+            while len(_indexes) > _INDEX_CACHE_SIZE:
+                _indexes.popitem(last=False)
+    if project_data:
+        _last = (project_data, len(project_data), index)
+    return index
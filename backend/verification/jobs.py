@@ -0,0 +1,227 @@
+"""
+Background Alignment Scoring
+
+work_chat and dual_chat used to fetch every project and run the technical
+prompt check and verify_response_final inline before returning, and then
+throw the result away. Replies are now handed to an AlignmentQueue: submit()
+is a non-blocking put, daemon workers do the scoring, and every result
+(score, trust level, query, chat keys) is written to a local SQLite results
+store for offline quality dashboards. The projects list is fetched at most
+once per ``projects_ttl`` seconds per worker process.
+
+Batch mode scores historic chats from a history.transfer export, pairing each
+user message with the assistant reply that followed it:
+    python -m verification.jobs --export alice.jsonl.gz
+"""
+import argparse
+import gzip
+import json
+import queue
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from data_paths import data_path
+
+from .verifier import verify_response_final
+
+# ALIGNMENT_DB, else alignment.db in DATA_DIR
+ALIGNMENT_DB = data_path("alignment.db", "ALIGNMENT_DB")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alignment_results (
+    id             INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at     TEXT NOT NULL,
+    source         TEXT NOT NULL,
+    user_email     TEXT,
+    user_id        TEXT,
+    project_id     TEXT,
+    chat_id        TEXT,
+    query          TEXT,
+    reply_chars    INTEGER,
+    is_technical   INTEGER,
+    alignment_score REAL,
+    trust_level    TEXT,
+    recommendation TEXT,
+    verify_ms      REAL
+);
+CREATE INDEX IF NOT EXISTS alignment_results_created ON alignment_results(created_at);
+CREATE INDEX IF NOT EXISTS alignment_results_project ON alignment_results(project_id, created_at);
+"""
+
+Classifier = Callable[[str, list], bool]
+
+
+class AlignmentResultStore:
+    def __init__(self, path: str = ALIGNMENT_DB):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(SCHEMA)
+        # stores created before batch rows got their own user_id column
+        if "user_id" not in {row[1] for row in conn.execute("PRAGMA table_info(alignment_results)")}:
+            conn.execute("ALTER TABLE alignment_results ADD COLUMN user_id TEXT")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def add_many(self, results: List[dict]):
+        if not results:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT INTO alignment_results(created_at, source, user_email, user_id, project_id, chat_id, "
+                "query, reply_chars, is_technical, alignment_score, trust_level, recommendation, verify_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(r.get("created_at") or now, r.get("source", "live"), r.get("user_email"), r.get("user_id"),
+                  r.get("project_id"), r.get("chat_id"), r.get("query"), r.get("reply_chars"),
+                  None if r.get("is_technical") is None else int(r["is_technical"]),
+                  r.get("alignment_score"), r.get("trust_level"), r.get("recommendation"), r.get("verify_ms"))
+                 for r in results])
+
+    def summary(self, since: str = None) -> List[tuple]:
+        """(trust_level, count, avg score) per trust level, for dashboards."""
+        return self._conn().execute(
+            "SELECT trust_level, COUNT(*), ROUND(AVG(alignment_score), 2) FROM alignment_results "
+            "WHERE is_technical IS NOT 0 AND (? IS NULL OR created_at >= ?) GROUP BY trust_level",
+            (since, since)).fetchall()
+
+
+class CachedProjects:
+    """Projects list loader that refreshes at most every ``ttl`` seconds."""
+    def __init__(self, fetch: Callable[[], list], ttl: float = 60.0):
+        self.fetch = fetch
+        self.ttl = ttl
+        self._data: Optional[list] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> list:
+        with self._lock:
+            if self._data is None or time.monotonic() - self._loaded_at > self.ttl:
+                self._data = self.fetch() or []
+                self._loaded_at = time.monotonic()
+            return self._data
+
+
+def score_job(job: dict, project_data: list, classify: Optional[Classifier] = None) -> dict:
+    """Classify and verify one (query, reply) job; returns the row for the results store."""
+    query, reply = job.get("query") or "", job.get("reply") or ""
+    result = {k: job.get(k) for k in ("source", "user_email", "user_id", "project_id", "chat_id", "created_at")}
+    result.update(query=query, reply_chars=len(reply))
+    if classify:
+        # any falsy answer means "not technical": the original check returned None when nothing matched
+        technical = result["is_technical"] = bool(classify(query, project_data))
+        if not technical:
+            return result
+    start = time.perf_counter()
+    check = verify_response_final(query, reply, project_data)
+    result["verify_ms"] = round((time.perf_counter() - start) * 1e3, 3)
+    result.update(alignment_score=check.get("alignment_score"), trust_level=check.get("trust_level"),
+                  recommendation=check.get("recommendation"))
+    return result
+
+
+class AlignmentQueue:
+    def __init__(self, store: AlignmentResultStore, projects: Callable[[], list],
+                 classify: Optional[Classifier] = None, workers: int = 1, maxsize: int = 1000):
+        self.store = store
+        self.projects = projects
+        self.classify = classify
+        self.dropped = 0
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=maxsize)
+        self._threads = [threading.Thread(target=self._run, name=f"alignment-{i}", daemon=True)
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, query: str, reply: str, **meta) -> bool:
+        """Queue a reply for scoring without blocking; returns False if the queue is full."""
+        try:
+            self._queue.put_nowait({"query": query, "reply": reply, "source": "live", **meta})
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            jobs = [self._queue.get()]
+            # drain whatever else is waiting so results are written in one transaction
+            while len(jobs) < 100:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                project_data = self.projects()
+                self.store.add_many([score_job(j, project_data, self.classify) for j in jobs])
+            except Exception as e:
+                print("⚠ alignment job error:", e)
+            finally:
+                for _ in jobs:
+                    self._queue.task_done()
+
+    def join(self):
+        self._queue.join()
+
+
+def historic_turns(rows: Iterable[dict]) -> Iterator[dict]:
+    """
+    Pair each user message with the next assistant message of the same chat.
+    ``rows`` are user_memory rows (as exported by history.transfer), which
+    carry the user's id rather than their email.
+    """
+    chats = {}
+    for row in rows:
+        chats.setdefault((row.get("user_id"), row.get("project_id"), row.get("chat_id")), []).append(row)
+    for (user_id, project_id, chat_id), msgs in chats.items():
+        msgs.sort(key=lambda r: r.get("timestamp") or "")
+        pending = None
+        for m in msgs:
+            if m.get("role") == "user":
+                pending = m
+            elif m.get("role") == "assistant" and pending is not None:
+                yield {"query": pending.get("content"), "reply": m.get("content"), "source": "batch",
+                       "user_id": None if user_id is None else str(user_id), "project_id": project_id, "chat_id": chat_id,
+                       "created_at": m.get("timestamp")}
+                pending = None
+
+
+def run_batch(jobs: Iterable[dict], store: AlignmentResultStore, project_data: list,
+              classify: Optional[Classifier] = None, flush_every: int = 500) -> int:
+    batch, total = [], 0
+    for job in jobs:
+        batch.append(score_job(job, project_data, classify))
+        if len(batch) >= flush_every:
+            store.add_many(batch)
+            total += len(batch)
+            batch = []
+    store.add_many(batch)
+    return total + len(batch)
+
+
+if __name__ == "__main__":
+    from history.transfer import _client
+    from .technical import is_technical_prompt
+
+    parser = argparse.ArgumentParser(description="Score historic chats for alignment into the results store")
+    parser.add_argument("--export", required=True, help="history.transfer export (.jsonl.gz)")
+    parser.add_argument("--db", default=ALIGNMENT_DB)
+    args = parser.parse_args()
+
+    projects = _client().table("projects").select("*").execute().data or []
+    with gzip.open(args.export, "rt", encoding="utf-8") as f:
+        rows = (json.loads(line) for line in f if line.strip())
+        start = time.perf_counter()
+        n = run_batch(historic_turns(rows), AlignmentResultStore(args.db), projects, classify=is_technical_prompt)
+    print(f"✅ Scored {n:,} turns in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,166 @@
+"""
+Similarity Backends for the Verifier
+
+verify_response_final falls back to a string similarity for the name, leader
+and description fields. The original difflib.SequenceMatcher ratio is
+quadratic in the worst case and rebuilds its index of the project text on
+every call. Backends, selected with VERIFY_SIMILARITY or per call:
+
+  difflib     exact SequenceMatcher ratio; the matcher for a project string
+              is cached per thread, so only the reply side is processed
+  jaccard     token-set Jaccard
+  minhash     character 3-gram bottom-k MinHash estimate of n-gram Jaccard;
+              project-side sketches are cached
+  levenshtein normalized edit similarity (bit-parallel), with an optional
+              similarity floor that bounds the distance and exits early
+
+All return a ratio in 0..1. Only difflib reproduces the original scores. On
+the seeded corpus of benchmarks/bench_similarity.py (2k-character replies),
+compared with the original verifier:
+
+  backend      verify speedup  mean |score delta|  same trust level
+  difflib           ~1.2x            0               100%
+  levenshtein       ~400x            2.9             100%
+  minhash           ~13x            23.6              56.5%
+  jaccard           ~100x           33.1              56.5%
+
+jaccard and minhash are only fit for coarse ranking, not for trust levels.
+"""
+import heapq
+import os
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Tuple
+
+Similarity = Callable[[str, str], float]
+
+DEFAULT_BACKEND = os.getenv("VERIFY_SIMILARITY", "difflib")
+MINHASH_SIZE = 128
+SHINGLE = 3
+# levenshtein stops early and returns 0.0 once similarity must fall below this
+LEVENSHTEIN_FLOOR = float(os.getenv("VERIFY_LEVENSHTEIN_FLOOR", "0.3"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9@._-]+")
+_local = threading.local()
+
+
+# ---------------- difflib (exact) ----------------
+def sequence_ratio(a: str, b: str) -> float:
+    """SequenceMatcher(None, a, b).ratio(), reusing the matcher built for ``b``."""
+    matchers = getattr(_local, "matchers", None)
+    if matchers is None:
+        matchers = _local.matchers = OrderedDict()
+    sm = matchers.get(b)
+    if sm is None:
+        sm = SequenceMatcher(None, "", b)
+        matchers[b] = sm
+        if len(matchers) > 64:
+            matchers.popitem(last=False)
+    else:
+        matchers.move_to_end(b)
+    sm.set_seq1(a)
+    return sm.ratio()
+
+
+# ---------------- token-set Jaccard ----------------
+@lru_cache(maxsize=256)
+def _tokens(s: str) -> FrozenSet[str]:
+    return frozenset(_TOKEN_RE.findall(s))
+
+
+def token_jaccard(a: str, b: str) -> float:
+    ta, tb = frozenset(_TOKEN_RE.findall(a)), _tokens(b)
+    if not ta or not tb:
+        return 1.0 if a == b else 0.0
+    return len(ta & tb) / len(ta | tb)
+
+
+# ---------------- MinHash ----------------
+@lru_cache(maxsize=256)
+def _sketch(s: str) -> Tuple[int, ...]:
+    """
+    Bottom-k sketch: the MINHASH_SIZE smallest distinct shingle hashes. CRC-32
+    rather than hash(), which is salted per process for str, so sketches and
+    scores are the same in every worker and every run.
+    """
+    shingles = {s[i:i + SHINGLE] for i in range(max(1, len(s) - SHINGLE + 1))} if s else set()
+    return tuple(sorted(heapq.nsmallest(MINHASH_SIZE, {zlib.crc32(x.encode("utf-8")) for x in shingles})))
+
+
+def minhash_similarity(a: str, b: str) -> float:
+    sa, sb = _sketch.__wrapped__(a), _sketch(b)
+    if not sa or not sb:
+        return 1.0 if a == b else 0.0
+    union = heapq.nsmallest(MINHASH_SIZE, set(sa) | set(sb))
+    both = set(sa) & set(sb)
+    return sum(1 for h in union if h in both) / len(union)
+
+
+# ---------------- bounded Levenshtein ----------------
+def bounded_levenshtein(a: str, b: str, max_dist: int) -> int:
+    """
+    Edit distance, or ``max_dist + 1`` as soon as it must exceed ``max_dist``.
+    Bit-parallel (Myers/Hyyrö): one pass over the longer string with the
+    shorter one packed into an int, so the cost is O(len) big-int operations.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    m, n = len(a), len(b)
+    if n - m > max_dist:
+        return max_dist + 1
+    if m == 0:
+        return n
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    full = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+    for j, c in enumerate(b, 1):
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        # the distance can drop by at most one per remaining character
+        if score - (n - j) > max_dist:
+            return max_dist + 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+    return score if score <= max_dist else max_dist + 1
+
+
+def levenshtein_ratio(a: str, b: str, floor: float = LEVENSHTEIN_FLOOR) -> float:
+    longest = max(len(a), len(b))
+    if longest == 0:
+        return 1.0
+    max_dist = int(longest * (1.0 - floor))
+    dist = bounded_levenshtein(a, b, max_dist)
+    if dist > max_dist:
+        return 0.0
+    return 1.0 - dist / longest
+
+
+BACKENDS: Dict[str, Similarity] = {
+    "difflib": sequence_ratio,
+    "jaccard": token_jaccard,
+    "minhash": minhash_similarity,
+    "levenshtein": levenshtein_ratio,
+}
+
+
+def get_similarity(name: str = None) -> Similarity:
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"unknown similarity backend {name!r}; choose from {sorted(BACKENDS)}")
+    return BACKENDS[name]
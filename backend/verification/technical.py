@@ -0,0 +1,110 @@
+"""
+Technical Prompt Detector
+
+Decides whether a query is technical or project-related, which gates the
+alignment check. The old is_technical_prompt ran 15 uncompiled re.search
+calls, scanned the keyword list one substring at a time, and re-tokenized
+every project's fields on every call. Here the non-tech patterns are one
+compiled regex, the keywords are one compiled alternation (same substring
+semantics), and the project keyword set is cached per project version and
+rebuilt only when the projects change.
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import FrozenSet, Optional, Tuple
+
+from .index import project_version
+
+NON_TECH_PATTERNS = [
+    r"who is narendra", r"prime minister", r"weather", r"time",
+    r"company name", r"we3vision", r"about company",
+    r"hello", r"hi", r"hey", r"thanks", r"bye",
+    r"good (?:morning|afternoon|evening)", r"how are you",
+    r"what(?:'?s| is) your name",
+]
+
+TECH_KEYWORDS = [
+    "api", "flask", "backend", "frontend", "database", "sql", "supabase", "bug",
+    "error", "debug", "react", "node", "python", "javascript", "deployment",
+    "auth", "token", "jwt", "docker", "kubernetes", "langchain", "chroma",
+    "project", "timeline", "leader", "team", "client", "scope", "stack",
+    "tech", "framework", "field", "deadline", "responsibility",
+]
+
+PROJECT_FIELDS = (
+    "project_name", "project_description", "project_scope",
+    "tech_stack", "tech_stack_custom", "project_field", "leader_of_project",
+)
+
+# each pattern was matched as \b<pattern>\b; one alternation under the same anchors is equivalent
+NON_TECH_RE = re.compile(r"\b(?:" + "|".join(NON_TECH_PATTERNS) + r")\b")
+# keywords were substring checks (``k in text``), so no word boundaries here
+TECH_RE = re.compile("|".join(sorted(map(re.escape, TECH_KEYWORDS), key=len, reverse=True)))
+TOKEN_RE = re.compile(r"[a-z0-9_@]+")
+
+
+def _project_tokens(proj: dict) -> FrozenSet[str]:
+    tokens = set()
+    for key in PROJECT_FIELDS:
+        val = proj.get(key)
+        if val:
+            tokens.update(TOKEN_RE.findall(str(val).lower()))
+    return frozenset(tokens)
+
+
+class TechnicalPromptDetector:
+    def __init__(self, max_projects: int = 4096):
+        self.max_projects = max_projects
+        self._per_project: "OrderedDict[Tuple, FrozenSet[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # (projects list object, its length, keyword set) from the last call
+        self._last: Optional[tuple] = None
+
+    def project_keywords(self, project_data: list) -> FrozenSet[str]:
+        if not project_data:
+            return frozenset()
+        last = self._last
+        if last is not None and last[0] is project_data and last[1] == len(project_data):
+            return last[2]
+        rows = [p for p in project_data if isinstance(p, dict)]
+        keywords = set()
+        for p in rows:
+            version = project_version(p)
+            with self._lock:
+                tokens = self._per_project.get(version)
+            if tokens is None:
+                tokens = _project_tokens(p)
+                with self._lock:
+                    self._per_project[version] = tokens
+                    while len(self._per_project) > self.max_projects:
+                        self._per_project.popitem(last=False)
+            keywords |= tokens
+        keywords = frozenset(keywords)
+        # the same list object (e.g. from CachedProjects, which swaps in a new list on
+        # refresh) skips even the version scan
+        self._last = (project_data, len(project_data), keywords)
+        return keywords
+
+    def __call__(self, user_input: str, project_data: list) -> bool:
+        """
+        Returns True ONLY when the user's query is technical or project-related.
+        Filters out greetings, company name, personal or general knowledge queries.
+        """
+        if not user_input:
+            return False
+        text = user_input.lower().strip()
+        if NON_TECH_RE.search(text):
+            return False
+        tokens = TOKEN_RE.findall(text)
+        if len(tokens) < 2:
+            return False
+        if TECH_RE.search(text):
+            return True
+        if not project_data:
+            return False
+        keywords = self.project_keywords(project_data)
+        return bool(keywords) and any(t in keywords for t in tokens)
+
+
+is_technical_prompt = TechnicalPromptDetector()
@@ -0,0 +1,123 @@
+"""
+Reply Text Normalization
+
+verify_response_final cleaned a reply with five re.sub calls on inline
+patterns, normalized it with two more, and then tokenized the result again in
+the status branch. The patterns are compiled here once, and the passes are
+fused: after the two heading passes (which need the original case and line
+structure) the text is lowercased and a single substitution removes bullets,
+parenthesised asides and punctuation together; str.split() collapses the
+whitespace. reply_text() memoizes the cleaned form, normalized form, token
+set, emails and year of a reply, so every verifier branch, and repeated
+verification of the same reply, reuses them.
+"""
+import re
+from functools import lru_cache
+from typing import FrozenSet, Optional
+
+EMAIL_RE = re.compile(r"[a-z0-9._%+-]+@[a-z0-9.-]+\.[a-z]{2,}", re.I)
+WORD_TOKEN_RE = re.compile(r"[a-z0-9@._-]+", re.I)
+YEAR_RE = re.compile(r"\b(20\d{2}|\d{4})\b")
+
+# section heading words on their own lines
+HEADING_WORD_RE = re.compile(r"^(summary|details|information|info|result|solution|overview|response)\s*$",
+                             re.M | re.I)
+# short all-caps heading lines
+CAPS_HEADING_RE = re.compile(r"^[A-Z\s]{2,60}\n", re.M)
+# markdown bullets and parenthesised asides (often an email after a name)
+_CLEAN_RE = re.compile(r"[-•*]{1,2}\s+|\([^)]*\)")
+# The same two removals plus any punctuation except the @ . - _ kept for emails
+# and tokens. Every match starts with one character of a single class, which
+# lets the regex engine skip ahead over plain text; the lookbehinds then pick
+# the bullet or parenthesis continuation. A lone "-" matches too and is put back
+# by _normalize_match.
+_NORMALIZE_RE = re.compile(r"[^\w\s@._](?:(?<=[-•*])[-•*]?\s+|(?<=\()[^)]*\))?")
+_PUNCT_RE = re.compile(r"[^\w\s@._-]")
+# WORD_TOKEN_RE for lowercase text: re.I additionally matched only these two
+# lowercase letters (case-folding to i and s), so they are listed explicitly
+_LOWER_TOKEN_RE = re.compile(r"[a-z0-9@._\u0131\u017f-]+")
+
+
+def _normalize_match(m: re.Match) -> str:
+    return "-" if m.group() == "-" else " "
+
+
+def _strip_headings(text: str) -> str:
+    s = HEADING_WORD_RE.sub("", text)
+    if "\n" in s:
+        s = CAPS_HEADING_RE.sub("", s)
+    return s
+
+
+def clean_reply_text(text: str) -> str:
+    """
+    Remove headings, markdown bullets, repeated whitespace, punctuation noise.
+    Returns a lowercase cleaned string suitable for substring/token matching.
+    """
+    if not text:
+        return ""
+    return " ".join(_CLEAN_RE.sub(" ", _strip_headings(text)).split()).lower()
+
+
+def normalize_for_compare(s: str) -> str:
+    """Lowercase and remove punctuation except alphanumerics and spaces."""
+    if not s:
+        return ""
+    return " ".join(_PUNCT_RE.sub(" ", s.lower()).split())
+
+
+def normalize_reply(text: str) -> str:
+    """normalize_for_compare(clean_reply_text(text)) in one substitution pass."""
+    if not text:
+        return ""
+    # lowercase before the punctuation pass, as the two-step version did
+    return " ".join(_NORMALIZE_RE.sub(_normalize_match, _strip_headings(text).lower()).split())
+
+
+def token_set(s: str) -> set:
+    return set([t.lower() for t in WORD_TOKEN_RE.findall(s or "")])
+
+
+def find_year(s: str) -> Optional[str]:
+    m = YEAR_RE.search(s or "")
+    return m.group(0) if m else None
+
+
+class ReplyText:
+    """Derived forms of one reply, each computed on first use."""
+    __slots__ = ("raw", "_norm", "_tokens", "_emails", "_year")
+
+    def __init__(self, raw: str):
+        self.raw = raw or ""
+        self._norm = self._tokens = self._emails = None
+        self._year = False
+
+    @property
+    def norm(self) -> str:
+        if self._norm is None:
+            self._norm = normalize_reply(self.raw)
+        return self._norm
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        if self._tokens is None:
+            # norm is already lowercase
+            self._tokens = frozenset(_LOWER_TOKEN_RE.findall(self.norm))
+        return self._tokens
+
+    @property
+    def emails(self) -> FrozenSet[str]:
+        if self._emails is None:
+            self._emails = frozenset(e.lower() for e in EMAIL_RE.findall(self.raw))
+        return self._emails
+
+    @property
+    def year(self) -> Optional[str]:
+        if self._year is False:
+            self._year = find_year(self.raw)
+        return self._year
+
+
+@lru_cache(maxsize=256)
+def reply_text(reply: str) -> ReplyText:
+    return ReplyText(reply)